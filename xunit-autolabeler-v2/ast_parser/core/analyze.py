@@ -14,59 +14,134 @@
 
 import json
 import os
+import sys
 from os import path
-from typing import Dict, List, Set, Tuple
+from typing import (
+    Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Mapping,
+    NamedTuple, Optional, Sequence, Set, Tuple, TypeVar)
 
 from ast_parser.lib import constants as lib_constants
+from ast_parser.lib import git_utils
 
-from . import constants
+from . import constants, intern_utils
 from . import polyglot_drift_data as pdd
 from . import polyglot_parser, yaml_utils
+from .drift_yaml_store import DriftYamlStore
 
 
-def _get_data(
-    snippet_data_json: str
-) -> Tuple[List[pdd.PolyglotDriftData], Dict[str, List[str]]]:
-    """Retrieves a list of snippet methods from a JSON repo file
-       (usually named polyglot_snippet_data.json)
+# Snippet methods, and a map from test keys to (test path, test name) tuples
+SnippetData = Tuple[
+    List[pdd.PolyglotDriftData], Dict[str, List[Tuple[str, str]]]]
+
+
+def create_snippet_data(
+    snippets: Iterable[Dict[str, Any]],
+    test_method_map: Mapping[str, Iterable[Sequence[str]]],
+    parent_path: str = ''
+) -> SnippetData:
+    """Convert language-specific parser output into snippet method objects
 
     Args:
-        snippet_data_json: The path to a polyglot_snippet_data.json file
+        snippets: Snippet method dicts, as stored in the 'snippets' list
+                  of a polyglot_snippet_data.json file
+        test_method_map: A map from test keys to (test path, test name)
+                         pairs, as stored in the 'test_method_map' object
+                         of a polyglot_snippet_data.json file
+        parent_path: (Optional) The directory that relative source and
+                     test paths are relative to
 
     Returns:
-        A 2-tuple containing the following information retrieved from the
-        specified JSON file:
-         - A list of snippet methods
+        A 2-tuple containing the following information:
+         - A list of (compact) snippet methods. Their strings are interned,
+           and their collections are tuples (see intern_utils).
          - A mapping between test data and snippet-method-based keys
     """
+    # Many snippets (and tests) share a file, so each
+    # path is only resolved (and interned) once
+    resolved_paths: Dict[str, str] = {}
+
+    def _resolve(file_path: str) -> str:
+        if file_path not in resolved_paths:
+            resolved_paths[file_path] = sys.intern(
+                path.normpath(path.join(parent_path, file_path)))
+
+        return resolved_paths[file_path]
+
+    # Normalize source_path values, and intern the snippets' other values
     tuple_methods = []
+    for snippet in snippets:
+        snippet['source_path'] = _resolve(snippet['source_path'])
+
+        tuple_methods.append(
+            pdd.PolyglotDriftData(**intern_utils.intern_snippet(snippet)))
+
+    # Convert test_method_map values to (interned) tuples
+    # (Required because tuples aren't JSON-encodable)
+    tuple_test_map = {
+        test_key: [
+            intern_utils.intern_test((_resolve(test_path), test_name))
+            for test_path, test_name in test_list
+        ]
+        for test_key, test_list in test_method_map.items()
+    }
+
+    return tuple_methods, tuple_test_map
+
+
+def _read_snippet_data_json(snippet_data_json: str) -> Dict[str, Any]:
+    """Read (and version-check) a polyglot_snippet_data.json file
+
+    Args:
+        snippet_data_json: The path to a polyglot_snippet_data.json file
+
+    Raises:
+        ValueError: if the file uses a newer format than this tool supports
+
+    Returns:
+        The file's (raw) JSON content
+    """
     with open(snippet_data_json, 'r') as file:
         json_content = json.loads('\n'.join(file.readlines()))
-        json_test_map = json_content['test_method_map']
-        json_snippets = json_content['snippets']
 
-        # Normalize source_path values
-        parent_path = path.dirname(snippet_data_json)
-        for snippet in json_snippets:
-            snippet['source_path'] = (
-                path.join(parent_path, snippet['source_path']))
+    # Files without a version use absolute paths (which
+    # path.join() leaves as-is), and can be read normally
+    schema_version = json_content.get('schema_version', 1)
+    if schema_version > lib_constants.SNIPPET_DATA_SCHEMA_VERSION:
+        raise ValueError(
+            f'File {snippet_data_json} uses a newer format (version '
+            f'{schema_version}) than this tool supports. '
+            'Try regenerating polyglot_snippet_data.json?')
+
+    return json_content
+
 
-            tuple_methods.append(
-                pdd.PolyglotDriftData(**snippet))
+def _get_data(snippet_data_json: str) -> SnippetData:
+    """Retrieves a list of snippet methods from a JSON repo file
+       (usually named polyglot_snippet_data.json)
+
+    Args:
+        snippet_data_json: The path to a polyglot_snippet_data.json file
 
-        # Convert test_method_map values to tuples
-        # (Required because tuples aren't JSON-encodable)
-        for test_key, test_list in json_test_map.items():
-            json_test_map[test_key] = [
-                tuple(test) for test in test_list]
+    Returns:
+        A 2-tuple containing the following information retrieved from the
+        specified JSON file:
+         - A list of snippet methods
+         - A mapping between test data and snippet-method-based keys
+    """
+    json_content = _read_snippet_data_json(snippet_data_json)
 
-    return tuple_methods, json_test_map
+    # Resolve (relative) paths against the file's *current* location
+    return create_snippet_data(
+        json_content['snippets'],
+        json_content['test_method_map'],
+        path.abspath(path.dirname(snippet_data_json)))
 
 
 def _process_file_region_tags(
     source_file: str,
     snippet_data_json: str,
-    tuple_methods: List[pdd.PolyglotDriftData]
+    tuple_methods: List[pdd.PolyglotDriftData],
+    revision: Optional[git_utils.GitRevision] = None
 ) -> Tuple[Set[str], Set[str]]:
     """Process a snippet source file's region tags
 
@@ -79,6 +154,8 @@ def _process_file_region_tags(
         source_file: path to the target snippet source file
         snippet_data_json: The path to a polyglot_snippet_data.json file
         tuple_methods: path to the target foobar
+        revision: (Optional) a git revision to read source_file from,
+                  instead of the working tree
 
     Modifies:
         Adds region tags to their respective methods in tuple_methods
@@ -88,15 +165,27 @@ def _process_file_region_tags(
          - A list of *every* tag found in the snippet source file
          - A list of 'ignored' tags found in the snippet source file
     """
-    if not path.isfile(source_file):
+    content = None
+    if revision:
+        content = revision.read_text(source_file)
+        file_exists = content is not None
+    else:
+        file_exists = path.isfile(source_file)
+
+    if not file_exists:
         raise ValueError(
             f'Path {source_file} in file {snippet_data_json}'
             ' not found! '
             'Try regenerating polyglot_snippet_data.json?'
         )
 
-    region_tags, ignored_tag_names = (
-        polyglot_parser.get_region_tag_regions(source_file))
+    # (Working tree files are read by the region tag parser itself)
+    if revision:
+        region_tags, ignored_tag_names = (
+            polyglot_parser.get_region_tag_regions(source_file, content))
+    else:
+        region_tags, ignored_tag_names = (
+            polyglot_parser.get_region_tag_regions(source_file))
 
     grep_tag_names = set(region[0] for region in region_tags)
     ignored_tag_names = set(ignored_tag_names)
@@ -111,7 +200,8 @@ def _process_file_region_tags(
 
 
 def _dedupe_source_methods(
-    source_methods: List[pdd.PolyglotDriftData]
+    source_methods: List[pdd.PolyglotDriftData],
+    source_method_keys: Optional[Set[str]] = None
 ) -> List[pdd.PolyglotDriftData]:
     """Remove methods with duplicate region tag-sets in a method list
 
@@ -122,11 +212,17 @@ def _dedupe_source_methods(
 
     Arguments:
         source_methods: the list of methods to be de-duped
+        source_method_keys: (Optional) the keys of previously-seen methods.
+                            This set is updated with the keys of the
+                            returned methods, so that methods can be
+                            de-duped across several calls.
 
     Returns:
         A de-duped list of (snippet) source methods
     """
-    source_method_keys = set()
+    if source_method_keys is None:
+        source_method_keys = set()
+
     deduped_methods = []
 
     for method in source_methods:
@@ -146,7 +242,7 @@ def _dedupe_source_methods(
 
 def _store_tests_on_methods(
     source_methods: List[pdd.PolyglotDriftData],
-    test_to_method_key_map: Dict[Tuple[str, str], Tuple[str, str]]
+    test_to_method_key_map: Dict[str, List[Tuple[str, str]]]
 ) -> None:
     """Adds test data to snippet method objects
 
@@ -192,14 +288,348 @@ def _store_tests_on_methods(
                 # No tests specified (empty array)
                 continue
 
+            # (Map entries are shared, rather than copied)
             matching_tests = [
-                (file, path) for (file, path) in map_entry
-                if source_root in file
+                intern_utils.intern_test(test) for test in map_entry
+                if source_root in test[0]
             ]
 
             new_test_methods.extend(matching_tests)
 
-        method.test_methods = new_test_methods
+        method.test_methods = tuple(new_test_methods)
+
+
+class _Stage(NamedTuple):
+    """Struct for storing an analysis stage definition
+
+    Each stage is a named function that receives the SnippetAnalysis it is
+    running within, followed by the results of each of its dependencies (in
+    the order they were declared).
+    """
+    name: str
+    depends_on: Tuple[str, ...]
+    func: Callable[..., Any]
+
+
+_STAGES: Dict[str, _Stage] = {}
+
+
+def _stage(name: str, depends_on: Tuple[str, ...] = ()) -> Callable:
+    """Decorator that registers a function as a named analysis stage
+
+    Args:
+        name: the name of the stage
+        depends_on: the names of the stages whose results this stage requires
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        _STAGES[name] = _Stage(name, tuple(depends_on), func)
+        return func
+
+    return decorator
+
+
+@_stage('load')
+def _load_stage(analysis: 'SnippetAnalysis') -> SnippetData:
+    """Read snippet methods and the test method map from disk
+
+    (This stage is skipped if the analysis was given in-memory snippet data.)
+    """
+    return _get_data(analysis.snippet_data_json)
+
+
+@_stage('yaml_store')
+def _yaml_store_stage(analysis: 'SnippetAnalysis') -> DriftYamlStore:
+    """Discover (and lazily parse) the root directory's YAML files once"""
+    return DriftYamlStore(
+        analysis.root_dir, analysis.cache_dir, analysis.revision)
+
+
+class _RegionTagData(NamedTuple):
+    """Struct for storing the results of the region_tags stage"""
+
+    # *Every* tag found in the snippet source files
+    grep_tags: Set[str]
+
+    # Tags ignored due to cross-parser constants
+    ignored_tags: Set[str]
+
+    # A map from each tag to the (sorted) source files that contain it
+    tag_source_files: Dict[str, List[str]]
+
+
+@_stage('region_tags', depends_on=('load',))
+def _region_tags_stage(
+    analysis: 'SnippetAnalysis',
+    load: Tuple[List[pdd.PolyglotDriftData], Dict[str, List[str]]]
+) -> _RegionTagData:
+    """Label snippet methods with the region tags that enclose them"""
+    tuple_methods, _ = load
+
+    source_filepaths = set(method.source_path for method in tuple_methods)
+
+    grep_tags: Set[str] = set()
+    ignored_tags: Set[str] = set()
+    tag_source_files: Dict[str, List[str]] = {}
+
+    for source_file in sorted(source_filepaths):
+        grep_tag_names, ignored_tag_names = (
+            _process_file_region_tags(
+                source_file, analysis.snippet_data_json, tuple_methods,
+                analysis.revision))
+
+        grep_tags = grep_tags.union(grep_tag_names)
+        ignored_tags = ignored_tags.union(ignored_tag_names)
+
+        for tag in grep_tag_names:
+            tag_source_files.setdefault(tag, []).append(source_file)
+
+    return _RegionTagData(grep_tags, ignored_tags, tag_source_files)
+
+
+@_stage('dedupe', depends_on=('load', 'region_tags'))
+def _dedupe_stage(
+    analysis: 'SnippetAnalysis',
+    load: Tuple[List[pdd.PolyglotDriftData], Dict[str, List[str]]],
+    region_tags: _RegionTagData
+) -> List[pdd.PolyglotDriftData]:
+    """Keep tagged (or snippet-invocation) methods, de-duped by tag set"""
+    tuple_methods, _ = load
+
+    source_methods = [method for method in tuple_methods
+                      if method.region_tags or
+                      method.name in constants.SNIPPET_INVOCATION_METHODS]
+
+    return _dedupe_source_methods(source_methods)
+
+
+@_stage('tests', depends_on=('load', 'dedupe'))
+def _tests_stage(
+    analysis: 'SnippetAnalysis',
+    load: Tuple[List[pdd.PolyglotDriftData], Dict[str, List[str]]],
+    source_methods: List[pdd.PolyglotDriftData]
+) -> List[pdd.PolyglotDriftData]:
+    """Attach automatically-detected tests to snippet methods"""
+    _, test_method_map = load
+    _store_tests_on_methods(source_methods, test_method_map)
+
+    return source_methods
+
+
+@_stage('children', depends_on=('tests',))
+def _children_stage(
+    analysis: 'SnippetAnalysis',
+    source_methods: List[pdd.PolyglotDriftData]
+) -> List[pdd.PolyglotDriftData]:
+    """Merge child methods' region tags and tests into their parents"""
+    polyglot_parser.add_children_drift_data(source_methods)
+
+    return source_methods
+
+
+@_stage('yaml_overlay', depends_on=('children', 'yaml_store'))
+def _yaml_overlay_stage(
+    analysis: 'SnippetAnalysis',
+    source_methods: List[pdd.PolyglotDriftData],
+    yaml_store: DriftYamlStore
+) -> List[pdd.PolyglotDriftData]:
+    """Apply .drift-data.yml clauses to snippet methods"""
+    yaml_utils.add_yaml_data_to_source_methods(source_methods, yaml_store)
+
+    return source_methods
+
+
+@_stage('ignored_tags', depends_on=('region_tags', 'yaml_store'))
+def _ignored_tags_stage(
+    analysis: 'SnippetAnalysis',
+    region_tags: _RegionTagData,
+    yaml_store: DriftYamlStore
+) -> Set[str]:
+    """Combine automatically and manually (via yaml) ignored tags"""
+    # These should *not* overlap w/ source_tags, but we
+    # check that in validate_yaml_syntax - *not here!*
+    return region_tags.ignored_tags.union(
+        yaml_utils.get_untested_region_tags(yaml_store))
+
+
+@_stage('grep_tags', depends_on=('region_tags',))
+def _grep_tags_stage(
+    analysis: 'SnippetAnalysis',
+    region_tags: _RegionTagData
+) -> Set[str]:
+    """Remove automatically ignored region tags from grep-found tags"""
+    return set(tag for tag in region_tags.grep_tags
+               if tag not in region_tags.ignored_tags)
+
+
+@_stage('method_tags', depends_on=('dedupe',))
+def _method_tags_stage(
+    analysis: 'SnippetAnalysis',
+    source_methods: List[pdd.PolyglotDriftData]
+) -> Set[str]:
+    """Collect the region tags of de-duped methods
+
+    Child propagation, tests and the overwrite/manual-test YAML clauses never
+    change the *union* of the methods' region tags, so this stage only
+    depends on de-duped methods.
+    """
+    method_tags: Set[str] = set()
+    for method in source_methods:
+        method_tags = method_tags.union(set(method.region_tags))
+
+    return method_tags
+
+
+def _get_source_tags(
+    method_tags: Set[str],
+    ignored_tags: Set[str],
+    additions_index: Mapping[str, FrozenSet[str]]
+) -> Set[str]:
+    """Add YAML additions groups to a set of (AST-parser-detected) tags
+
+    Args:
+        method_tags: The region tags of de-duped snippet methods
+        ignored_tags: Automatically ignored region tags
+        additions_index: The directory's merged additions groups
+                         (see DriftYamlStore.additions_index)
+
+    Returns:
+        The source_tags of a SnippetAnalysis
+    """
+    source_tags = yaml_utils.add_additions_tags(method_tags, additions_index)
+
+    # Remove automatically ignored region tags from region tag lists
+    return set(tag for tag in source_tags
+               if tag not in ignored_tags)
+
+
+@_stage('source_tags',
+        depends_on=('region_tags', 'method_tags', 'yaml_store'))
+def _source_tags_stage(
+    analysis: 'SnippetAnalysis',
+    region_tags: _RegionTagData,
+    method_tags: Set[str],
+    yaml_store: DriftYamlStore
+) -> Set[str]:
+    """Collect the region tags detected by the AST parser
+
+    (These are the de-duped methods' tags, plus any YAML additions groups.)
+    """
+    return _get_source_tags(
+        method_tags, region_tags.ignored_tags, yaml_store.additions_index)
+
+
+class SnippetAnalysis:
+    """Lazily-evaluated language-agnostic AST analysis of a directory
+
+    This class computes the results of analyze_json() on demand. Each result
+    is produced by a named stage (see _STAGES) that declares the stages it
+    depends on; requesting a result runs only the stages it requires, and
+    every stage runs at most once per SnippetAnalysis object.
+
+    Note:
+        Some stages update the snippet objects produced by their dependencies
+        in place, so stage results should be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        snippet_data_json: str,
+        root_dir: str,
+        cache_dir: Optional[str] = None,
+        snippet_data: Optional[SnippetData] = None,
+        revision: Optional[git_utils.GitRevision] = None
+    ) -> None:
+        """
+        Args:
+            snippet_data_json: A path to a polyglot_snippet_data.json
+                               file generated for the specified root_dir
+            root_dir: The root directory to perform AST analysis on
+            cache_dir: (Optional) A directory to cache analysis inputs
+                       (such as parsed .drift-data.yml files) in
+            snippet_data: (Optional) Snippet data (see create_snippet_data())
+                          produced in-process by a language-specific parser.
+                          If this is specified, snippet_data_json is not read.
+            revision: (Optional) A git revision of root_dir to read source
+                      and .drift-data.yml files from, instead of the working
+                      tree. (The snippet data should describe the same
+                      revision.)
+        """
+        self.snippet_data_json = snippet_data_json
+        self.root_dir = root_dir
+        self.cache_dir = cache_dir
+        self.revision = revision
+        self._results: Dict[str, Any] = {}
+
+        if snippet_data is not None:
+            self._results['load'] = snippet_data
+
+    def get(self, stage_name: str) -> Any:
+        """Get the (memoized) result of a given analysis stage
+
+        Args:
+            stage_name: the name of the stage to compute
+
+        Returns:
+            The result of the specified stage
+        """
+        if stage_name not in self._results:
+            stage = _STAGES[stage_name]
+            dependencies = [self.get(dep) for dep in stage.depends_on]
+            self._results[stage_name] = stage.func(self, *dependencies)
+
+        return self._results[stage_name]
+
+    @property
+    def yaml_store(self) -> DriftYamlStore:
+        """The root directory's parsed .drift-data.yml files"""
+        return self.get('yaml_store')
+
+    @property
+    def grep_tags(self) -> Set[str]:
+        """Tags found (via grep/text search) in the root directory"""
+        return self.get('grep_tags')
+
+    @property
+    def source_tags(self) -> Set[str]:
+        """Tags detected by the AST parser in the root directory"""
+        return self.get('source_tags')
+
+    def get_source_tags(
+        self,
+        additions_index: Mapping[str, FrozenSet[str]]
+    ) -> Set[str]:
+        """Compute source_tags using a given set of YAML additions groups
+
+        Unlike source_tags, this does not read the root directory's
+        .drift-data.yml files (e.g. if their additions groups are known from
+        a previous run).
+
+        Args:
+            additions_index: The root directory's merged additions groups
+                             (see DriftYamlStore.additions_index)
+
+        Returns:
+            Tags detected by the AST parser in the root directory
+        """
+        return _get_source_tags(
+            self.get('method_tags'),
+            self.get('region_tags').ignored_tags,
+            additions_index)
+
+    @property
+    def ignored_tags(self) -> Set[str]:
+        """Tags ignored due to constants or .drift-data.yml files"""
+        return self.get('ignored_tags')
+
+    @property
+    def tag_source_files(self) -> Dict[str, List[str]]:
+        """A map from each grep-found tag to the source files containing it"""
+        return self.get('region_tags').tag_source_files
+
+    @property
+    def source_methods(self) -> List[pdd.PolyglotDriftData]:
+        """Snippet methods with their tests and YAML data attached"""
+        return self.get('yaml_overlay')
 
 
 def analyze_json(
@@ -216,6 +646,9 @@ def analyze_json(
     into a tuple containing 4 useful lists of data as shown in the
     'returns' section.
 
+    (Callers that only need some of these values should use
+     SnippetAnalysis directly, which skips unnecessary stages.)
+
     Arguments:
         snippet_data_json: A path to a polyglot_snippet_data.json
                            file generated for the specified root_dir
@@ -234,46 +667,168 @@ def analyze_json(
            detected by the AST parser in the given directory
            and its subdirectories
     """
-    tuple_methods, test_method_map = _get_data(snippet_data_json)
+    analysis = SnippetAnalysis(snippet_data_json, root_dir)
 
-    source_filepaths = set(method.source_path for method in tuple_methods)
+    source_methods = analysis.source_methods
 
-    grep_tags: Set[str] = set()
-    ignored_tags: Set[str] = set()
+    return (
+        analysis.grep_tags,
+        analysis.source_tags,
+        analysis.ignored_tags,
+        source_methods
+    )
 
-    for source_file in source_filepaths:
-        grep_tag_names, ignored_tag_names = (
-            _process_file_region_tags(
-                source_file, snippet_data_json, tuple_methods))
 
-        grep_tags = grep_tags.union(grep_tag_names)
-        ignored_tags = ignored_tags.union(ignored_tag_names)
+class SnippetGroup(NamedTuple):
+    """Struct for storing the analysis results of a single directory"""
 
-    source_methods = [method for method in tuple_methods
-                      if method.region_tags or
-                      method.name in constants.SNIPPET_INVOCATION_METHODS]
+    # The directory containing the group's snippet source files
+    directory: str
+
+    # Snippet methods with their tests and YAML data attached
+    source_methods: List[pdd.PolyglotDriftData]
 
-    source_methods = _dedupe_source_methods(source_methods)
+    # *Every* tag found in the group's snippet source files
+    grep_tags: Set[str]
 
-    _store_tests_on_methods(source_methods, test_method_map)
+    # Tags ignored due to cross-parser constants
+    ignored_tags: Set[str]
 
-    polyglot_parser.add_children_drift_data(source_methods)
-    yaml_utils.add_yaml_data_to_source_methods(source_methods, root_dir)
 
-    source_tags: Set[str] = set()
-    for method in source_methods:
-        source_tags = source_tags.union(set(method.region_tags))
+_T = TypeVar('_T')
 
-    # Remove automatically ignored region tags from region tag lists
-    grep_tags = set(tag for tag in grep_tags
-                    if tag not in ignored_tags)
-    source_tags = set(tag for tag in source_tags
-                      if tag not in ignored_tags)
-
-    # Add manually ignored (via yaml) tags to ignored tags list
-    #   These should *not* overlap w/ source_tags, but we
-    #   check that in validate_yaml_syntax  - *not here!*
-    ignored_tags = ignored_tags.union(
-        yaml_utils.get_untested_region_tags(root_dir))
-
-    return grep_tags, source_tags, ignored_tags, source_methods
+
+def _group_by_directory(
+    items: Iterable[_T],
+    get_path: Callable[[_T], str]
+) -> Dict[str, List[_T]]:
+    """Group items by the directory of the file they belong to
+
+    Args:
+        items: the items to group
+        get_path: a function that returns an item's file path
+
+    Returns:
+        A map from each directory to its items. Directories (and each
+        directory's items) are in the order they first appear in.
+    """
+    groups: Dict[str, List[_T]] = {}
+    for item in items:
+        groups.setdefault(path.dirname(get_path(item)), []).append(item)
+
+    return groups
+
+
+def _pop_groups(groups: Dict[str, List[_T]]) -> Iterator[List[_T]]:
+    # Remove each group before yielding it, so that it can be
+    # freed as soon as its consumer is done with it
+    while groups:
+        yield groups.pop(next(iter(groups)))
+
+
+def iter_snippet_groups(
+    snippet_data_json: str,
+    yaml_store: DriftYamlStore,
+    snippet_data: Optional[SnippetData] = None,
+    revision: Optional[git_utils.GitRevision] = None
+) -> Iterator[SnippetGroup]:
+    """Perform language-agnostic AST analysis one directory at a time
+
+    This is a streaming version of SnippetAnalysis. Snippet methods are
+    grouped by source directory, and each group is analyzed (and yielded)
+    separately. Only one group's analysis results (e.g. source file
+    contents, test and child data) are kept in memory at a time.
+
+    The input snippet data itself is not streamed: the decoded JSON file
+    (or the given snippet_data) is held in memory in full, and each group
+    is only released once it has been analyzed. Memory usage is therefore
+    bounded by the size of the snippet data plus the largest directory's
+    analysis results.
+
+    Every analysis step except de-duplication only ever combines methods
+    within the same source file, so each group's methods are identical to
+    their SnippetAnalysis counterparts. Methods are de-duped against every
+    group that came before them; groups are processed in the order their
+    directories first appear in, so the results match SnippetAnalysis as
+    long as each directory's snippets are listed contiguously (as the
+    language-specific parsers do).
+
+    Snippet data is read when this function is called (rather than when
+    the first group is requested), so any errors it causes are raised
+    before any groups are analyzed.
+
+    Args:
+        snippet_data_json: A path to a polyglot_snippet_data.json
+                           file generated for the specified root_dir
+        yaml_store: The root directory's parsed .drift-data.yml files
+        snippet_data: (Optional) Snippet data (see create_snippet_data())
+                      produced in-process by a language-specific parser.
+                      If this is specified, snippet_data_json is not read.
+        revision: (Optional) A git revision to read source files from,
+                  instead of the working tree
+
+    Returns:
+        An iterator of SnippetGroup objects, one per source directory
+    """
+    method_groups: Iterator[List[pdd.PolyglotDriftData]]
+    if snippet_data is not None:
+        tuple_methods, test_method_map = snippet_data
+        method_groups = _pop_groups(_group_by_directory(
+            tuple_methods, lambda method: method.source_path))
+    else:
+        json_content = _read_snippet_data_json(snippet_data_json)
+        parent_path = path.abspath(path.dirname(snippet_data_json))
+
+        _, test_method_map = create_snippet_data(
+            [], json_content.pop('test_method_map'), parent_path)
+
+        # Only convert (and resolve the paths of) one group at a time
+        snippet_groups = _group_by_directory(
+            json_content.pop('snippets'),
+            lambda snippet: snippet['source_path'])
+        method_groups = (
+            create_snippet_data(snippets, {}, parent_path)[0]
+            for snippets in _pop_groups(snippet_groups))
+
+    return _analyze_groups(
+        method_groups, test_method_map, snippet_data_json, yaml_store,
+        revision)
+
+
+def _analyze_groups(
+    method_groups: Iterator[List[pdd.PolyglotDriftData]],
+    test_method_map: Dict[str, List[Tuple[str, str]]],
+    snippet_data_json: str,
+    yaml_store: DriftYamlStore,
+    revision: Optional[git_utils.GitRevision]
+) -> Iterator[SnippetGroup]:
+    """Analyze groups of snippet methods (see iter_snippet_groups())"""
+    source_method_keys: Set[str] = set()
+    for group_methods in method_groups:
+        grep_tags: Set[str] = set()
+        ignored_tags: Set[str] = set()
+
+        source_filepaths = set(method.source_path for method in group_methods)
+        for source_file in sorted(source_filepaths):
+            grep_tag_names, ignored_tag_names = _process_file_region_tags(
+                source_file, snippet_data_json, group_methods, revision)
+
+            grep_tags.update(grep_tag_names)
+            ignored_tags.update(ignored_tag_names)
+
+        # Same steps as the dedupe, tests, children and yaml_overlay stages
+        source_methods = _dedupe_source_methods(
+            [method for method in group_methods
+             if method.region_tags or
+             method.name in constants.SNIPPET_INVOCATION_METHODS],
+            source_method_keys)
+
+        _store_tests_on_methods(source_methods, test_method_map)
+        polyglot_parser.add_children_drift_data(source_methods)
+        yaml_utils.add_yaml_data_to_source_methods(source_methods, yaml_store)
+
+        yield SnippetGroup(
+            path.dirname(group_methods[0].source_path),
+            source_methods,
+            grep_tags,
+            ignored_tags)
@@ -69,7 +69,7 @@ class AnalyzeJsonMiscTests(unittest.TestCase):
         _, _, _, source_methods = analyze_result
         tag_sets = [method.region_tags for method in source_methods]
 
-        assert sum(tag_set == ['not_main'] for tag_set in tag_sets) == 1
+        assert sum(tag_set == ('not_main',) for tag_set in tag_sets) == 1
 
     def test_handle_snippet_invocation_methods(self):
         test_dir = os.path.join(_TEST_DIR, 'snippet_invocation_methods')
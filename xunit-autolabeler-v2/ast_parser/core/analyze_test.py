@@ -12,10 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import os
+import shutil
+import subprocess
 import unittest
 
 from ast_parser.core import analyze, polyglot_drift_data as pdd
+from ast_parser.core.drift_yaml_store import DriftYamlStore
+from ast_parser.lib import constants as lib_constants
+from ast_parser.lib import git_utils
 
 import mock
 
@@ -53,6 +59,64 @@ class GetMethodsTest(unittest.TestCase):
         assert os.path.isabs(test_path)
 
 
+class RelocatableDataTest(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _json_path(self, tmpdir):
+        self.json_path = os.path.join(tmpdir, 'polyglot_snippet_data.json')
+
+    def _write_json(self, **json_content):
+        with open(self.json_path, 'w') as file:
+            json.dump(json_content, file)
+
+    def test_resolves_relative_paths_against_file_location(self):
+        self._write_json(
+            schema_version=2,
+            snippets=[{
+                'name': 'main', 'class_name': 'main', 'method_name': 'main',
+                'source_path': 'sample/main.py', 'start_line': 1,
+                'end_line': 2, 'parser': 'direct_invocation'
+            }],
+            test_method_map={'main@main': [['sample/main_test.py', 'test']]}
+        )
+
+        methods, test_method_map = analyze._get_data(self.json_path)
+        root_dir = os.path.dirname(self.json_path)
+
+        assert methods[0].source_path == (
+            os.path.join(root_dir, 'sample/main.py'))
+        assert test_method_map['main@main'] == [
+            (os.path.join(root_dir, 'sample/main_test.py'), 'test')]
+
+    def test_creates_compact_methods(self):
+        self._write_json(
+            schema_version=2,
+            snippets=[{
+                'name': name, 'class_name': 'main', 'method_name': name,
+                'source_path': 'sample/main.py', 'start_line': 1,
+                'end_line': 2, 'parser': 'direct_invocation',
+                'children': ['helper'], 'url': None, 'http_methods': None
+            } for name in ('main', 'other')],
+            test_method_map={}
+        )
+
+        methods, _ = analyze._get_data(self.json_path)
+
+        assert methods[0].children == ('helper',)
+        assert methods[0].children is methods[1].children
+        assert methods[0].region_tags == ()
+        assert methods[0].test_methods == ()
+
+    def test_rejects_newer_schema_versions(self):
+        self._write_json(
+            schema_version=lib_constants.SNIPPET_DATA_SCHEMA_VERSION + 1,
+            snippets=[],
+            test_method_map={}
+        )
+
+        with self.assertRaises(ValueError):
+            analyze._get_data(self.json_path)
+
+
 class ProcessRegionTagsTest(unittest.TestCase):
     def test_raises_error_on_missing_source_file(self):
         with self.assertRaisesRegex(ValueError, 'not found!'):
@@ -212,3 +276,144 @@ class StoreTestsOnMethodsTests(unittest.TestCase):
             self.flask_test_path,
             'test_index'
         )
+
+
+class SnippetAnalysisTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _analysis(self):
+        self.analysis = analyze.SnippetAnalysis(
+            os.path.join(_TEST_DIR, 'polyglot_snippet_data.json'),
+            _TEST_DIR
+        )
+
+    def test_source_tags_skip_test_stages(self):
+        with mock.patch('ast_parser.core.analyze._store_tests_on_methods') \
+          as store_mock:
+            assert 'not_main' in self.analysis.source_tags
+            store_mock.assert_not_called()
+
+    def test_memoizes_stage_results(self):
+        with mock.patch('ast_parser.core.analyze._get_data',
+                        wraps=analyze._get_data) as get_data_mock:
+            self.analysis.grep_tags
+            self.analysis.source_methods
+
+            get_data_mock.assert_called_once()
+
+    def test_matches_analyze_json(self):
+        grep_tags, source_tags, ignored_tags, _ = analyze.analyze_json(
+            os.path.join(_TEST_DIR, 'polyglot_snippet_data.json'),
+            _TEST_DIR
+        )
+
+        assert self.analysis.grep_tags == grep_tags
+        assert self.analysis.source_tags == source_tags
+        assert self.analysis.ignored_tags == ignored_tags
+
+    def test_uses_in_memory_snippet_data(self):
+        json_path = os.path.join(_TEST_DIR, 'polyglot_snippet_data.json')
+        snippet_data = analyze._get_data(json_path)
+        expected_tags = self.analysis.source_tags
+
+        with mock.patch('ast_parser.core.analyze._get_data') as get_data_mock:
+            analysis = analyze.SnippetAnalysis(
+                json_path, _TEST_DIR, snippet_data=snippet_data)
+
+            assert analysis.source_tags == expected_tags
+            get_data_mock.assert_not_called()
+
+
+class GitRevisionAnalysisTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _repo(self, tmpdir):
+        self.repo_dir = os.path.join(tmpdir, 'repo')
+        shutil.copytree(_TEST_DIR, self.repo_dir)
+
+        for args in (['init', '-q'], ['add', '-A'],
+                     ['commit', '-q', '-m', 'Add test data']):
+            subprocess.run(
+                ['git', '-c', 'user.name=test', '-c', 'user.email=test@x.com',
+                 *args],
+                cwd=self.repo_dir, check=True)
+
+    @staticmethod
+    def _summarize(analysis):
+        return (
+            analysis.grep_tags,
+            analysis.source_tags,
+            analysis.ignored_tags,
+            sorted((method.source_path, method.name,
+                    sorted(method.region_tags), sorted(method.test_methods))
+                   for method in analysis.source_methods)
+        )
+
+    def test_matches_working_tree_analysis(self):
+        json_path = os.path.join(self.repo_dir, 'polyglot_snippet_data.json')
+        expected = self._summarize(
+            analyze.SnippetAnalysis(json_path, self.repo_dir))
+
+        snippet_data = analyze._get_data(json_path)
+        shutil.rmtree(os.path.join(self.repo_dir, 'edge_cases'))
+
+        with git_utils.GitRevision(self.repo_dir, 'HEAD') as revision:
+            analysis = analyze.SnippetAnalysis(
+                json_path, self.repo_dir, snippet_data=snippet_data,
+                revision=revision)
+
+            assert self._summarize(analysis) == expected
+
+
+class IterSnippetGroupsTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _groups(self):
+        self.json_path = os.path.join(_TEST_DIR, 'polyglot_snippet_data.json')
+        self.yaml_store = DriftYamlStore(_TEST_DIR)
+        self.groups = list(
+            analyze.iter_snippet_groups(self.json_path, self.yaml_store))
+
+    def _method_summary(self, methods):
+        return sorted(
+            (method.source_path, method.name, sorted(method.region_tags),
+             sorted(method.test_methods))
+            for method in methods)
+
+    def test_groups_methods_by_directory(self):
+        directories = [group.directory for group in self.groups]
+
+        assert len(directories) > 1
+        assert len(set(directories)) == len(directories)
+        for group in self.groups:
+            assert all(os.path.dirname(method.source_path) == group.directory
+                       for method in group.source_methods)
+
+    def test_matches_snippet_analysis(self):
+        analysis = analyze.SnippetAnalysis(self.json_path, _TEST_DIR)
+
+        group_methods = [method for group in self.groups
+                         for method in group.source_methods]
+        grep_tags = set().union(*[group.grep_tags for group in self.groups])
+
+        assert self._method_summary(group_methods) == (
+            self._method_summary(analysis.source_methods))
+        assert grep_tags.difference(
+            *[group.ignored_tags for group in self.groups]) == (
+            analysis.grep_tags)
+
+    def test_dedupes_methods_across_groups(self):
+        tag_sets = [method.region_tags for group in self.groups
+                    for method in group.source_methods]
+
+        assert sum(tag_set == ('not_main',) for tag_set in tag_sets) == 1
+
+    def test_uses_in_memory_snippet_data(self):
+        snippet_data = analyze._get_data(self.json_path)
+
+        read_path = 'ast_parser.core.analyze._read_snippet_data_json'
+        with mock.patch(read_path) as read_mock:
+            groups = list(analyze.iter_snippet_groups(
+                self.json_path, self.yaml_store, snippet_data))
+
+            read_mock.assert_not_called()
+
+        assert [group.directory for group in groups] == (
+            [group.directory for group in self.groups])
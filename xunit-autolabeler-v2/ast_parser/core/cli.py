@@ -12,35 +12,78 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import json
 import os
 import xml.etree.ElementTree as etree
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 
-from ast_parser.core import analyze, cli_yaml
+from ast_parser.core import analyze, cli_yaml, snippet_data_shards
 from ast_parser.core import cli_list_region_tags
 from ast_parser.core import cli_list_region_tags_datatypes
 from ast_parser.core import cli_list_source_files
 from ast_parser.core import cli_list_source_files_datatypes
+from ast_parser.core import impact_analysis, smoke_tests
+from ast_parser.core import snapshot_diff, snippet_db, tag_status
+from ast_parser.core import xunit_stream, xunit_utils
 from ast_parser.core.cli_list_source_files_datatypes \
      import ShowTestedFilesOption
+from ast_parser.lib import git_utils
 
 
-def _write_output(output: List[str], output_file: Optional[str]) -> None:
+def _write_output(
+    output: Iterable[str],
+    output_file: Optional[str],
+    flush: bool = False
+) -> None:
     """Helper function that writes output to stdout or a file
 
     This function outputs data from AST parser CLI commands to a given
     filepath (if one is provided) or stdout (if no filepath is provided).
+    Lines are printed to stdout as soon as they are produced.
 
     Args:
-        output: A list of strings to write to the chosen output.
+        output: The lines to write to the chosen output.
         output_file: One of {None, a filepath}.
+        flush: (Optional) Whether to flush each line as it is written, so
+               that readers of the output see it immediately.
     """
-    if output_file:
+    if output_file and flush:
+        with open(output_file, 'w+') as file:
+            for index, line in enumerate(output):
+                file.write(f'\n{line}' if index else line)
+                file.flush()
+    elif output_file:
         with open(output_file, 'w+') as file:
             file.write('\n'.join(output))
     else:
         for line in output:
-            print(line)
+            print(line, flush=flush)
+
+
+def _add_region_tags(
+    testcase: etree.Element,
+    test_tags: Dict[xunit_utils.XUnitTestKey, Set[str]]
+) -> None:
+    """Helper function that adds region tags to an XUnit test case
+
+    Args:
+        testcase: A <testcase> element. Its region tags are merged into its
+                  (comma-separated) region_tags attribute.
+        test_tags: A map from XUnit test keys to region tags (see
+                   tag_status.get_test_tag_index()).
+    """
+    test_key = xunit_utils.get_xunit_test_key(testcase.attrib)
+    if test_key not in test_tags:
+        return
+
+    existing_tag_str = testcase.attrib.get('region_tags')
+    existing_tag_list = (
+        existing_tag_str.split(',') if existing_tag_str else [])
+
+    deduped_tag_list = set(existing_tag_list).union(test_tags[test_key])
+
+    testcase.set('region_tags', ','.join(deduped_tag_list))
 
 
 def list_region_tags(
@@ -50,7 +93,11 @@ def list_region_tags(
     show_undetected: bool,
     show_test_counts: bool,
     show_filenames: bool,
-    output_file: Optional[str] = None
+    output_file: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    snippet_data: Optional[analyze.SnippetData] = None,
+    stream: bool = False,
+    revision: Optional[git_utils.GitRevision] = None
 ) -> None:
     """Lists region tags in a directory.
 
@@ -74,6 +121,16 @@ def list_region_tags(
         output_file: (Optional) A filepath to write the region tag list to.
                      Results will be written to stdout if this argument is
                      argument is omitted.
+        cache_dir: (Optional) A directory to cache analysis inputs (such as
+                   parsed .drift-data.yml files) in between runs.
+        snippet_data: (Optional) In-memory snippet data (see
+                      analyze.create_snippet_data()) to use instead of
+                      data_json.
+        stream: (Optional) Whether to analyze (and output the region tags
+                of) one directory at a time, to limit memory usage.
+        revision: (Optional) A git revision of root_dir (see
+                  git_utils.GitRevision) to analyze instead of the working
+                  tree.
     """
     invocation = cli_list_region_tags_datatypes.ListRegionTagsInvocation(
         data_json,
@@ -81,8 +138,18 @@ def list_region_tags(
         show_detected,
         show_undetected,
         show_test_counts,
-        show_filenames
+        show_filenames,
+        cache_dir,
+        snippet_data,
+        revision
     )
+
+    if stream:
+        _write_output(
+            cli_list_region_tags.iter_list_region_tags(invocation),
+            output_file)
+        return
+
     result = cli_list_region_tags.process_list_region_tags(invocation)
     output_lines = (
         cli_list_region_tags.format_list_region_tags(invocation, result))
@@ -94,7 +161,11 @@ def list_source_files(
     data_json: str,
     root_dir: str,
     show_tested_files: str,
-    output_file: str = None
+    output_file: str = None,
+    cache_dir: Optional[str] = None,
+    snippet_data: Optional[analyze.SnippetData] = None,
+    stream: bool = False,
+    revision: Optional[git_utils.GitRevision] = None
 ) -> None:
     """Lists snippet source file paths in a directory.
 
@@ -112,6 +183,16 @@ def list_source_files(
         output_file: (Optional) A filepath to write the source file list to.
                      Results will be written to stdout if this argument is
                      omitted.
+        cache_dir: (Optional) A directory to cache analysis inputs (such as
+                   parsed .drift-data.yml files) in between runs.
+        snippet_data: (Optional) In-memory snippet data (see
+                      analyze.create_snippet_data()) to use instead of
+                      data_json.
+        stream: (Optional) Whether to analyze (and output the source files
+                of) one directory at a time, to limit memory usage.
+        revision: (Optional) A git revision of root_dir (see
+                  git_utils.GitRevision) to analyze instead of the working
+                  tree.
     """
     tested_files_filter = ShowTestedFilesOption.UNSPECIFIED
     if show_tested_files == 'all':
@@ -124,8 +205,18 @@ def list_source_files(
     invocation = cli_list_source_files_datatypes.ListSourceFilesInvocation(
         data_json,
         root_dir,
-        tested_files_filter
+        tested_files_filter,
+        cache_dir,
+        snippet_data,
+        revision
     )
+
+    if stream:
+        _write_output(
+            cli_list_source_files.iter_list_source_files(invocation),
+            output_file)
+        return
+
     result = cli_list_source_files.process_list_source_files(invocation)
     output_lines = (
         cli_list_source_files.format_list_source_files(invocation, result))
@@ -137,7 +228,10 @@ def inject_snippet_mapping(
     data_json: str,
     root_dir: str,
     stdin_lines: List[str],
-    output_file: str = None
+    output_file: str = None,
+    cache_dir: Optional[str] = None,
+    snippet_data: Optional[analyze.SnippetData] = None,
+    revision: Optional[git_utils.GitRevision] = None
 ) -> None:
     """Adds snippet mapping to XUnit results
 
@@ -154,50 +248,101 @@ def inject_snippet_mapping(
         output_file: (Optional) A filepath to write the modified XUnit test
                      output to. Modified XUnit output will be written to
                      stdout if this argument is omitted.
+        cache_dir: (Optional) A directory to cache analysis inputs (such as
+                   parsed .drift-data.yml files) in between runs.
+        snippet_data: (Optional) In-memory snippet data (see
+                      analyze.create_snippet_data()) to use instead of
+                      data_json.
+        revision: (Optional) A git revision of root_dir (see
+                  git_utils.GitRevision) to analyze instead of the working
+                  tree.
     """
 
-    grep_tags, source_tags, ignored_tags, source_methods = (
-        analyze.analyze_json(data_json, root_dir))
+    source_methods = analyze.SnippetAnalysis(
+        data_json, root_dir, cache_dir, snippet_data, revision
+    ).source_methods
+
+    test_tags = tag_status.get_test_tag_index(source_methods)
 
     xunit_tree = etree.fromstring(''.join(stdin_lines))
 
     for elem in xunit_tree.findall('.//testcase'):
-        class_parts = [part for part in elem.attrib['classname'].split('.')
-                       if not part.startswith('Test')]
-        test_key = (class_parts[-1], elem.attrib['name'])
-        for method in source_methods:
-            method_test_keys = [(
-                os.path.splitext(os.path.basename(test[0]))[0],
-                test[1]
-            ) for test in method['test_methods']]
-
-            if test_key in method_test_keys:
-                # Inject region tags into region_tags XML attribute
-                existing_tag_str = elem.attrib.get('region_tags')
-                existing_tag_list = (
-                    existing_tag_str.split(',') if existing_tag_str else [])
-
-                deduped_tag_list = (
-                    set(existing_tag_list + method['region_tags']))
-
-                elem.set('region_tags', ','.join(deduped_tag_list))
+        _add_region_tags(elem, test_tags)
 
     _write_output(
         [etree.tostring(xunit_tree).decode()],
         output_file)
 
 
+def follow_snippet_mapping(
+    data_json: str,
+    root_dir: str,
+    input_fd: int,
+    output_file: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    snippet_data: Optional[analyze.SnippetData] = None,
+    revision: Optional[git_utils.GitRevision] = None,
+    idle_timeout: Optional[float] = None
+) -> None:
+    """Adds snippet mapping to XUnit results as they are being written
+
+    This method is a live version of inject_snippet_mapping, for XUnit test
+    results that are still being written (to a pipe, or to a growing file).
+    Each test case is annotated and written out as soon as it is complete,
+    and the output is a well-formed XUnit document once the input ends. (If
+    the input ends early, any unfinished test suites are closed.)
+
+    Args:
+        data_json: A path to a polyglot_drift_data.json file for the specified
+                   root directory
+        root_dir: A path to the target root directory.
+        input_fd: The file descriptor to read XUnit test results from. Pipes
+                  are read until they are closed, and regular files until
+                  their XUnit document is complete.
+        output_file: (Optional) A filepath to write the modified XUnit test
+                     output to. Modified XUnit output will be written to
+                     stdout if this argument is omitted.
+        cache_dir: (Optional) A directory to cache analysis inputs (such as
+                   parsed .drift-data.yml files) in between runs.
+        snippet_data: (Optional) In-memory snippet data (see
+                      analyze.create_snippet_data()) to use instead of
+                      data_json.
+        revision: (Optional) A git revision of root_dir (see
+                  git_utils.GitRevision) to analyze instead of the working
+                  tree.
+        idle_timeout: (Optional) The number of seconds to wait for a regular
+                      file to grow before treating its XUnit document as
+                      complete. By default, this method waits indefinitely.
+    """
+    # Analyze snippets before reading any input, so that test
+    # cases can be written out as soon as they are read
+    source_methods = analyze.SnippetAnalysis(
+        data_json, root_dir, cache_dir, snippet_data, revision
+    ).source_methods
+
+    test_tags = tag_status.get_test_tag_index(source_methods)
+
+    _write_output(
+        xunit_stream.iter_annotated_xunit(
+            xunit_stream.read_chunks(input_fd, idle_timeout=idle_timeout),
+            lambda testcase: _add_region_tags(testcase, test_tags)),
+        output_file,
+        flush=True)
+
+
 def validate_yaml(
     data_json: str,
     root_dir: str,
-    output_file: str = None
+    output_file: str = None,
+    cache_dir: Optional[str] = None,
+    snippet_data: Optional[analyze.SnippetData] = None
 ) -> None:
     """Validates .drift-data.yml files in a directory
 
     This method coordinates the function calls necessary to validate
     .drift-data.yml files in a given directory. (The validation process
-    requires data provided by analyze_json(), and this method is responsible
-    for passing that in.)
+    requires data provided by the analyze module, and this method is
+    responsible for passing that in.)
 
     Args:
         data_json: A path to a polyglot_drift_data.json file for the specified
@@ -206,12 +351,37 @@ def validate_yaml(
         output_file: (Optional) A filepath to write the YAML validation
                      results to. Results will be written to stdout if this
                      argument is omitted.
+        cache_dir: (Optional) A directory to cache analysis inputs (such as
+                   parsed .drift-data.yml files) in between runs. If this is
+                   specified, only .drift-data.yml files whose contents (or
+                   dependencies) changed since the last run are validated.
+        snippet_data: (Optional) In-memory snippet data (see
+                      analyze.create_snippet_data()) to use instead of
+                      data_json.
     """
-    grep_tags, source_tags, ignored_tags, source_methods = (
-        analyze.analyze_json(data_json, root_dir))
-
-    (is_valid, output) = cli_yaml.validate_yaml_syntax(
-        root_dir, grep_tags, source_tags)
+    # YAML validation doesn't need test data, so
+    # skip the test-related analysis stages. (Incremental validation
+    # also avoids loading unchanged .drift-data.yml files.)
+    analysis = analyze.SnippetAnalysis(
+        data_json, root_dir, cache_dir, snippet_data)
+
+    if cache_dir:
+        root_hash = hashlib.sha1(
+            os.path.abspath(root_dir).encode('utf-8')).hexdigest()
+        state_path = os.path.join(
+            cache_dir, f'validate-yaml-{root_hash}.json')
+
+        (is_valid, output) = cli_yaml.validate_yaml_syntax_incremental(
+            root_dir,
+            analysis.grep_tags,
+            analysis.get_source_tags,
+            analysis.tag_source_files,
+            state_path,
+            cache_dir
+        )
+    else:
+        (is_valid, output) = cli_yaml.validate_yaml_syntax(
+            analysis.yaml_store, analysis.grep_tags, analysis.source_tags)
 
     if is_valid:
         output.append('All files are valid.')
@@ -219,3 +389,427 @@ def validate_yaml(
         output.append('Invalid file(s) found!')
 
     _write_output(output, output_file)
+
+
+def merge_snippet_data(
+    data_json: str,
+    root_dir: str,
+    output_file: Optional[str] = None,
+    shard_count: Optional[int] = None
+) -> None:
+    """Merges sharded snippet data files into a single snippet data file
+
+    This method combines the polyglot_snippet_data.shard-*.json files in a
+    directory (generated by parsing each of its shards separately) into a
+    single polyglot_snippet_data.json file. Source files are not re-parsed.
+
+    Args:
+        data_json: A path to write the merged polyglot_drift_data.json file to
+        root_dir: A path to the target root directory.
+        output_file: (Optional) A filepath to write a summary of the merge
+                     to. The summary will be written to stdout if this
+                     argument is omitted.
+        shard_count: (Optional) The number of shards the directory was
+                     split into. Shard files from runs with a different
+                     shard count are ignored if this is specified.
+    """
+    shard_paths = snippet_data_shards.find_shard_paths(root_dir, shard_count)
+    merged_json = snippet_data_shards.merge_shards(shard_paths)
+
+    with open(data_json, 'w') as file:
+        json.dump(merged_json, file)
+
+    _write_output([
+        f'Merged {len(shard_paths)} shard(s) '
+        f'({len(merged_json["snippets"])} snippet(s)) into: {data_json}'
+    ], output_file)
+
+
+def export_snippet_db(
+    data_json: str,
+    root_dir: str,
+    db_file: Optional[str] = None,
+    output_file: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    snippet_data: Optional[analyze.SnippetData] = None,
+    revision: Optional[git_utils.GitRevision] = None
+) -> None:
+    """Exports analyzed snippet data to a SQLite database
+
+    This method analyzes a directory and stores the results (snippets,
+    region tags, tests and source files) in an indexed SQLite database.
+    Other tools can then answer questions about the directory using the
+    query command (or their own SQL queries) without re-running analysis.
+
+    Args:
+        data_json: A path to a polyglot_drift_data.json file for the specified
+                   root directory
+        root_dir: A path to the target root directory.
+        db_file: (Optional) A filepath to write the database to. Defaults to
+                 a polyglot_snippet_data.db file in root_dir.
+        output_file: (Optional) A filepath to write a summary of the export
+                     to. The summary will be written to stdout if this
+                     argument is omitted.
+        cache_dir: (Optional) A directory to cache analysis inputs (such as
+                   parsed .drift-data.yml files) in between runs.
+        snippet_data: (Optional) In-memory snippet data (see
+                      analyze.create_snippet_data()) to use instead of
+                      data_json.
+        revision: (Optional) A git revision of root_dir (see
+                  git_utils.GitRevision) to analyze instead of the working
+                  tree.
+    """
+    db_file = db_file or os.path.join(root_dir, snippet_db.DB_FILE_NAME)
+
+    analysis = analyze.SnippetAnalysis(
+        data_json, root_dir, cache_dir, snippet_data, revision)
+    source_methods = analysis.source_methods
+
+    snippet_db.export_snippet_db(
+        db_file,
+        root_dir,
+        analysis.grep_tags,
+        analysis.source_tags,
+        analysis.ignored_tags,
+        source_methods)
+
+    _write_output([
+        f'Exported {len(source_methods)} snippet(s) to: {db_file}'
+    ], output_file)
+
+
+def query_snippet_db(
+    root_dir: str,
+    db_file: Optional[str] = None,
+    tests_for_tag: Optional[str] = None,
+    tags_for_test: Optional[str] = None,
+    untested_files_in: Optional[str] = None,
+    output_file: Optional[str] = None
+) -> None:
+    """Answers questions about a directory using its snippet database
+
+    This method looks up the tests that cover a region tag, the region tags
+    that a test covers, or the untested source files within a directory in
+    a database created by export_snippet_db. (Exactly one of these queries
+    should be specified.)
+
+    Args:
+        root_dir: A path to the target root directory.
+        db_file: (Optional) A path to the database file. Defaults to a
+                 polyglot_snippet_data.db file in root_dir.
+        tests_for_tag: (Optional) A region tag to list the tests of. Tests
+                       are listed as "<test file>::<test name>" strings.
+        tags_for_test: (Optional) A test to list the region tags of, either
+                       as a test name or as a "<test file>::<test name>"
+                       string. (Test files are relative to root_dir.)
+        untested_files_in: (Optional) A directory (relative to root_dir, or
+                           absolute) to list untested source files within.
+        output_file: (Optional) A filepath to write the query results to.
+                     Results will be written to stdout if this argument is
+                     omitted.
+    """
+    db_file = db_file or os.path.join(root_dir, snippet_db.DB_FILE_NAME)
+    connection = snippet_db.open_snippet_db(db_file)
+
+    try:
+        if tests_for_tag is not None:
+            output = [
+                f'{test_path}::{test_name}' for test_path, test_name
+                in snippet_db.get_tests_for_tag(connection, tests_for_tag)]
+        elif tags_for_test is not None:
+            test_path, _, test_name = tags_for_test.rpartition('::')
+            output = snippet_db.get_tags_for_test(
+                connection, test_name, test_path or None)
+        elif untested_files_in is not None:
+            if os.path.isabs(untested_files_in):
+                untested_files_in = os.path.relpath(
+                    untested_files_in, root_dir)
+
+            output = snippet_db.get_untested_files(
+                connection, untested_files_in)
+        else:
+            raise ValueError('Please specify a query.')
+    finally:
+        connection.close()
+
+    _write_output(output, output_file)
+
+
+# Descriptions of snippet_db tested-status values (None marks
+# files with no region-tagged snippets in a snapshot)
+_TESTED_STATUS_LABELS = {
+    snippet_db.ALL_TESTED: 'all tested',
+    snippet_db.SOME_TESTED: 'some tested',
+    snippet_db.NOT_TESTED: 'not tested',
+    None: 'no snippets'
+}
+
+
+def diff_snapshots(
+    data_json: str,
+    root_dir: str,
+    base_snapshot: str,
+    head_snapshot: Optional[str] = None,
+    output_file: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    snippet_data: Optional[analyze.SnippetData] = None,
+    revision: Optional[git_utils.GitRevision] = None
+) -> None:
+    """Compares the analysis results of two snapshots of a directory
+
+    This method reports region tags that were added or removed, region tags
+    that gained or lost tests, and source files whose tested status changed
+    between two snapshots (such as the base and head revisions of a pull
+    request). Only snippets that changed between the snapshots are compared.
+
+    Args:
+        data_json: A path to a polyglot_drift_data.json file for the specified
+                   root directory
+        root_dir: A path to the target root directory.
+        base_snapshot: The earlier snapshot: a snippet database file (created
+                       by export_snippet_db), a polyglot_snippet_data.json
+                       file, or a directory containing one.
+        head_snapshot: (Optional) The later snapshot, in any of the formats
+                       accepted by base_snapshot. Defaults to the current
+                       contents of root_dir.
+        output_file: (Optional) A filepath to write the differences to. They
+                     will be written to stdout if this argument is omitted.
+        cache_dir: (Optional) A directory to cache analysis inputs (such as
+                   parsed .drift-data.yml files) in between runs.
+        snippet_data: (Optional) In-memory snippet data (see
+                      analyze.create_snippet_data()) to use instead of
+                      data_json.
+        revision: (Optional) A git revision of root_dir (see
+                  git_utils.GitRevision) to use as the head snapshot, if
+                  head_snapshot isn't specified.
+    """
+    base = snapshot_diff.open_snapshot(base_snapshot, cache_dir)
+    try:
+        if head_snapshot:
+            head = snapshot_diff.open_snapshot(head_snapshot, cache_dir)
+        else:
+            head = snapshot_diff.create_snapshot(
+                data_json, root_dir, cache_dir, snippet_data, revision)
+
+        try:
+            diff = snapshot_diff.diff_snapshots(base, head)
+        finally:
+            head.close()
+    finally:
+        base.close()
+
+    output = []
+    if diff.added_tags:
+        output.append('Added region tags:')
+        output += [f'  {tag}' for tag in diff.added_tags]
+    if diff.removed_tags:
+        output.append('Removed region tags:')
+        output += [f'  {tag}' for tag in diff.removed_tags]
+
+    for header, tag_tests in (
+        ('Region tags with new tests:', diff.gained_tests),
+        ('Region tags with removed tests:', diff.lost_tests)
+    ):
+        if tag_tests:
+            output.append(header)
+        for tag, tests in tag_tests.items():
+            output.append(f'  {tag}')
+            output += [f'    {test_path}::{test_name}'
+                       for test_path, test_name in tests]
+
+    if diff.changed_files:
+        output.append('Source files with a changed test status:')
+    for path, (base_status, head_status) in diff.changed_files.items():
+        output.append(
+            f'  {path}: {_TESTED_STATUS_LABELS[base_status]} -> '
+            f'{_TESTED_STATUS_LABELS[head_status]}')
+
+    _write_output(output or ['No changes found.'], output_file)
+
+
+def select_tests(
+    data_json: str,
+    root_dir: str,
+    changes: List[str],
+    output_file: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    snippet_data: Optional[analyze.SnippetData] = None,
+    revision: Optional[git_utils.GitRevision] = None
+) -> None:
+    """Lists the tests affected by a set of changed files
+
+    This method maps changed files (or line ranges within them) to the
+    snippets they affect, including snippets that call changed methods and
+    snippets in the same .drift-data.yml "additions" groups. It then lists
+    the test files and tests that cover those snippets.
+
+    Args:
+        data_json: A path to a polyglot_drift_data.json file for the specified
+                   root directory
+        root_dir: A path to the target root directory.
+        changes: The changed files, as PATH, PATH:LINE or PATH:START-END
+                 strings. (Paths are relative to root_dir.)
+        output_file: (Optional) A filepath to write the selected tests to.
+                     They will be written to stdout if this argument is
+                     omitted.
+        cache_dir: (Optional) A directory to cache analysis inputs (such as
+                   parsed .drift-data.yml files) in between runs.
+        snippet_data: (Optional) In-memory snippet data (see
+                      analyze.create_snippet_data()) to use instead of
+                      data_json.
+        revision: (Optional) A git revision of root_dir (see
+                  git_utils.GitRevision) to analyze instead of the working
+                  tree.
+    """
+    analysis = analyze.SnippetAnalysis(
+        data_json, root_dir, cache_dir, snippet_data, revision)
+
+    selection = impact_analysis.select_tests(
+        analysis, impact_analysis.parse_changes(changes, root_dir))
+
+    tests = [(os.path.relpath(test_path, root_dir), test_name)
+             for test_path, test_name in selection.tests]
+
+    output = []
+    if tests:
+        output.append('Test files:')
+        output += [f'  {test_path}'
+                   for test_path in sorted(set(path for path, _ in tests))]
+        output.append('Tests:')
+        output += [f'  {test_path}::{test_name}'
+                   for test_path, test_name in tests]
+
+    _write_output(output or ['No affected tests found.'], output_file)
+
+
+def select_smoke_tests(
+    data_json: str,
+    root_dir: str,
+    xunit_files: List[str],
+    default_duration: Optional[float] = None,
+    output_file: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    snippet_data: Optional[analyze.SnippetData] = None,
+    revision: Optional[git_utils.GitRevision] = None
+) -> None:
+    """Lists a fast set of tests that covers every detected region tag
+
+    This method picks a near-minimal-runtime set of tests that covers every
+    region tag detected by the AST parser at least once (using a greedy
+    weighted set cover). Test durations are read from the "time" attributes
+    of existing XUnit test results.
+
+    Args:
+        data_json: A path to a polyglot_drift_data.json file for the specified
+                   root directory
+        root_dir: A path to the target root directory.
+        xunit_files: Paths to XUnit test results (or directories containing
+                     them) to read test durations from.
+        default_duration: (Optional) The duration (in seconds) of tests
+                          missing from the XUnit test results. Defaults to
+                          the mean duration of the other tests.
+        output_file: (Optional) A filepath to write the selected tests to.
+                     They will be written to stdout if this argument is
+                     omitted.
+        cache_dir: (Optional) A directory to cache analysis inputs (such as
+                   parsed .drift-data.yml files) in between runs.
+        snippet_data: (Optional) In-memory snippet data (see
+                      analyze.create_snippet_data()) to use instead of
+                      data_json.
+        revision: (Optional) A git revision of root_dir (see
+                  git_utils.GitRevision) to analyze instead of the working
+                  tree.
+    """
+    analysis = analyze.SnippetAnalysis(
+        data_json, root_dir, cache_dir, snippet_data, revision)
+
+    selection = smoke_tests.select_smoke_tests(
+        analysis.source_methods,
+        analysis.source_tags,
+        xunit_utils.read_test_durations(
+            xunit_utils.find_xunit_files(xunit_files)),
+        default_duration)
+
+    output = []
+    if selection.durations:
+        output.append('Selected tests:')
+    for test in sorted(selection.durations):
+        test_path, test_name = test
+        estimated = (
+            ', estimated' if test in selection.estimated_tests else '')
+        output.append(
+            f'  {os.path.relpath(test_path, root_dir)}::{test_name} '
+            f'({selection.durations[test]:.3f}s{estimated})')
+
+    output.append(
+        f'Estimated total runtime: {selection.total_duration:.3f}s '
+        f'({len(selection.durations)} test(s))')
+
+    if selection.uncovered_tags:
+        output.append('Region tags without tests:')
+        output += [f'  {tag}' for tag in selection.uncovered_tags]
+
+    _write_output(output, output_file)
+
+
+def aggregate_xunit_results(
+    data_json: str,
+    root_dir: str,
+    xunit_files: List[str],
+    max_workers: Optional[int] = None,
+    output_file: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    snippet_data: Optional[analyze.SnippetData] = None,
+    revision: Optional[git_utils.GitRevision] = None
+) -> None:
+    """Summarizes the results of many XUnit reports by region tag
+
+    This method matches the test cases in a set of XUnit reports (such as
+    those from a night of test runs) with region tags, the same way
+    inject_snippet_mapping does. It then lists the status of each region tag
+    (passing, failing, flaky or skipped) and its combined test outcomes.
+    Reports are streamed and processed in parallel. Reports that can't be
+    parsed (e.g. truncated ones) are skipped, and listed at the end.
+
+    Args:
+        data_json: A path to a polyglot_drift_data.json file for the specified
+                   root directory
+        root_dir: A path to the target root directory.
+        xunit_files: Paths to XUnit reports, or to directories containing
+                     them (as .xml files).
+        max_workers: (Optional) The maximum number of processes to read
+                     reports with. Defaults to the number of CPUs.
+        output_file: (Optional) A filepath to write the summary to. It will
+                     be written to stdout if this argument is omitted.
+        cache_dir: (Optional) A directory to cache analysis inputs (such as
+                   parsed .drift-data.yml files) in between runs.
+        snippet_data: (Optional) In-memory snippet data (see
+                      analyze.create_snippet_data()) to use instead of
+                      data_json.
+        revision: (Optional) A git revision of root_dir (see
+                  git_utils.GitRevision) to analyze instead of the working
+                  tree.
+    """
+    analysis = analyze.SnippetAnalysis(
+        data_json, root_dir, cache_dir, snippet_data, revision)
+
+    xunit_paths = xunit_utils.find_xunit_files(xunit_files)
+    tag_statuses, skipped_reports = tag_status.aggregate_tag_statuses(
+        analysis.source_methods, xunit_paths, max_workers)
+
+    output = [
+        f'Aggregated {len(xunit_paths) - len(skipped_reports)} report(s).']
+    for tag in sorted(analysis.source_tags.intersection(tag_statuses)):
+        status, outcomes = tag_statuses[tag]
+        output.append(
+            f'{tag}: {status} ('
+            f'{outcomes[xunit_utils.PASSED]} passed, '
+            f'{outcomes[xunit_utils.FAILED]} failed, '
+            f'{outcomes[xunit_utils.FLAKY]} flaky, '
+            f'{outcomes[xunit_utils.SKIPPED]} skipped)')
+
+    if skipped_reports:
+        output.append('Skipped unreadable report(s):')
+        output += [f'  {xunit_path}' for xunit_path in skipped_reports]
+
+    _write_output(output, output_file)
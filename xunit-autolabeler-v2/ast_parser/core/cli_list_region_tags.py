@@ -13,10 +13,11 @@
 # limitations under the License.
 
 
-from typing import List
+from typing import Dict, Iterator, List, Optional, Set
 
-from ast_parser.core import analyze
+from ast_parser.core import analyze, constants, yaml_utils
 from ast_parser.core import cli_list_region_tags_datatypes as cli_datatypes
+from ast_parser.core.drift_yaml_store import DriftYamlStore
 
 
 # This file contains helper functions for the list_region_tags CLI command.
@@ -45,12 +46,25 @@ def process_list_region_tags(
         for test_data in test_data_matches:
             total_tests += len(test_data['test_methods'])
 
-        return f'({total_tests} test(s))'
+        return _format_test_count(total_tests)
 
-    grep_tags, source_tags, ignored_tags, source_methods = (
-        analyze.analyze_json(invocation.data_json, invocation.root_dir))
+    analysis = analyze.SnippetAnalysis(
+        invocation.data_json, invocation.root_dir, invocation.cache_dir,
+        invocation.snippet_data, invocation.revision)
 
-    test_count_map = {tag: _get_test_count_str(tag) for tag in source_tags}
+    grep_tags = analysis.grep_tags
+    source_tags = analysis.source_tags
+    ignored_tags = analysis.ignored_tags
+
+    # Snippet methods (and their tests) are only required
+    # for test counts and filenames, so skip them otherwise
+    source_methods = []
+    test_count_map = {}
+    if invocation.show_detected and \
+       (invocation.show_test_counts or invocation.show_filenames):
+        source_methods = analysis.source_methods
+        test_count_map = {
+            tag: _get_test_count_str(tag) for tag in source_tags}
 
     undetected_tags = [tag for tag in grep_tags
                        if tag not in source_tags
@@ -65,6 +79,39 @@ def process_list_region_tags(
     )
 
 
+def _format_test_count(total_tests: int) -> str:
+    return f'({total_tests} test(s))'
+
+
+def _format_detected_tag(
+    invocation: cli_datatypes.ListRegionTagsInvocation,
+    tag: str,
+    test_count_str: Optional[str],
+    source_file: Optional[str]
+) -> List[str]:
+    """Format a single entry of the "Detected region tags" section
+
+    Args:
+        invocation: A CLI invocation object with the requisite user input.
+        tag: The detected region tag.
+        test_count_str: The tag's (formatted) test count, if displayed.
+        source_file: The first source file containing the tag, if displayed.
+
+    Returns:
+        Human readable output as a list of lines.
+    """
+    output_lines = []
+    if invocation.show_test_counts:
+        output_lines.append(f'  {tag} {test_count_str}')
+    else:
+        output_lines.append(f'  {tag}')
+
+    if invocation.show_filenames:
+        output_lines.append(f'    Source file: {source_file}')
+
+    return output_lines
+
+
 def format_list_region_tags(
     invocation: cli_datatypes.ListRegionTagsInvocation,
     result: cli_datatypes.ListRegionTagsResult,
@@ -91,16 +138,14 @@ def format_list_region_tags(
     if invocation.show_detected:
         output_lines.append('Detected region tags:')
         for tag in result.source_tags:
-            if invocation.show_test_counts:
-                output_lines.append(f'  {tag} {result.test_count_map[tag]}')
-            else:
-                output_lines.append(f'  {tag}')
-
+            source_file = None
             if invocation.show_filenames:
                 source_file = [method['source_path']
                                for method in result.source_methods
                                if tag in method['region_tags']][0]
-                output_lines.append(f'    Source file: {source_file}')
+
+            output_lines += _format_detected_tag(
+                invocation, tag, result.test_count_map.get(tag), source_file)
 
     if invocation.show_undetected:
         output_lines.append('Undetected region tags:')
@@ -114,3 +159,101 @@ def format_list_region_tags(
             output_lines.append(f'  {tag}')
 
     return output_lines
+
+
+def iter_list_region_tags(
+    invocation: cli_datatypes.ListRegionTagsInvocation
+) -> Iterator[str]:
+    """Compute and format list_region_tags output one directory at a time
+
+    This method is a streaming version of process_list_region_tags() and
+    format_list_region_tags(). It analyzes one source directory at a time
+    (see analyze.iter_snippet_groups()), and only keeps sets of region tags
+    (rather than snippet methods) in memory between directories.
+
+    Detected region tags are output as soon as the directory containing them
+    has been analyzed. However, a tag's test count isn't known until every
+    directory has been analyzed, so detected tags are output at the end if
+    test counts are displayed. (The other sections are always output at the
+    end.) Tags are output in a different order than format_list_region_tags,
+    but the output contains the same lines.
+
+    Args:
+        invocation: A CLI invocation object with the requisite user input.
+
+    Returns:
+        An iterator of human readable output lines.
+    """
+    yaml_store = DriftYamlStore(
+        invocation.root_dir, invocation.cache_dir, invocation.revision)
+    groups = analyze.iter_snippet_groups(
+        invocation.data_json, yaml_store, invocation.snippet_data,
+        invocation.revision)
+
+    if invocation.show_undetected and invocation.show_test_counts:
+        yield 'WARN Undetected/ignored region tags do not have test counts'
+
+    if invocation.show_detected:
+        yield 'Detected region tags:'
+
+    grep_tags: Set[str] = set()
+    source_tags: Set[str] = set()
+    file_ignored_tags: Set[str] = set()
+    tag_source_files: Dict[str, str] = {}
+    tag_test_counts: Dict[str, int] = {}
+
+    # Tags that may (depending on other directories) turn out to be
+    # ignored, or whose test counts may change, are output at the end
+    deferred_tags: List[str] = []
+
+    for group in groups:
+        grep_tags.update(group.grep_tags)
+        file_ignored_tags.update(group.ignored_tags)
+
+        group_tags: Set[str] = set()
+        for method in group.source_methods:
+            method_tags = set(method.region_tags)
+            group_tags.update(method_tags)
+
+            for tag in method_tags:
+                tag_source_files.setdefault(tag, method.source_path)
+                tag_test_counts[tag] = (
+                    tag_test_counts.get(tag, 0) + len(method.test_methods))
+
+        new_tags = group_tags.difference(source_tags)
+        source_tags.update(new_tags)
+
+        for tag in new_tags:
+            if invocation.show_test_counts or \
+               tag in constants.IGNORED_REGION_TAGS:
+                deferred_tags.append(tag)
+            elif invocation.show_detected:
+                yield from _format_detected_tag(
+                    invocation, tag, None, tag_source_files[tag])
+
+    # Remove automatically ignored region tags (as in SnippetAnalysis)
+    source_tags = set(tag for tag in source_tags
+                      if tag not in file_ignored_tags)
+    ignored_tags = file_ignored_tags.union(
+        yaml_utils.get_untested_region_tags(yaml_store))
+
+    if invocation.show_detected:
+        for tag in deferred_tags:
+            if tag in source_tags:
+                yield from _format_detected_tag(
+                    invocation,
+                    tag,
+                    _format_test_count(tag_test_counts[tag]),
+                    tag_source_files[tag])
+
+    if invocation.show_undetected:
+        yield 'Undetected region tags:'
+
+        for tag in grep_tags:
+            if tag not in source_tags and tag not in ignored_tags:
+                yield f'  {tag}'
+
+    if ignored_tags:
+        yield 'Ignored region tags'
+        for tag in ignored_tags:
+            yield f'  {tag}'
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 import dataclasses
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 
 """
@@ -52,6 +52,17 @@ class ListRegionTagsInvocation:
     # Whether to show source filenames for each AST-parser-detected region tag.
     show_filenames: bool
 
+    # (Optional) A directory to cache analysis inputs in between runs.
+    cache_dir: Optional[str] = None
+
+    # (Optional) In-memory snippet data to use instead of data_json.
+    # (See analyze.create_snippet_data() for its format.)
+    snippet_data: Optional[Any] = None
+
+    # (Optional) A git revision (see git_utils.GitRevision) of root_dir to
+    # read files from, instead of the working tree.
+    revision: Optional[Any] = None
+
 
 @dataclasses.dataclass(repr=False)
 class ListRegionTagsResult:
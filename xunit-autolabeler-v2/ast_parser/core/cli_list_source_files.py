@@ -13,12 +13,14 @@
 # limitations under the License.
 
 
-from typing import List
+from typing import Iterator, List
 
 from ast_parser.core import analyze
 from ast_parser.core import cli_list_source_files_datatypes as cli_datatypes
+from ast_parser.core import polyglot_drift_data as pdd
 from ast_parser.core.cli_list_source_files_datatypes \
      import ShowTestedFilesOption
+from ast_parser.core.drift_yaml_store import DriftYamlStore
 
 
 # This file contains helper functions for the list_source_files CLI command.
@@ -40,9 +42,25 @@ def process_list_source_files(
         A CLI response object with the required processed data.
     """
 
-    grep_tags, source_tags, ignored_tags, source_methods = (
-        analyze.analyze_json(invocation.data_json, invocation.root_dir))
+    # Region tag lists aren't displayed, so only compute snippet methods
+    analysis = analyze.SnippetAnalysis(
+        invocation.data_json, invocation.root_dir, invocation.cache_dir,
+        invocation.snippet_data, invocation.revision)
+    return _classify_source_files(analysis.source_methods)
 
+
+def _classify_source_files(
+    source_methods: List[pdd.PolyglotDriftData]
+) -> cli_datatypes.ListSourceFilesResult:
+    """Group snippet source files by how many of their methods are tested
+
+    Args:
+        source_methods: Snippet methods with their tests attached. (This
+                        must include every method of each source file.)
+
+    Returns:
+        A CLI response object with the required processed data.
+    """
     # Ignore methods without region tags
     source_methods = [method for method in source_methods
                       if method['region_tags']]
@@ -101,3 +119,31 @@ def format_list_source_files(
         files = result.all_files
 
     return files
+
+
+def iter_list_source_files(
+    invocation: cli_datatypes.ListSourceFilesInvocation
+) -> Iterator[str]:
+    """Compute and format list_source_files output one directory at a time
+
+    This method is a streaming version of process_list_source_files() and
+    format_list_source_files(). Each source file's methods are analyzed
+    together (see analyze.iter_snippet_groups()), so files are output as
+    soon as the directory containing them has been analyzed.
+
+    Args:
+        invocation: A CLI invocation object with the requisite user input.
+
+    Returns:
+        An iterator of human-readable filepaths
+    """
+    yaml_store = DriftYamlStore(
+        invocation.root_dir, invocation.cache_dir, invocation.revision)
+
+    for group in analyze.iter_snippet_groups(
+        invocation.data_json, yaml_store, invocation.snippet_data,
+        invocation.revision
+    ):
+        result = _classify_source_files(group.source_methods)
+
+        yield from format_list_source_files(invocation, result)
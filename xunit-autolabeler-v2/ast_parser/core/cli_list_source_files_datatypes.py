@@ -14,7 +14,7 @@
 
 import dataclasses
 from enum import Enum
-from typing import List
+from typing import Any, List, Optional
 
 
 """
@@ -58,6 +58,17 @@ class ListSourceFilesInvocation:
     # Whether to show files that various levels of test coverage.
     show_tested_files: ShowTestedFilesOption
 
+    # (Optional) A directory to cache analysis inputs in between runs.
+    cache_dir: Optional[str] = None
+
+    # (Optional) In-memory snippet data to use instead of data_json.
+    # (See analyze.create_snippet_data() for its format.)
+    snippet_data: Optional[Any] = None
+
+    # (Optional) A git revision (see git_utils.GitRevision) of root_dir to
+    # read files from, instead of the working tree.
+    revision: Optional[Any] = None
+
 
 @dataclasses.dataclass(repr=False)
 class ListSourceFilesResult:
@@ -370,3 +370,44 @@ class ListSourceFilesTest(unittest.TestCase):
 
         assert tests_no_methods in out
         assert tests_some_methods not in out
+
+
+class StreamingOutputTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def capsys(self, capsys):
+        self.capsys = capsys
+
+    def _get_output_lines(self, command, root_dir, *args, stream):
+        command(
+            os.path.join(root_dir, 'polyglot_snippet_data.json'),
+            root_dir,
+            *args,
+            stream=stream)
+        out, _ = self.capsys.readouterr()
+
+        return sorted(out.splitlines())
+
+    def _assert_streaming_output_matches(self, command, root_dir, *args):
+        assert self._get_output_lines(
+            command, root_dir, *args, stream=True) == (
+            self._get_output_lines(command, root_dir, *args, stream=False))
+
+    def test_list_region_tags(self):
+        for root_dir in ('parser', 'cli/additions', 'yaml/smoke_tests'):
+            self._assert_streaming_output_matches(
+                cli.list_region_tags,
+                os.path.join(TEST_DATA_PATH, root_dir),
+                True, True, True, True)
+
+    def test_list_region_tags_without_test_counts(self):
+        self._assert_streaming_output_matches(
+            cli.list_region_tags,
+            os.path.join(TEST_DATA_PATH, 'parser'),
+            True, True, False, True)
+
+    def test_list_source_files(self):
+        for tested_files in ('*', 'all', 'some', 'none'):
+            self._assert_streaming_output_matches(
+                cli.list_source_files,
+                os.path.join(TEST_DATA_PATH, 'parser'),
+                tested_files)
@@ -12,13 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import dataclasses
+import functools
+import json
 import os
-from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any, Callable, Collection, Dict, FrozenSet, List, Optional, Tuple)
 
 from ast_parser.core import cli_yaml_errors, constants
+from ast_parser.core.drift_yaml_store import (
+    DriftYamlStore, get_additions_groups, get_additions_index, load_yaml_file)
 from ast_parser.lib import file_utils
 
-import yaml
+
+# Bump this whenever validation logic changes, so that
+# stale incremental validation state is discarded
+VALIDATION_STATE_VERSION = 2
 
 
 def _attr_required_values_get_errors(
@@ -57,7 +67,7 @@ def _attr_additions_get_errors(
     yaml_entry: Dict[str, Any],
     region_tag: str,
     attr: str,
-    grep_tags: List[str]
+    grep_tags: Collection[str]
 ) -> Optional[str]:
     """Report any incorrect values for additions attributes
 
@@ -95,7 +105,8 @@ def _attr_manually_specified_tests_get_errors(
     yaml_entry: Dict[str, Any],
     tag: str,
     attr: str,
-    grep_tags: List[str]
+    grep_tags: Collection[str],
+    path_exists: Callable[[str], bool] = os.path.exists
 ) -> List[str]:
     """Report incorrect manually-specified test attributes
 
@@ -109,6 +120,8 @@ def _attr_manually_specified_tests_get_errors(
         attr: The attribute of the YAML entry to validate
         grep_tags: A list of tags existing (not necessarily parsed out of)
                    the source code
+        path_exists: A (possibly memoized) function that checks whether
+                     a given filepath exists
 
     Returns:
         An error message if the manually-specified tests are invalid; None
@@ -124,7 +137,7 @@ def _attr_manually_specified_tests_get_errors(
         if not os.path.isabs(test_path):
             test_path = os.path.join(yaml_dirname, test_path)
 
-        if not os.path.exists(test_path):
+        if not path_exists(test_path):
             errors.append(
                 cli_yaml_errors.MissingTestFileViolation(
                     test_path, yaml_path))
@@ -132,160 +145,186 @@ def _attr_manually_specified_tests_get_errors(
     return errors
 
 
-def _get_attr_errors(
-    yaml_paths: List[str],
-    grep_tags: List[str]
-) -> Tuple[bool, List[str]]:
-    """Report attribute errors in a list of .drift-data.yml files
+def _get_file_attr_errors(
+    yaml_path: str,
+    parsed_yaml: Dict[str, Any],
+    grep_tags: Collection[str],
+    path_exists: Callable[[str], bool]
+) -> List[str]:
+    """Report attribute errors in a single .drift-data.yml file
 
     This method verifies that attributes within
     a .drift-data.yml file are used appropriately.
 
     Args:
-        yaml_paths: A list of .drift-data.yml filepaths to validate
+        yaml_path: The path of the .drift-data.yml file to validate
+        parsed_yaml: The parsed contents of the .drift-data.yml file
         grep_tags: A list of region tags (parsed *and* unparsed) that exist
                    in the target directory
+        path_exists: A (possibly memoized) function that checks whether
+                     a given filepath exists
 
     Returns:
-        A 2-tuple containing the following:
-         - A boolean including file validity (True if all files passed
-           attribute validation, False otherwise)
-         - A list of validation error messages (if any) that were raised
+        A list of validation error messages (if any) that were raised
     """
-
     errors = []
 
-    for yaml_path in yaml_paths:
-        with open(yaml_path, 'r') as file:
-            yaml_contents = '\n'.join(file.readlines())
-            parsed_yaml = yaml.safe_load(yaml_contents)
-
-            for tag in parsed_yaml.keys():
-                yaml_entry = parsed_yaml[tag]
-                yaml_keys = list(yaml_entry.keys())
-
-                if not yaml_keys:
-                    continue
-
-                yaml_attr = yaml_keys[0]
-
-                # Validate keys that require specific values
-                required_value_error = _attr_required_values_get_errors(
-                    yaml_path,
-                    yaml_entry,
-                    tag,
-                    yaml_attr
-                )
-                if required_value_error:
-                    errors.append(required_value_error)
-
-                # Validate additions field
-                additions_error = _attr_additions_get_errors(
-                    yaml_path,
-                    yaml_entry,
-                    tag,
-                    yaml_attr,
-                    grep_tags
-                )
-                if additions_error:
-                    errors.append(additions_error)
-
-                # Validate manually-specified tests
-                manual_errors = _attr_manually_specified_tests_get_errors(
-                    yaml_path,
-                    yaml_entry,
-                    tag,
-                    yaml_attr,
-                    grep_tags
-                )
-                if manual_errors:
-                    errors += manual_errors
-
-    is_valid = not errors
-    return is_valid, errors
+    for tag in parsed_yaml.keys():
+        yaml_entry = parsed_yaml[tag]
+        yaml_keys = list(yaml_entry.keys())
+
+        if not yaml_keys:
+            continue
+
+        yaml_attr = yaml_keys[0]
+
+        # Validate keys that require specific values
+        required_value_error = _attr_required_values_get_errors(
+            yaml_path,
+            yaml_entry,
+            tag,
+            yaml_attr
+        )
+        if required_value_error:
+            errors.append(required_value_error)
+
+        # Validate additions field
+        additions_error = _attr_additions_get_errors(
+            yaml_path,
+            yaml_entry,
+            tag,
+            yaml_attr,
+            grep_tags
+        )
+        if additions_error:
+            errors.append(additions_error)
+
+        # Validate manually-specified tests
+        manual_errors = _attr_manually_specified_tests_get_errors(
+            yaml_path,
+            yaml_entry,
+            tag,
+            yaml_attr,
+            grep_tags,
+            path_exists
+        )
+        if manual_errors:
+            errors += manual_errors
 
+    return errors
 
-def _get_region_tag_errors(
-    yaml_paths: List[str],
-    grep_tags: List[str],
-    source_tags: List[str],
-) -> Tuple[bool, List[str]]:
-    """Report region-tag errors in a list of .drift-data.yml files
+
+def _get_file_region_tag_errors(
+    yaml_path: str,
+    parsed_yaml: Dict[str, Any],
+    grep_tags: Collection[str],
+    source_tags: Collection[str],
+) -> List[List[str]]:
+    """Report region-tag errors in a single .drift-data.yml file
 
     This method verifies that region tag keys within a .drift-data.yml
-    file are used *exactly* once in the source code.
+    file are used in the source code. (Checking that tags are used at most
+    once across *all* files is done separately, in
+    _get_region_tag_errors().)
 
     Args:
-        yaml_paths: A list of .drift-data.yml filepaths to validate
+        yaml_path: The path of the .drift-data.yml file to validate
+        parsed_yaml: The parsed contents of the .drift-data.yml file
         grep_tags: A list of region tags (parsed *and* unparsed) that exist
                    in the target directory
         source_tags: A list of successfully-parsed region tags in the target
                      directory
 
     Returns:
-        A 2-tuple containing the following:
-         - A boolean including file validity (True if all files passed region
-           tag validation, False otherwise)
-         - A list of validation error messages (if any) that were raised
+        A list containing the validation error messages (if any) raised for
+        each of the file's region tags, in file order
     """
+    tag_errors = []
+
+    for tag in parsed_yaml.keys():
+        yaml_entry = parsed_yaml[tag]
+        tag_should_be_in_source = not (
+            'tested' in yaml_entry and yaml_entry['tested'] is False)
+
+        # Verify mentioned region tags are used in the
+        # source code (via parsing and/or grep results)
+        errors = []
+        if tag not in grep_tags:
+            errors.append(
+                cli_yaml_errors.UnusedRegionTagViolation(
+                    tag, yaml_path))
+        elif tag_should_be_in_source and tag not in source_tags:
+            errors.append(cli_yaml_errors.UnparsedRegionTagViolation(
+                tag, yaml_path))
+        elif not tag_should_be_in_source and tag in source_tags:
+            errors.append(
+                cli_yaml_errors.DetectedTagMarkedUndetectedViolation(
+                    tag, yaml_path))
+
+        tag_errors.append(errors)
+
+    return tag_errors
+
+
+def _get_region_tag_errors(
+    file_tags: List[List[str]],
+    file_tag_errors: List[List[List[str]]]
+) -> List[str]:
+    """Merge per-file region-tag errors and check for repeated tags
+
+    This method verifies that region tag keys are used *exactly* once across
+    a list of .drift-data.yml files. Its output is ordered as though every
+    file had been validated serially.
+
+    Args:
+        file_tags: The region tag keys of each .drift-data.yml file,
+                   in file order
+        file_tag_errors: The per-tag errors for each file, as returned
+                         by _get_file_region_tag_errors()
 
+    Returns:
+        A list of validation error messages (if any) that were raised
+    """
     seen_region_tags = set()
     output = []
-    is_valid = True
 
-    for yaml_path in yaml_paths:
-        with open(yaml_path, 'r') as file:
-            yaml_contents = '\n'.join(file.readlines())
-            parsed_yaml = yaml.safe_load(yaml_contents)
-
-            for tag in parsed_yaml.keys():
-                yaml_entry = parsed_yaml[tag]
-                tag_should_be_in_source = not (
-                    'tested' in yaml_entry and yaml_entry['tested'] is False)
-
-                # Verify mentioned region tags are used in the
-                # source code (via parsing and/or grep results)
-                if tag not in grep_tags:
-                    output.append(
-                        cli_yaml_errors.UnusedRegionTagViolation(
-                            tag, yaml_path))
-                    is_valid = False
-                elif tag_should_be_in_source and tag not in source_tags:
-                    output.append(cli_yaml_errors.UnparsedRegionTagViolation(
-                        tag, yaml_path))
-                    is_valid = False
-                elif not tag_should_be_in_source and tag in source_tags:
-                    output.append(
-                        cli_yaml_errors.DetectedTagMarkedUndetectedViolation(
-                            tag, yaml_path))
-                    is_valid = False
-
-                # Verify region tags are present at most once
-                if tag in seen_region_tags:
-                    output.append(cli_yaml_errors.RepeatedTagViolation(tag))
-                    is_valid = False
-                else:
-                    seen_region_tags.add(tag)
+    for tags, tag_errors in zip(file_tags, file_tag_errors):
+        for tag, errors in zip(tags, tag_errors):
+            output += errors
 
-    return is_valid, output
+            # Verify region tags are present at most once
+            if tag in seen_region_tags:
+                output.append(cli_yaml_errors.RepeatedTagViolation(tag))
+            else:
+                seen_region_tags.add(tag)
+
+    return output
 
 
 def validate_yaml_syntax(
-    root_dir: str,
-    grep_tags: List[str],
-    source_tags: List[str]
+    yaml_store: DriftYamlStore,
+    grep_tags: Collection[str],
+    source_tags: Collection[str],
+    max_workers: Optional[int] = None
 ) -> Tuple[bool, List[str]]:
     """Validate a given directory's .drift-data.yml files
 
     This method validates that a given directory's .drift-data.yml files are
     semantically correct, and match up with the directory's source code.
 
+    Files are validated individually in a thread pool (sharing a memoized
+    cache of test file existence checks), after which repeated region tags
+    are detected across all files. Violations are reported in the same
+    order as a serial run.
+
     Args:
-        yaml_paths: A list of .drift-data.yml filepaths to validate
+        yaml_store: The parsed .drift-data.yml files to validate
         grep_tags: A list of region tags (parsed *and* unparsed) that exist
                    in the target directory
         source_tags: A list of successfully-parsed region tags in the target
                      directory
+        max_workers: (Optional) The maximum number of threads to validate
+                     files with
 
     Returns:
         A 2-tuple containing the following:
@@ -293,15 +332,387 @@ def validate_yaml_syntax(
            files passed validation, False otherwise)
          - A list of validation error messages (if any) that were raised
     """
+    parsed_files = yaml_store.parsed_files
+    path_exists = functools.lru_cache(maxsize=None)(os.path.exists)
+
+    def _validate_file(
+        parsed_file: Tuple[str, Dict[str, Any]]
+    ) -> Tuple[List[List[str]], List[str]]:
+        yaml_path, parsed_yaml = parsed_file
+        return (
+            _get_file_region_tag_errors(
+                yaml_path, parsed_yaml, grep_tags, source_tags),
+            _get_file_attr_errors(
+                yaml_path, parsed_yaml, grep_tags, path_exists)
+        )
+
+    # ThreadPoolExecutor.map() returns results in input order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        file_results = list(executor.map(_validate_file, parsed_files))
+
+    tags_violations = _get_region_tag_errors(
+        [list(parsed_yaml.keys()) for _, parsed_yaml in parsed_files],
+        [tag_errors for tag_errors, _ in file_results])
+
+    attrs_violations = []
+    for _, attr_errors in file_results:
+        attrs_violations += attr_errors
+
+    violations = tags_violations + attrs_violations
+    output = [str(violation) for violation in violations]
+
+    is_valid = not violations
+
+    return is_valid, output
+
+
+def _serialize_violation(violation: Any) -> List[Any]:
+    """Convert a cli_yaml_errors violation into a JSON-compatible list"""
+    return [type(violation).__name__, list(dataclasses.astuple(violation))]
+
+
+def _deserialize_violation(serialized: List[Any]) -> Any:
+    """Rebuild a violation created by _serialize_violation()"""
+    class_name, fields = serialized
+    return getattr(cli_yaml_errors, class_name)(*fields)
+
+
+def _get_file_dependencies(
+    yaml_path: str,
+    parsed_yaml: Dict[str, Any]
+) -> Tuple[List[str], List[str]]:
+    """List the region tags and test files a .drift-data.yml file refers to
+
+    A file's validation results only change if its own contents change, or
+    if the status of one of these dependencies does.
+
+    Args:
+        yaml_path: The path of a .drift-data.yml file
+        parsed_yaml: The parsed contents of the .drift-data.yml file
+
+    Returns:
+        A 2-tuple containing the following:
+         - A list of referenced region tags (as keys or in "additions"
+           clauses)
+         - A list of (absolute or yaml-relative) test file paths
+    """
+    yaml_dirname = os.path.dirname(yaml_path)
+
+    dep_tags = set(parsed_yaml.keys())
+    dep_test_paths = set()
+
+    for yaml_entry in parsed_yaml.values():
+        additions = yaml_entry.get('additions')
+        if isinstance(additions, list):
+            dep_tags.update(tag for tag in additions if isinstance(tag, str))
+
+        for test_path in yaml_entry.keys():
+            if test_path not in constants.RESERVED_YAML_KEYS:
+                dep_test_paths.add(os.path.join(yaml_dirname, test_path))
+
+    return sorted(dep_tags), sorted(dep_test_paths)
+
+
+def _load_validation_state(
+    state_path: str
+) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+    """Load incremental validation state, discarding stale or corrupt data
+
+    Args:
+        state_path: A path to a validation state file
+
+    Returns:
+        A 2-tuple containing the following:
+         - A map from .drift-data.yml paths to their stored validation state
+         - A map from region tags to the .drift-data.yml files (in file
+           order) that contain them
+    """
+    try:
+        with open(state_path, 'r') as file:
+            state = json.load(file)
+        if state.get('version') == VALIDATION_STATE_VERSION:
+            return state['files'], state['tag_files']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass  # Missing or corrupt state file
+
+    return {}, {}
+
+
+def _save_validation_state(
+    state_path: str,
+    file_states: Dict[str, Any],
+    tag_files: Dict[str, List[str]]
+) -> None:
+    """Persist incremental validation state (on a best-effort basis)
+
+    Args:
+        state_path: A path to a validation state file
+        file_states: A map from .drift-data.yml paths to their
+                     validation state
+        tag_files: A map from region tags to the .drift-data.yml files
+                   that contain them
+    """
+    state = {
+        'version': VALIDATION_STATE_VERSION,
+        'files': file_states,
+        'tag_files': tag_files,
+    }
+
+    try:
+        os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+
+        # Write to a temporary file first, so that concurrent
+        # readers never see a partially-written state file
+        temp_path = f'{state_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(state, file, default=str)
+        os.replace(temp_path, state_path)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def _update_tag_files(
+    tag_files: Dict[str, List[str]],
+    file_states: Dict[str, Any],
+    old_file_states: Dict[str, Any],
+    yaml_paths: List[str],
+    dirty_paths: List[str]
+) -> None:
+    """Update the tag -> files index (and repeated tags) of changed files
+
+    Only the region tags that a re-validated (or deleted) .drift-data.yml
+    file contains (or used to contain) are re-checked. A tag is repeated in
+    every file that contains it except the first one (in file order), which
+    matches _get_region_tag_errors().
+
+    Args:
+        tag_files: A map from region tags to the .drift-data.yml files (in
+                   file order) that contain them. This is updated in place.
+        file_states: The current validation state of each .drift-data.yml
+                     file. Their 'repeated_tags' lists are updated in place.
+        old_file_states: The validation state of the previous run
+        yaml_paths: Every (current) .drift-data.yml file, in file order
+        dirty_paths: The .drift-data.yml files that were re-validated
+    """
+    file_indices = {yaml_path: idx for idx, yaml_path in enumerate(yaml_paths)}
+    changed_paths = set(dirty_paths).union(
+        yaml_path for yaml_path in old_file_states
+        if yaml_path not in file_indices)
+
+    touched_tags = set()
+    for yaml_path in changed_paths:
+        touched_tags.update(old_file_states.get(yaml_path, {}).get('tags', []))
+
+    dirty_tag_files: Dict[str, List[str]] = {}
+    for yaml_path in dirty_paths:
+        for tag in file_states[yaml_path]['tags']:
+            dirty_tag_files.setdefault(tag, []).append(yaml_path)
+    touched_tags.update(dirty_tag_files.keys())
+
+    for tag in touched_tags:
+        tag_paths = [yaml_path for yaml_path in tag_files.pop(tag, [])
+                     if yaml_path in file_indices and
+                     yaml_path not in changed_paths]
+        tag_paths = sorted(tag_paths + dirty_tag_files.get(tag, []),
+                           key=file_indices.__getitem__)
+        if not tag_paths:
+            continue
+
+        tag_files[tag] = tag_paths
+
+        first_repeated_tags = file_states[tag_paths[0]]['repeated_tags']
+        if tag in first_repeated_tags:
+            first_repeated_tags.remove(tag)
+
+        for yaml_path in tag_paths[1:]:
+            repeated_tags = file_states[yaml_path]['repeated_tags']
+            if tag not in repeated_tags:
+                repeated_tags.append(tag)
+
+
+def validate_yaml_syntax_incremental(
+    root_dir: str,
+    grep_tags: Collection[str],
+    get_source_tags: Callable[
+        [Dict[str, FrozenSet[str]]], Collection[str]],
+    tag_source_files: Dict[str, List[str]],
+    state_path: str,
+    cache_dir: Optional[str] = None,
+    max_workers: Optional[int] = None
+) -> Tuple[bool, List[str]]:
+    """Validate a given directory's .drift-data.yml files incrementally
+
+    This method is equivalent to validate_yaml_syntax(), but persists a
+    dependency graph (and each file's results) to a state file between
+    runs. Each .drift-data.yml file's entry records the file's modification
+    time and size, its "additions" groups, and the status of every region
+    tag (grep-found, parsed and defining source files) and test file it
+    refers to. Only files whose entries are out of date are re-parsed and
+    re-validated.
+
+    Parsed region tags depend on every file's "additions" groups, so these
+    are computed from the stored groups of unchanged files (and the parsed
+    contents of changed ones).
+
+    Repeated region tags span multiple files, so a map from each tag to the
+    files containing it is stored as well. Only the tags of re-validated
+    (or deleted) files are re-checked.
+
+    Args:
+        root_dir: A directory containing .drift-data.yml files
+        grep_tags: A list of region tags (parsed *and* unparsed) that exist
+                   in the target directory
+        get_source_tags: A function that returns the successfully-parsed
+                         region tags in the target directory, given its
+                         merged additions groups (see
+                         DriftYamlStore.additions_index)
+        tag_source_files: A map from region tags to the source files
+                          containing them
+        state_path: A path to store validation state in between runs
+        cache_dir: (Optional) A directory containing compiled versions of
+                   the parsed .drift-data.yml files
+        max_workers: (Optional) The maximum number of threads to validate
+                     files with
+
+    Returns:
+        A 2-tuple containing the following:
+         - A boolean including file validity (True if all .drift-data.yml
+           files passed validation, False otherwise)
+         - A list of validation error messages (if any) that were raised
+    """
+    grep_tag_set = set(grep_tags)
+    path_exists = functools.lru_cache(maxsize=None)(os.path.exists)
+
+    def _get_fingerprint(
+        dep_tags: List[str],
+        dep_test_paths: List[str]
+    ) -> Dict[str, Any]:
+        return {
+            'tags': {
+                tag: [tag in grep_tag_set, tag in source_tag_set,
+                      tag_source_files.get(tag, [])]
+                for tag in dep_tags
+            },
+            'tests': {
+                test_path: path_exists(test_path)
+                for test_path in dep_test_paths
+            },
+        }
+
+    def _is_up_to_date(file_state: Dict[str, Any]) -> bool:
+        deps = file_state['deps']
+        return deps == _get_fingerprint(
+            list(deps['tags'].keys()), list(deps['tests'].keys()))
+
+    def _load_file(yaml_path: str) -> Dict[str, Any]:
+        return load_yaml_file(yaml_path, cache_dir)
+
+    def _validate_file(yaml_path: str) -> Dict[str, Any]:
+        # (Files that haven't changed may still need to be re-validated)
+        if yaml_path in parsed_files:
+            parsed_yaml = parsed_files.pop(yaml_path)
+        else:
+            parsed_yaml = _load_file(yaml_path)
+
+        dep_tags, dep_test_paths = _get_file_dependencies(
+            yaml_path, parsed_yaml)
+
+        tag_errors = _get_file_region_tag_errors(
+            yaml_path, parsed_yaml, grep_tag_set, source_tag_set)
+        attr_errors = _get_file_attr_errors(
+            yaml_path, parsed_yaml, grep_tag_set, path_exists)
+
+        return {
+            'tags': list(parsed_yaml.keys()),
+            'additions': [
+                list(group) for group in get_additions_groups(parsed_yaml)
+            ],
+            'deps': _get_fingerprint(dep_tags, dep_test_paths),
+            'tag_errors': [
+                [_serialize_violation(error) for error in errors]
+                for errors in tag_errors
+            ],
+            'attr_errors': [
+                _serialize_violation(error) for error in attr_errors
+            ],
+            'repeated_tags': [],
+        }
+
+    old_file_states, tag_files = _load_validation_state(state_path)
     yaml_paths = file_utils.get_drift_yaml_files(root_dir)
 
-    tags_are_valid, tags_violations = (
-        _get_region_tag_errors(yaml_paths, grep_tags, source_tags))
-    attrs_are_valid, attrs_violations = _get_attr_errors(yaml_paths, grep_tags)
+    file_states: Dict[str, Any] = {}
+    changed_paths = []
+    for yaml_path in yaml_paths:
+        yaml_stat = os.stat(yaml_path)
+        file_key = [yaml_stat.st_mtime_ns, yaml_stat.st_size]
+
+        file_state = old_file_states.get(yaml_path)
+        if file_state and file_state['key'] == file_key:
+            file_states[yaml_path] = file_state
+        else:
+            changed_paths.append(yaml_path)
+            file_states[yaml_path] = {'key': file_key}
+
+    # ThreadPoolExecutor.map() returns results in input order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        parsed_files = dict(
+            zip(changed_paths, executor.map(_load_file, changed_paths)))
+
+        # Only changed files' additions groups need to be parsed
+        additions_groups = []
+        for yaml_path in yaml_paths:
+            if yaml_path in parsed_files:
+                additions_groups += get_additions_groups(
+                    parsed_files[yaml_path])
+            else:
+                additions_groups += [
+                    set(group)
+                    for group in file_states[yaml_path]['additions']
+                ]
+
+        source_tag_set = set(get_source_tags(
+            get_additions_index(additions_groups)))
+
+        # Unchanged files are re-validated if their dependencies changed
+        dirty_paths = [
+            yaml_path for yaml_path in yaml_paths
+            if yaml_path in parsed_files or
+            not _is_up_to_date(file_states[yaml_path])
+        ]
+
+        for yaml_path, file_state in zip(
+                dirty_paths, executor.map(_validate_file, dirty_paths)):
+            file_states[yaml_path].update(file_state)
+
+    _update_tag_files(
+        tag_files, file_states, old_file_states, yaml_paths, dirty_paths)
+
+    # Merge the stored results, in the same order as a serial run
+    tags_violations = []
+    attrs_violations = []
+    for yaml_path in yaml_paths:
+        file_state = file_states[yaml_path]
+        repeated_tags = set(file_state['repeated_tags'])
+
+        for tag, errors in zip(file_state['tags'], file_state['tag_errors']):
+            tags_violations += [
+                _deserialize_violation(error) for error in errors]
+
+            if tag in repeated_tags:
+                tags_violations.append(
+                    cli_yaml_errors.RepeatedTagViolation(tag))
+
+        attrs_violations += [
+            _deserialize_violation(error)
+            for error in file_state['attr_errors']
+        ]
+
+    _save_validation_state(state_path, file_states, tag_files)
 
     violations = tags_violations + attrs_violations
     output = [str(violation) for violation in violations]
 
-    is_valid = tags_are_valid and attrs_are_valid
+    is_valid = not violations
 
     return is_valid, output
@@ -12,11 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import re
 import unittest
 from os import path
 
-from ast_parser.core import cli, cli_yaml_errors
+from ast_parser.core import cli, cli_yaml, cli_yaml_errors
+from ast_parser.core.drift_yaml_store import DriftYamlStore
+
+import mock
 
 import pytest
 
@@ -143,3 +147,186 @@ class RelationshipClauseTests(unittest.TestCase):
             'additions_tag', self.yaml_path)
 
         assert str(error) in self.out
+
+
+class ParallelValidationTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _store(self, tmpdir):
+        self.tmpdir = str(tmpdir)
+        self.yaml_store = DriftYamlStore(TEST_DATA_PATH)
+        self.grep_tags = ['detectable_tag', 'undetectable_tag']
+        self.source_tags = ['detectable_tag']
+
+    def test_output_order_matches_serial_run(self):
+        serial_result = cli_yaml.validate_yaml_syntax(
+            self.yaml_store, self.grep_tags, self.source_tags, max_workers=1)
+        parallel_result = cli_yaml.validate_yaml_syntax(
+            self.yaml_store, self.grep_tags, self.source_tags, max_workers=8)
+
+        assert serial_result == parallel_result
+
+    def test_detects_repeated_tags_across_files(self):
+        _, output = cli_yaml.validate_yaml_syntax(
+            self.yaml_store, self.grep_tags, self.source_tags)
+
+        error = cli_yaml_errors.RepeatedTagViolation('detectable_tag')
+        assert str(error) in output
+
+    def test_memoizes_test_file_existence_checks(self):
+        yaml_dir = self.tmpdir
+        with open(path.join(yaml_dir, '.drift-data.yml'), 'w') as file:
+            file.write(
+                'tag_a:\n'
+                '  shared_test.py:\n'
+                '    - test_a\n'
+                'tag_b:\n'
+                '  shared_test.py:\n'
+                '    - test_b\n'
+            )
+
+        with mock.patch('ast_parser.core.cli_yaml.os.path.exists',
+                        return_value=True) as exists_mock:
+            cli_yaml.validate_yaml_syntax(
+                DriftYamlStore(yaml_dir), ['tag_a', 'tag_b'], [])
+
+            exists_mock.assert_called_once_with(
+                path.join(yaml_dir, 'shared_test.py'))
+
+
+class IncrementalValidationTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _state(self, tmpdir):
+        self.tmpdir = str(tmpdir)
+        self.state_path = path.join(self.tmpdir, 'state.json')
+        self.grep_tags = ['detectable_tag', 'undetectable_tag']
+        self.source_tags = ['detectable_tag']
+
+    def _validate(self, root_dir, tag_source_files=None):
+        return cli_yaml.validate_yaml_syntax_incremental(
+            root_dir,
+            self.grep_tags,
+            lambda additions_index: self.source_tags,
+            tag_source_files or {},
+            self.state_path
+        )
+
+    def test_matches_full_validation(self):
+        expected = cli_yaml.validate_yaml_syntax(
+            DriftYamlStore(TEST_DATA_PATH), self.grep_tags, self.source_tags)
+
+        assert self._validate(TEST_DATA_PATH) == expected
+
+        # Second run (reusing stored results) must match as well
+        assert self._validate(TEST_DATA_PATH) == expected
+
+    def test_reuses_results_for_unchanged_files(self):
+        first_result = self._validate(TEST_DATA_PATH)
+
+        with mock.patch('ast_parser.core.cli_yaml.load_yaml_file') as load:
+            second_result = self._validate(TEST_DATA_PATH)
+
+            load.assert_not_called()
+
+        assert first_result == second_result
+
+    def test_revalidates_files_with_changed_dependencies(self):
+        yaml_dir = path.join(self.tmpdir, 'snippets')
+        yaml_path = path.join(yaml_dir, '.drift-data.yml')
+
+        os.makedirs(yaml_dir)
+        with open(yaml_path, 'w') as file:
+            file.write('detectable_tag:\n  tested: false\n')
+
+        is_valid, _ = self._validate(yaml_dir)
+        assert not is_valid
+
+        # detectable_tag is no longer parsed
+        self.source_tags = []
+        is_valid, output = self._validate(
+            yaml_dir, {'detectable_tag': ['main.py']})
+
+        assert is_valid
+        assert output == []
+
+    def test_revalidates_changed_files(self):
+        yaml_dir = path.join(self.tmpdir, 'snippets')
+        yaml_path = path.join(yaml_dir, '.drift-data.yml')
+
+        os.makedirs(yaml_dir)
+        with open(yaml_path, 'w') as file:
+            file.write('detectable_tag:\n  tested: false\n')
+
+        self._validate(yaml_dir)
+
+        with open(yaml_path, 'w') as file:
+            file.write('undetectable_tag:\n  tested: false\n')
+
+        is_valid, output = self._validate(yaml_dir)
+        assert is_valid
+        assert output == []
+
+    def test_reuses_stored_additions_groups(self):
+        get_source_tags = mock.Mock(return_value=self.source_tags)
+        for _ in range(2):
+            with mock.patch(
+                    'ast_parser.core.cli_yaml.load_yaml_file',
+                    wraps=cli_yaml.load_yaml_file) as load:
+                cli_yaml.validate_yaml_syntax_incremental(
+                    TEST_DATA_PATH, self.grep_tags, get_source_tags, {},
+                    self.state_path)
+
+        # The second run doesn't parse any files
+        load.assert_not_called()
+
+        additions_index = DriftYamlStore(TEST_DATA_PATH).additions_index
+        for call in get_source_tags.call_args_list:
+            assert call == mock.call(additions_index)
+
+    def _write_yaml(self, yaml_dir, content):
+        os.makedirs(yaml_dir, exist_ok=True)
+        with open(path.join(yaml_dir, '.drift-data.yml'), 'w') as file:
+            file.write(content)
+
+    def test_updates_repeated_tags_of_changed_files(self):
+        root_dir = path.join(self.tmpdir, 'snippets')
+        self._write_yaml(path.join(root_dir, 'a'), 'detectable_tag: {}\n')
+        self._write_yaml(path.join(root_dir, 'b'), 'undetectable_tag: {}\n')
+
+        _, output = self._validate(root_dir)
+        repeated_error = str(
+            cli_yaml_errors.RepeatedTagViolation('detectable_tag'))
+        assert repeated_error not in output
+
+        # Repeat a tag of an unchanged file
+        self._write_yaml(path.join(root_dir, 'b'), 'detectable_tag: {}\n')
+        expected = cli_yaml.validate_yaml_syntax(
+            DriftYamlStore(root_dir), self.grep_tags, self.source_tags)
+
+        assert self._validate(root_dir) == expected
+        assert repeated_error in expected[1]
+
+        # Remove the repeated tag's first occurrence
+        os.remove(path.join(root_dir, 'a', '.drift-data.yml'))
+        _, output = self._validate(root_dir)
+        assert repeated_error not in output
+
+
+class ValidateYamlCommandTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _cache_dir(self, tmpdir, capsys):
+        self.cache_dir = str(tmpdir)
+        self.capsys = capsys
+
+    def test_skips_unchanged_yaml_files(self):
+        data_json = path.join(TEST_DATA_PATH, 'polyglot_snippet_data.json')
+        cli.validate_yaml(data_json, TEST_DATA_PATH, cache_dir=self.cache_dir)
+        first_output = self.capsys.readouterr().out
+
+        with mock.patch(
+                'ast_parser.core.drift_yaml_store.load_yaml_file') as load:
+            cli.validate_yaml(
+                data_json, TEST_DATA_PATH, cache_dir=self.cache_dir)
+
+            load.assert_not_called()
+
+        assert self.capsys.readouterr().out == first_output
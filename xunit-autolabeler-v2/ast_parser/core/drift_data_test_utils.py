@@ -0,0 +1,87 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file contains snippet method factories shared by several test files.
+"""
+
+import os
+from typing import Iterable, Sequence
+
+from ast_parser.core import polyglot_drift_data as pdd
+
+
+# The (nonexistent) root directory of the methods' source and test files
+ROOT_DIR = '/repo'
+
+
+def create_method(
+    region_tags: Iterable[str],
+    test_names: Iterable[str]
+) -> pdd.PolyglotDriftData:
+    """Create a snippet method in /repo/main.py
+
+    Args:
+        region_tags: The method's region tags
+        test_names: The names of the method's tests (in /repo/main_test.py)
+
+    Returns:
+        A snippet method object
+    """
+    return pdd.PolyglotDriftData(
+        name='method',
+        class_name='main',
+        method_name='method',
+        source_path=os.path.join(ROOT_DIR, 'main.py'),
+        start_line=1,
+        end_line=2,
+        parser='direct_invocation',
+        region_tags=list(region_tags),
+        test_methods=[(os.path.join(ROOT_DIR, 'main_test.py'), test_name)
+                      for test_name in test_names]
+    )
+
+
+def create_named_method(
+    source_path: str,
+    name: str,
+    region_tags: Iterable[str],
+    test_methods: Iterable[Sequence[str]] = (),
+    start_line: int = 1
+) -> pdd.PolyglotDriftData:
+    """Create a snippet method in a given source file
+
+    Args:
+        source_path: The method's source file (relative to ROOT_DIR)
+        name: The method's name
+        region_tags: The method's region tags
+        test_methods: (Optional) The method's (test path, test name) pairs.
+                      Test paths are relative to ROOT_DIR.
+        start_line: (Optional) The method's first line
+
+    Returns:
+        A snippet method object
+    """
+    return pdd.PolyglotDriftData(
+        name=name,
+        class_name='main',
+        method_name=name,
+        source_path=os.path.join(ROOT_DIR, source_path),
+        start_line=start_line,
+        end_line=start_line + 1,
+        parser='direct_invocation',
+        region_tags=list(region_tags),
+        test_methods=[(os.path.join(ROOT_DIR, test_path), test_name)
+                      for test_path, test_name in test_methods]
+    )
@@ -0,0 +1,352 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import marshal
+import os
+from typing import (
+    Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple)
+
+from ast_parser.core import constants
+from ast_parser.lib import file_utils, git_utils
+
+import yaml
+
+# Use the (much faster) libyaml-based loader when it's available
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader  # type: ignore
+
+
+# The sub-directory of a cache directory that compiled YAML is stored in
+YAML_CACHE_SUBDIR = 'drift-yaml'
+
+
+def _parse_yaml_file(yaml_path: str) -> Dict[str, Any]:
+    """Parse a single .drift-data.yml file with PyYAML
+
+    Args:
+        yaml_path: A path to a .drift-data.yml file
+
+    Returns:
+        The parsed contents of the file
+    """
+    with open(yaml_path, 'r') as file:
+        return yaml.load(file, Loader=_SafeLoader)
+
+
+def _get_cache_path(yaml_path: str, cache_dir: str) -> str:
+    """Get the path of a .drift-data.yml file's compiled cache entry
+
+    Args:
+        yaml_path: A path to a .drift-data.yml file
+        cache_dir: The cache directory (whose YAML_CACHE_SUBDIR
+                   sub-directory contains compiled cache entries)
+
+    Returns:
+        The path to the given file's cache entry
+    """
+    path_hash = hashlib.sha1(
+        os.path.abspath(yaml_path).encode('utf-8')).hexdigest()
+
+    return os.path.join(cache_dir, YAML_CACHE_SUBDIR, f'{path_hash}.marshal')
+
+
+def load_yaml_file(
+    yaml_path: str,
+    cache_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """Parse a single .drift-data.yml file, using a compiled cache if possible
+
+    If a cache directory is specified, parsed file contents are stored in its
+    YAML_CACHE_SUBDIR sub-directory in marshal format (which loads much
+    faster than YAML). Cache entries are keyed by the file's absolute path,
+    modification time and size, so PyYAML is only used for new or changed
+    files.
+
+    Args:
+        yaml_path: A path to a .drift-data.yml file
+        cache_dir: (Optional) A directory to store compiled cache entries in.
+                   Caching is disabled if this argument is omitted.
+
+    Returns:
+        The parsed contents of the file
+    """
+    if not cache_dir:
+        return _parse_yaml_file(yaml_path)
+
+    yaml_stat = os.stat(yaml_path)
+    cache_key = (
+        os.path.abspath(yaml_path), yaml_stat.st_mtime_ns, yaml_stat.st_size)
+    cache_path = _get_cache_path(yaml_path, cache_dir)
+
+    try:
+        with open(cache_path, 'rb') as file:
+            cached_key, cached_yaml = marshal.load(file)
+            if tuple(cached_key) == cache_key:
+                return cached_yaml
+    except (OSError, EOFError, ValueError, TypeError):
+        pass  # Missing or corrupt cache entry
+
+    parsed_yaml = _parse_yaml_file(yaml_path)
+
+    # Caching is best-effort, so fail silently if the cache isn't writable
+    # (or the file contains values that marshal can't serialize)
+    try:
+        data = marshal.dumps((cache_key, parsed_yaml))
+
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        file_utils.write_file_atomically(cache_path, data)
+    except (OSError, ValueError):
+        pass
+
+    return parsed_yaml
+
+
+def get_additions_groups(parsed_yaml: Dict[str, Any]) -> List[Set[str]]:
+    """Get the region tag groups a .drift-data.yml file's "additions"
+    clauses specify
+
+    Args:
+        parsed_yaml: The parsed contents of a .drift-data.yml file
+
+    Returns:
+        A list (in file order) of groups, each of which contains a YAML
+        entry's tag and the tags listed in its "additions" clause
+    """
+    additions_groups = []
+
+    additions_tags = [key for key in parsed_yaml.keys() if
+                      key not in constants.RESERVED_YAML_KEYS]
+
+    for tag in additions_tags:
+        yaml_entry = parsed_yaml[tag]
+        if 'additions' in yaml_entry and \
+           isinstance(yaml_entry['additions'], list):
+
+            added_tags = set(yaml_entry['additions'])
+            added_tags.add(tag)
+
+            additions_groups.append(added_tags)
+
+    return additions_groups
+
+
+def get_additions_index(
+    additions_groups: Iterable[Set[str]]
+) -> Dict[str, FrozenSet[str]]:
+    """Merge "additions" groups that share region tags
+
+    This method uses a union-find (disjoint set) structure over region tags
+    to merge additions groups that chain through one another. (For example,
+    the groups {a, b} and {b, c} are merged into {a, b, c}.) The result does
+    not depend on the order of the groups.
+
+    Args:
+        additions_groups: A list of region tag sets from "additions" clauses
+
+    Returns:
+        A map from each region tag mentioned in an additions group to the
+        (merged) group containing it
+    """
+    parents: Dict[str, str] = {}
+
+    def _find(tag: str) -> str:
+        root = tag
+        while parents[root] != root:
+            root = parents[root]
+
+        # Compress the path we just walked
+        while parents[tag] != root:
+            parents[tag], tag = root, parents[tag]
+
+        return root
+
+    for group in additions_groups:
+        for tag in group:
+            parents.setdefault(tag, tag)
+
+        group_root = _find(next(iter(group)))
+        for tag in group:
+            tag_root = _find(tag)
+            if tag_root != group_root:
+                parents[tag_root] = group_root
+
+    members: Dict[str, Set[str]] = {}
+    for tag in parents:
+        members.setdefault(_find(tag), set()).add(tag)
+
+    frozen_members = {root: frozenset(tags) for root, tags in members.items()}
+    return {tag: frozen_members[_find(tag)] for tag in parents}
+
+
+class DriftYamlStore:
+    """Parsed .drift-data.yml files for a given root directory
+
+    This class discovers and parses every .drift-data.yml file in a directory
+    (and, recursively, its sub-directories) exactly once. It then exposes the
+    per-clause "views" of those files used by yaml_utils and cli_yaml.
+
+    Files are discovered and parsed on first use, and each view is computed at
+    most once.
+    """
+
+    def __init__(
+        self,
+        root_dir: str,
+        cache_dir: Optional[str] = None,
+        revision: Optional[git_utils.GitRevision] = None
+    ) -> None:
+        """
+        Args:
+            root_dir: A directory containing snippets and .drift-data.yml files
+            cache_dir: (Optional) A directory to store compiled versions of
+                       the parsed .drift-data.yml files in
+            revision: (Optional) A git revision of root_dir to read
+                      .drift-data.yml files from, instead of the working tree
+        """
+        self.root_dir = root_dir
+        self.cache_dir = cache_dir
+        self.revision = revision
+
+        self._parsed_files: Optional[List[Tuple[str, Dict[str, Any]]]] = None
+        self._overwritten_tags: Optional[Set[str]] = None
+        self._additions_groups: Optional[List[Set[str]]] = None
+        self._additions_index: Optional[Dict[str, FrozenSet[str]]] = None
+        self._manual_tests: Optional[Dict[str, List[Tuple[str, str]]]] = None
+        self._untested_tags: Optional[Set[str]] = None
+
+    @property
+    def yaml_paths(self) -> List[str]:
+        """The paths of every .drift-data.yml file in the root directory"""
+        return [yaml_path for yaml_path, _ in self.parsed_files]
+
+    @property
+    def parsed_files(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """(path, parsed contents) pairs for each .drift-data.yml file"""
+        if self._parsed_files is None and self.revision:
+            # YAML files in a revision are parsed from memory (and
+            # aren't cached, since they aren't stored on disk)
+            self._parsed_files = [
+                (yaml_path, yaml.load(
+                    self.revision.read_text(yaml_path), Loader=_SafeLoader))
+                for yaml_path
+                in self.revision.get_files(file_utils.is_drift_yaml_file)
+            ]
+        elif self._parsed_files is None:
+            self._parsed_files = [
+                (yaml_path, load_yaml_file(yaml_path, self.cache_dir))
+                for yaml_path
+                in file_utils.get_drift_yaml_files(self.root_dir)
+            ]
+
+        return self._parsed_files
+
+    @property
+    def overwritten_tags(self) -> Set[str]:
+        """Region tags with "overwrite: true" in their YAML entries"""
+        if self._overwritten_tags is None:
+            self._overwritten_tags = set()
+
+            for _, parsed_yaml in self.parsed_files:
+                for tag in parsed_yaml.keys():
+                    yaml_entry = parsed_yaml[tag]
+                    if 'overwrite' in yaml_entry:
+                        if yaml_entry.get('overwrite', False) is True:
+                            self._overwritten_tags.add(tag)
+
+        return self._overwritten_tags
+
+    @property
+    def additions_groups(self) -> List[Set[str]]:
+        """Region tag groups specified by "additions" clauses
+
+        Each group (listed in file order) contains a YAML entry's tag and the
+        tags listed in its 'additions' clause.
+        """
+        if self._additions_groups is None:
+            self._additions_groups = []
+
+            for _, parsed_yaml in self.parsed_files:
+                self._additions_groups += get_additions_groups(parsed_yaml)
+
+        return self._additions_groups
+
+    @property
+    def additions_index(self) -> Dict[str, FrozenSet[str]]:
+        """A map from region tags in additions groups to their merged group
+
+        See get_additions_index() for details.
+        """
+        if self._additions_index is None:
+            self._additions_index = get_additions_index(
+                self.additions_groups)
+
+        return self._additions_index
+
+    @property
+    def manual_tests(self) -> Dict[str, List[Tuple[str, str]]]:
+        """A map from region tags to manually-specified (test path, test name)
+        tuples
+
+        Manually specified tests cannot contain any keys in RESERVED_YAML_KEYS
+        (except for "overwrite"), so YAML entries that *do* have these keys are
+        omitted. Test files that don't exist are also omitted.
+        """
+        if self._manual_tests is None:
+            self._manual_tests = {}
+
+            banned_keys = set(constants.RESERVED_YAML_KEYS)
+            banned_keys.remove('overwrite')
+
+            for yaml_path, parsed_yaml in self.parsed_files:
+                yaml_dir = os.path.dirname(yaml_path)
+
+                manual_tags = [
+                    tag for tag in parsed_yaml.keys() if
+                    not set(parsed_yaml[tag].keys()).intersection(banned_keys)
+                ]
+
+                for tag in manual_tags:
+                    yaml_entry = parsed_yaml[tag]
+                    self._manual_tests[tag] = []
+
+                    for test_rel_path in yaml_entry.keys():
+                        test_path = os.path.join(yaml_dir, test_rel_path)
+                        if test_path and self._path_exists(test_path):
+                            for test_name in yaml_entry[test_rel_path]:
+                                self._manual_tests[tag].append(
+                                    (test_path, test_name))
+
+        return self._manual_tests
+
+    def _path_exists(self, path: str) -> bool:
+        if self.revision:
+            return self.revision.exists(path)
+
+        return os.path.exists(path)
+
+    @property
+    def untested_tags(self) -> Set[str]:
+        """Region tags *explicitly marked* as untested ("tested: false")"""
+        if self._untested_tags is None:
+            self._untested_tags = set()
+
+            for _, parsed_yaml in self.parsed_files:
+                self._untested_tags.update(
+                    key for key in parsed_yaml.keys()
+                    if parsed_yaml[key].get('tested') is False)
+
+        return self._untested_tags
@@ -0,0 +1,184 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import unittest
+
+from ast_parser.core import drift_yaml_store
+
+import mock
+
+import pytest
+
+
+TEST_DATA_PATH = os.path.join(
+    os.path.dirname(__file__),
+    'test_data/yaml'
+)
+
+
+class DriftYamlStoreTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _store(self):
+        self.store = drift_yaml_store.DriftYamlStore(TEST_DATA_PATH)
+
+    def test_parses_each_file_once(self):
+        with mock.patch(
+            'ast_parser.core.drift_yaml_store.load_yaml_file',
+            wraps=drift_yaml_store.load_yaml_file
+        ) as load_mock:
+            self.store.overwritten_tags
+            self.store.additions_groups
+            self.store.manual_tests
+            self.store.untested_tags
+            self.store.parsed_files
+
+            assert load_mock.call_count == len(self.store.yaml_paths)
+
+    def test_discovers_files_recursively(self):
+        yaml_dirs = [os.path.basename(os.path.dirname(yaml_path))
+                     for yaml_path in self.store.yaml_paths]
+
+        assert 'smoke_tests' in yaml_dirs
+        assert 'overwrite_tests' in yaml_dirs
+
+    def test_overwritten_tags(self):
+        assert 'method_2' in self.store.overwritten_tags
+        assert 'method_1' not in self.store.overwritten_tags
+
+        # "overwrite: False" is not an overwrite
+        assert 'overwritten_tag' not in self.store.overwritten_tags
+
+    def test_additions_groups(self):
+        assert {'additions_tests', 'detectable_tag'} in \
+            self.store.additions_groups
+
+    def test_additions_groups_ignore_non_lists(self):
+        assert not any('additions_tag' in group
+                       for group in self.store.additions_groups)
+
+    def test_additions_index_is_computed_once(self):
+        with mock.patch(
+            'ast_parser.core.drift_yaml_store.get_additions_index',
+            wraps=drift_yaml_store.get_additions_index
+        ) as index_mock:
+            index = self.store.additions_index
+
+            assert self.store.additions_index is index
+            assert index_mock.call_count == 1
+
+        assert {'additions_tests', 'detectable_tag'} <= \
+            index['detectable_tag']
+
+    def test_manual_tests_omit_missing_files(self):
+        assert self.store.manual_tests['nonexistent_test_file'] == []
+
+    def test_manual_tests_omit_reserved_keys(self):
+        assert 'additions_tests' not in self.store.manual_tests
+        assert 'undetectable_tag' not in self.store.manual_tests
+
+    def test_untested_tags(self):
+        assert 'detectable_tag' in self.store.untested_tags
+        assert 'undetectable_tag' in self.store.untested_tags
+        assert 'method_2' not in self.store.untested_tags
+
+
+class GetAdditionsIndexTests(unittest.TestCase):
+    def test_merges_chained_groups(self):
+        index = drift_yaml_store.get_additions_index([{'a', 'b'}, {'b', 'c'}])
+
+        assert index['a'] == {'a', 'b', 'c'}
+        assert index['c'] == {'a', 'b', 'c'}
+
+    def test_is_order_independent(self):
+        groups = [{'a', 'b'}, {'c', 'd'}, {'d', 'b'}]
+
+        index = drift_yaml_store.get_additions_index(groups)
+        reversed_index = drift_yaml_store.get_additions_index(groups[::-1])
+
+        assert index == reversed_index
+        assert index['a'] == {'a', 'b', 'c', 'd'}
+
+    def test_keeps_disjoint_groups_separate(self):
+        index = drift_yaml_store.get_additions_index([{'a', 'b'}, {'c', 'd'}])
+
+        assert index['a'] == {'a', 'b'}
+        assert index['d'] == {'c', 'd'}
+
+
+class CompiledCacheTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _paths(self, tmpdir):
+        self.yaml_path = os.path.join(str(tmpdir), '.drift-data.yml')
+        self.cache_dir = os.path.join(str(tmpdir), 'cache')
+
+        shutil.copy(
+            os.path.join(TEST_DATA_PATH, 'smoke_tests/.drift-data.yml'),
+            self.yaml_path)
+
+    def test_uses_cache_for_unchanged_files(self):
+        expected = drift_yaml_store.load_yaml_file(
+            self.yaml_path, self.cache_dir)
+
+        with mock.patch(
+            'ast_parser.core.drift_yaml_store._parse_yaml_file'
+        ) as parse_mock:
+            actual = drift_yaml_store.load_yaml_file(
+                self.yaml_path, self.cache_dir)
+
+            parse_mock.assert_not_called()
+
+        assert actual == expected
+
+    def test_reparses_changed_files(self):
+        drift_yaml_store.load_yaml_file(self.yaml_path, self.cache_dir)
+
+        with open(self.yaml_path, 'a') as file:
+            file.write('\nnew_tag:\n  tested: False\n')
+
+        actual = drift_yaml_store.load_yaml_file(
+            self.yaml_path, self.cache_dir)
+
+        assert 'new_tag' in actual
+
+    def test_ignores_corrupt_cache_entries(self):
+        cache_path = drift_yaml_store._get_cache_path(
+            self.yaml_path, self.cache_dir)
+
+        os.makedirs(os.path.dirname(cache_path))
+        with open(cache_path, 'wb') as file:
+            file.write(b'not marshal data')
+
+        actual = drift_yaml_store.load_yaml_file(
+            self.yaml_path, self.cache_dir)
+
+        assert 'undetectable_tag' in actual
+
+    def test_stores_entries_in_a_sub_directory(self):
+        drift_yaml_store.load_yaml_file(self.yaml_path, self.cache_dir)
+
+        assert os.listdir(self.cache_dir) == [
+            drift_yaml_store.YAML_CACHE_SUBDIR]
+
+    def test_skips_unserializable_files(self):
+        # (YAML dates are parsed as datetime.date values)
+        with open(self.yaml_path, 'a') as file:
+            file.write('\ndated_tag:\n  created: 2020-01-01\n')
+
+        actual = drift_yaml_store.load_yaml_file(
+            self.yaml_path, self.cache_dir)
+
+        assert 'dated_tag' in actual
+        assert not os.path.exists(self.cache_dir)
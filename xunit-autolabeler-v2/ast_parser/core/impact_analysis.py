@@ -0,0 +1,220 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file maps changes to a directory's files onto the snippets they affect,
+and selects the tests that should be run to cover those snippets.
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from . import analyze, yaml_utils
+from . import polyglot_drift_data as pdd
+
+
+# Changes are specified as PATH, PATH:LINE or PATH:START-END
+_CHANGE_REGEX = re.compile(
+    r'^(?P<path>.+?)(?::(?P<start>\d+)(?:-(?P<end>\d+))?)?$')
+
+# A map from changed files to their changed (start, end) line ranges, or
+# None if the whole file should be considered changed
+Changes = Dict[str, Optional[List[Tuple[int, int]]]]
+
+_MethodKey = Tuple[str, str, str, int]
+
+
+class SelectedTests(NamedTuple):
+    # The (non-ignored) region tags of the affected snippets
+    region_tags: List[str]
+
+    # The (test path, test name) tuples of the tests to run
+    tests: List[Tuple[str, str]]
+
+
+def parse_changes(specs: Iterable[str], root_dir: str) -> Changes:
+    """Parse a list of changed files (and, optionally, line ranges)
+
+    Args:
+        specs: changes of the form PATH (the whole file changed), PATH:LINE
+               or PATH:START-END (inclusive, 1-indexed line numbers). Paths
+               are relative to root_dir (or absolute). Empty specs are
+               ignored.
+        root_dir: the directory that relative paths are relative to
+
+    Raises:
+        ValueError: if a line range ends before it starts
+
+    Returns:
+        A map from (absolute) changed file paths to their changed line
+        ranges, or None for files that changed as a whole
+    """
+    changes: Changes = {}
+
+    for spec in specs:
+        spec = spec.strip()
+        if not spec:
+            continue
+
+        match = _CHANGE_REGEX.match(spec)
+        if not match:
+            continue
+
+        file_path = os.path.abspath(
+            os.path.join(root_dir, match.group('path')))
+
+        if match.group('start') is None:
+            changes[file_path] = None
+            continue
+
+        start_line = int(match.group('start'))
+        end_line = int(match.group('end') or start_line)
+        if end_line < start_line:
+            raise ValueError(f'Invalid line range in change: {spec}')
+
+        if file_path not in changes:
+            changes[file_path] = []
+
+        line_ranges = changes[file_path]
+        if line_ranges is not None:
+            line_ranges.append((start_line, end_line))
+
+    return changes
+
+
+def _get_method_key(method: pdd.PolyglotDriftData) -> _MethodKey:
+    return (method.source_path, method.class_name, method.name,
+            method.start_line)
+
+
+def _is_changed(method: pdd.PolyglotDriftData, changes: Changes) -> bool:
+    source_path = os.path.abspath(method.source_path)
+    if source_path not in changes:
+        return False
+
+    line_ranges = changes[source_path]
+    if line_ranges is None:
+        return True
+
+    return any(start_line <= method.end_line and method.start_line <= end_line
+               for start_line, end_line in line_ranges)
+
+
+def _add_ancestors(
+    methods: List[pdd.PolyglotDriftData],
+    affected_methods: List[pdd.PolyglotDriftData]
+) -> List[pdd.PolyglotDriftData]:
+    """Add the (transitive) parents of a set of methods to it
+
+    Parents are found the same way polyglot_parser.add_children_drift_data()
+    finds children: by method name, within the same source file.
+
+    Args:
+        methods: every snippet method in the analyzed directory
+        affected_methods: the methods to find the parents of
+
+    Returns:
+        A list containing affected_methods and their parents
+    """
+    parents: Dict[Tuple[str, str], List[pdd.PolyglotDriftData]] = {}
+    for method in methods:
+        for child_name in set(method.children):
+            parents.setdefault(
+                (method.source_path, child_name), []).append(method)
+
+    seen_keys = set(_get_method_key(method) for method in affected_methods)
+    ancestors = list(affected_methods)
+
+    # (ancestors grows as we iterate over it)
+    for method in ancestors:
+        for parent in parents.get((method.source_path, method.name), []):
+            parent_key = _get_method_key(parent)
+            if parent_key not in seen_keys:
+                seen_keys.add(parent_key)
+                ancestors.append(parent)
+
+    return ancestors
+
+
+def select_tests(
+    analysis: analyze.SnippetAnalysis,
+    changes: Changes
+) -> SelectedTests:
+    """Select the tests affected by a set of changes
+
+    A snippet is affected if one of its lines changed, if it (transitively)
+    calls an affected method, or if it shares a .drift-data.yml "additions"
+    group with an affected snippet. Changed test files select every test
+    within them that covers a snippet.
+
+    Args:
+        analysis: the analysis of the directory the changes were made to
+        changes: the changed files and line ranges (see parse_changes())
+
+    Returns:
+        The region tags of the affected snippets, and the tests to run
+    """
+    # Children and de-duplicated methods aren't always snippets
+    # themselves, so search every parsed method for changes
+    all_methods, _ = analysis.get('load')
+    source_methods = analysis.source_methods
+
+    changed_methods = [method for method in all_methods
+                       if _is_changed(method, changes)]
+    affected_methods = _add_ancestors(all_methods, changed_methods)
+
+    source_methods_by_key = {
+        _get_method_key(method): method for method in source_methods}
+
+    selected_methods: Dict[_MethodKey, pdd.PolyglotDriftData] = {}
+    for method in affected_methods:
+        method_key = _get_method_key(method)
+        if method_key in source_methods_by_key:
+            selected_methods[method_key] = method
+        elif method.region_tags:
+            # De-duped methods are represented by the
+            # snippets that (still) contain their region tags
+            method_tags = set(method.region_tags)
+            for source_method in source_methods:
+                if method_tags.issubset(source_method.region_tags):
+                    selected_methods[_get_method_key(source_method)] = (
+                        source_method)
+
+    affected_tags: Set[str] = set()
+    for method in selected_methods.values():
+        affected_tags.update(method.region_tags)
+
+    additions_tags = yaml_utils.get_additions_tags(
+        affected_tags, analysis.yaml_store.additions_index)
+    if additions_tags:
+        for source_method in source_methods:
+            if additions_tags.intersection(source_method.region_tags):
+                selected_methods[_get_method_key(source_method)] = (
+                    source_method)
+                affected_tags.update(source_method.region_tags)
+
+    tests: Set[Tuple[str, str]] = set()
+    for method in selected_methods.values():
+        tests.update(yaml_utils.get_method_tests(method))
+
+    for source_method in source_methods:
+        tests.update(
+            test for test in yaml_utils.get_method_tests(source_method)
+            if os.path.abspath(test[0]) in changes)
+
+    return SelectedTests(
+        sorted(tag for tag in affected_tags
+               if tag not in analysis.ignored_tags),
+        sorted(tests))
@@ -0,0 +1,158 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import unittest
+
+from ast_parser.core import analyze, impact_analysis
+
+import pytest
+
+
+_TEST_DIR = os.path.join(
+    os.path.dirname(__file__),
+    'test_data/parser'
+)
+
+_ADDITIONS_DIR = os.path.join(
+    os.path.dirname(__file__),
+    'test_data/cli/additions'
+)
+
+
+def _select_tests(root_dir, specs):
+    analysis = analyze.SnippetAnalysis(
+        os.path.join(root_dir, 'polyglot_snippet_data.json'), root_dir)
+
+    selection = impact_analysis.select_tests(
+        analysis, impact_analysis.parse_changes(specs, root_dir))
+
+    tests = [(os.path.relpath(test_path, root_dir), test_name)
+             for test_path, test_name in selection.tests]
+    return selection.region_tags, tests
+
+
+class ParseChangesTests(unittest.TestCase):
+    def test_parses_files_and_line_ranges(self):
+        changes = impact_analysis.parse_changes(
+            ['a.py', 'b.py:3', 'b.py:10-12', ''], '/repo')
+
+        assert changes == {
+            '/repo/a.py': None,
+            '/repo/b.py': [(3, 3), (10, 12)]
+        }
+
+    def test_whole_file_changes_take_precedence(self):
+        changes = impact_analysis.parse_changes(
+            ['a.py:1-2', 'a.py', 'a.py:5'], '/repo')
+
+        assert changes == {'/repo/a.py': None}
+
+    def test_errors_on_backwards_line_range(self):
+        with pytest.raises(ValueError, match='a.py:5-1'):
+            impact_analysis.parse_changes(['a.py:5-1'], '/repo')
+
+
+class SelectTestsTests(unittest.TestCase):
+    def test_selects_tests_of_changed_lines(self):
+        tags, tests = _select_tests(
+            _TEST_DIR, ['nested_tags/nested_tags.py:23-24'])
+
+        assert tags == ['root_tag']
+        assert tests == [('nested_tags/nested_tags_test.py', 'test_root')]
+
+    def test_ignores_unchanged_lines(self):
+        tags, tests = _select_tests(
+            _TEST_DIR, ['nested_tags/nested_tags.py:1-15'])
+
+        assert tags == []
+        assert tests == []
+
+    def test_selects_tests_of_changed_files(self):
+        _, tests = _select_tests(_TEST_DIR, ['nested_tags/nested_tags.py'])
+
+        assert tests == [
+            ('nested_tags/nested_tags_test.py', 'test_nested'),
+            ('nested_tags/nested_tags_test.py', 'test_root')
+        ]
+
+    def test_selects_tests_of_snippet_invocation_methods(self):
+        # run_sample() (a snippet invocation method) calls some_method()
+        _, tests = _select_tests(
+            _TEST_DIR, ['snippet_invocation_methods/main.py:17'])
+
+        assert tests == [
+            ('snippet_invocation_methods/main_test.py', 'test_methods')]
+
+    def test_selects_tests_of_additions_groups(self):
+        # untested_method is grouped with not_main and also_not_main
+        tags, tests = _select_tests(_ADDITIONS_DIR, ['additions.py:35'])
+
+        assert tags == ['also_not_main', 'not_main', 'untested_method']
+        assert tests == [
+            ('additions_test.py', 'test_also_not_main'),
+            ('additions_test.py', 'test_not_main')
+        ]
+
+    def test_selects_tests_in_changed_test_files(self):
+        _, tests = _select_tests(_TEST_DIR, ['flask/flask_test.py'])
+
+        assert tests == [('flask/flask_test.py', 'test_index')]
+
+
+_PARENT_SOURCE = """
+# [START parent]
+def parent():
+    return helper()
+# [END parent]
+
+
+def helper():
+    return 'helper'
+"""
+
+
+class SelectParentTestsTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _root_dir(self, tmpdir):
+        self.root_dir = str(tmpdir)
+        with open(os.path.join(self.root_dir, 'main.py'), 'w') as file:
+            file.write(_PARENT_SOURCE)
+
+    def test_selects_tests_of_parent_methods(self):
+        snippets = [
+            {'name': 'parent', 'class_name': 'main', 'method_name': 'parent',
+             'source_path': 'main.py', 'start_line': 3, 'end_line': 4,
+             'parser': 'direct_invocation', 'children': ['helper']},
+            {'name': 'helper', 'class_name': 'main', 'method_name': 'helper',
+             'source_path': 'main.py', 'start_line': 8, 'end_line': 9,
+             'parser': 'direct_invocation', 'children': []}
+        ]
+        snippet_data = analyze.create_snippet_data(
+            snippets,
+            {'main@parent': [['main_test.py', 'test_parent']]},
+            self.root_dir)
+
+        analysis = analyze.SnippetAnalysis(
+            os.path.join(self.root_dir, 'polyglot_snippet_data.json'),
+            self.root_dir,
+            snippet_data=snippet_data)
+        selection = impact_analysis.select_tests(
+            analysis,
+            impact_analysis.parse_changes(['main.py:9'], self.root_dir))
+
+        assert selection.region_tags == ['parent']
+        assert selection.tests == [
+            (os.path.join(self.root_dir, 'main_test.py'), 'test_parent')]
@@ -0,0 +1,103 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file contains helpers that share repeated snippet data values.
+
+Large repositories contain many snippets that share source paths, tests,
+region tags and names. Values decoded from polyglot_snippet_data.json are
+separate copies, so they are interned (stored exactly once per process) as
+they are loaded. Collections are stored in (shared) tuples rather than lists.
+"""
+
+import sys
+from typing import Any, Dict, Iterable, Sequence, Tuple
+
+
+# Snippet fields that contain collections of strings
+_STRING_COLLECTION_FIELDS = ('region_tags', 'children', 'http_methods')
+
+# Snippet fields that contain collections
+_COLLECTION_FIELDS = _STRING_COLLECTION_FIELDS + ('test_methods',)
+
+# Process-wide table of interned (test path, test name) tuples
+_INTERNED_TESTS: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+# Process-wide table of interned string tuples
+_INTERNED_STRING_TUPLES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def intern_strings(values: Iterable[str]) -> Tuple[str, ...]:
+    """Intern a collection of strings, and store them in a (shared) tuple
+
+    Args:
+        values: An iterable of strings
+
+    Returns:
+        The process-wide canonical tuple of the given (interned) strings
+    """
+    key = tuple(sys.intern(value) for value in values)
+
+    return _INTERNED_STRING_TUPLES.setdefault(key, key)
+
+
+def intern_test(test: Sequence[str]) -> Tuple[str, str]:
+    """Intern a (test path, test name) pair
+
+    Identical test pairs are shared by every snippet (and test-method map
+    entry) that refers to them.
+
+    Args:
+        test: A (test path, test name) sequence
+
+    Returns:
+        The process-wide canonical copy of the given test tuple
+    """
+    test_path, test_name = test
+    key = (sys.intern(test_path), sys.intern(test_name))
+
+    return _INTERNED_TESTS.setdefault(key, key)
+
+
+def intern_snippet(snippet: Dict[str, Any]) -> Dict[str, Any]:
+    """Intern the values of a snippet method dict
+
+    String values are interned, string collections are converted to
+    interned tuples (see intern_strings()), and tests are converted to a
+    tuple of interned test tuples (see intern_test()). Missing collections
+    default to an empty tuple, and other values are left as-is.
+
+    Args:
+        snippet: A snippet method dict, as stored in the 'snippets' list
+                 of a polyglot_snippet_data.json file
+
+    Returns:
+        A new snippet dict containing the interned values
+    """
+    interned_snippet: Dict[str, Any] = {
+        field: () for field in _COLLECTION_FIELDS}
+
+    for field, value in snippet.items():
+        if isinstance(value, str):
+            value = sys.intern(value)
+        elif value is None:
+            pass
+        elif field in _STRING_COLLECTION_FIELDS:
+            value = intern_strings(value)
+        elif field == 'test_methods':
+            value = tuple(intern_test(test) for test in value)
+
+        interned_snippet[field] = value
+
+    return interned_snippet
@@ -0,0 +1,75 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from ast_parser.core import intern_utils
+
+
+class InternTestTests(unittest.TestCase):
+    def test_returns_test_tuples(self):
+        assert intern_utils.intern_test(['/repo/main_test.py', 'test_main']) \
+            == ('/repo/main_test.py', 'test_main')
+
+    def test_shares_interned_tests(self):
+        # Build equal (but distinct) path strings
+        path_a = ''.join(['/repo/', 'main_test.py'])
+        path_b = ''.join(['/repo/', 'main_test.py'])
+        assert path_a is not path_b
+
+        test_a = intern_utils.intern_test((path_a, 'test_main'))
+        test_b = intern_utils.intern_test([path_b, 'test_main'])
+
+        assert test_a is test_b
+        assert test_a[0] is test_b[0]
+
+
+class InternStringsTests(unittest.TestCase):
+    def test_shares_interned_tuples(self):
+        tags_a = intern_utils.intern_strings([''.join(['tag_', 'a'])])
+        tags_b = intern_utils.intern_strings(iter([''.join(['tag_', 'a'])]))
+
+        assert tags_a == ('tag_a',)
+        assert tags_a is tags_b
+
+
+class InternSnippetTests(unittest.TestCase):
+    def test_stores_collections_in_tuples(self):
+        snippet = intern_utils.intern_snippet({
+            'name': 'main',
+            'region_tags': ['tag_a'],
+            'test_methods': [['/repo/main_test.py', 'test_main']],
+            'children': ['helper'],
+            'http_methods': ['get'],
+        })
+
+        assert snippet['name'] == 'main'
+        assert snippet['region_tags'] == ('tag_a',)
+        assert snippet['test_methods'] == (
+            ('/repo/main_test.py', 'test_main'),)
+        assert snippet['children'] == ('helper',)
+        assert snippet['http_methods'] == ('get',)
+
+    def test_defaults_missing_collections_to_empty_tuples(self):
+        snippet = intern_utils.intern_snippet({'name': 'main', 'url': None})
+
+        assert snippet['region_tags'] == ()
+        assert snippet['test_methods'] == ()
+        assert snippet['children'] == ()
+        assert snippet['url'] is None
+
+    def test_keeps_none_collections(self):
+        snippet = intern_utils.intern_snippet({'http_methods': None})
+
+        assert snippet['http_methods'] is None
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List, Tuple
+from typing import Sequence, Tuple
 
 from recordclass import RecordClass
 
@@ -23,6 +23,10 @@ class PolyglotDriftData(RecordClass):
     This object stores language-agnostic ("polyglot")
     snippet data extracted from snippet source files
     for use by the second-stage "polyglot" parser.
+
+    Records created by analyze.create_snippet_data() (and updated by the
+    analysis stages) store their collections in tuples, and share their
+    strings (see intern_utils).
     """
     name: str
     class_name: str
@@ -31,8 +35,8 @@ class PolyglotDriftData(RecordClass):
     start_line: int
     end_line: int
     parser: str
-    region_tags: List[str] = []
-    test_methods: List[Tuple[str, str]] = []
-    children: List[str] = []
+    region_tags: Sequence[str] = []
+    test_methods: Sequence[Tuple[str, str]] = []
+    children: Sequence[str] = []
     url: str = None
-    http_methods: List[str] = []
+    http_methods: Sequence[str] = []
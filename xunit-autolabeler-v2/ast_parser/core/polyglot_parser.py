@@ -12,9 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List, Tuple
+import io
+from typing import List, Optional, Tuple
 
-from . import constants
+from . import constants, intern_utils
 from . import polyglot_drift_data as pdd
 
 
@@ -53,6 +54,9 @@ def add_children_drift_data(
             return
         recursed_nodes.add(method_key)
 
+        region_tags = set(method.region_tags)
+        test_methods = set(method.test_methods)
+
         for child in method.children:
             child_methods = [
                 child_method for child_method in source_methods if
@@ -64,11 +68,11 @@ def add_children_drift_data(
                 child_method = child_methods[0]
                 _recursor(child_method)
 
-                method.region_tags.extend(child_method.region_tags)
-                method.test_methods.extend(child_method.test_methods)
+                region_tags.update(child_method.region_tags)
+                test_methods.update(child_method.test_methods)
 
-        method.region_tags = list(set(method.region_tags))
-        method.test_methods = list(set(method.test_methods))
+        method.region_tags = tuple(region_tags)
+        method.test_methods = tuple(test_methods)
 
     """
     EDGE CASE:
@@ -93,24 +97,28 @@ def add_children_drift_data(
             ]
 
             if child_methods:
-                child_methods[0].test_methods.extend(method.test_methods)
+                child_method = child_methods[0]
+                child_method.test_methods = (
+                    *child_method.test_methods, *method.test_methods)
 
         # Remove direct children of snippet invocation methods
         # (Since the invocation method's test data was propagated to them)
-        method.children = []
-        method.test_methods = []
+        method.children = ()
+        method.test_methods = ()
 
     for method in source_methods:
         _recursor(method)
 
 
 def get_region_tag_regions(
-    source_path: str
+    source_path: str,
+    content: Optional[str] = None
 ) -> Tuple[List[Tuple[str, int, int]], List[str]]:
     """Get the region tag data from a given file (of any language)
 
     Args:
         source_path: path to the target file
+        content: (Optional) the file's (already-read) contents
 
     Returns:
         A tuple of the form (regions_and_tags, ignored_tag_names), where:
@@ -136,65 +144,69 @@ def get_region_tag_regions(
 
         return (line_num + 1, tag)  # +1 = convert to 0-indexed
 
-    with open(source_path, 'r') as file:
-        file_lines = file.readlines()
+    if content is None:
+        with open(source_path, 'r') as file:
+            content = file.read()
+
+    # (Only newlines end lines, as they do for the AST's line numbers)
+    file_lines = io.StringIO(content).readlines()
 
-        # Remove _EXCLUDE tags
-        file_lines = [line for line in file_lines
-                      if '[START_EXCLUDE' not in line
-                      and '[END_EXCLUDE' not in line]
+    # Remove _EXCLUDE tags
+    file_lines = [line for line in file_lines
+                  if '[START_EXCLUDE' not in line
+                  and '[END_EXCLUDE' not in line]
 
-        content_lines = [(idx, line_text) for idx, line_text in
-                         enumerate(file_lines)]
+    content_lines = [(idx, line_text) for idx, line_text in
+                     enumerate(file_lines)]
 
-        start_tag_lines = [line_tuple for line_tuple in content_lines
-                           if ' [START' in line_tuple[1]]
-        end_tag_lines = [line_tuple for line_tuple in content_lines
-                         if ' [END' in line_tuple[1]]
+    start_tag_lines = [line_tuple for line_tuple in content_lines
+                       if ' [START' in line_tuple[1]]
+    end_tag_lines = [line_tuple for line_tuple in content_lines
+                     if ' [END' in line_tuple[1]]
 
-        # region tags can be repeated, so we can't use them as dict keys
-        # for specific region blocks - so we use tuple arrays instead
-        start_regions = [_get_region_tag_from_line(line_tuple)
-                         for line_tuple in start_tag_lines]
-        end_regions = [_get_region_tag_from_line(line_tuple)
-                       for line_tuple in end_tag_lines]
+    # region tags can be repeated, so we can't use them as dict keys
+    # for specific region blocks - so we use tuple arrays instead
+    start_regions = [_get_region_tag_from_line(line_tuple)
+                     for line_tuple in start_tag_lines]
+    end_regions = [_get_region_tag_from_line(line_tuple)
+                   for line_tuple in end_tag_lines]
 
-        unique_tag_names = \
-            list(set([region_tag for _, region_tag in start_regions]))
+    unique_tag_names = \
+        list(set([region_tag for _, region_tag in start_regions]))
 
-        # ignore "useless" region tags
-        ignored_tag_names = [tag for tag in unique_tag_names if
-                             tag in constants.IGNORED_REGION_TAGS]
-        unique_tag_names = [tag for tag in unique_tag_names if
-                            tag not in ignored_tag_names]
+    # ignore "useless" region tags
+    ignored_tag_names = [tag for tag in unique_tag_names if
+                         tag in constants.IGNORED_REGION_TAGS]
+    unique_tag_names = [tag for tag in unique_tag_names if
+                        tag not in ignored_tag_names]
 
-        if len(start_regions) != len(end_regions):
-            raise ValueError('Mismatched region tags: ' + source_path)
+    if len(start_regions) != len(end_regions):
+        raise ValueError('Mismatched region tags: ' + source_path)
 
-        start_regions.sort()
-        end_regions.sort()
+    start_regions.sort()
+    end_regions.sort()
 
-        regions_and_tags = []
-        for tag in unique_tag_names:
-            matching_starts = [(line_num, line_tag) for line_num, line_tag
-                               in start_regions if line_tag == tag]
-            matching_ends = [(line_num, line_tag) for line_num, line_tag
-                             in end_regions if line_tag == tag]
+    regions_and_tags = []
+    for tag in unique_tag_names:
+        matching_starts = [(line_num, line_tag) for line_num, line_tag
+                           in start_regions if line_tag == tag]
+        matching_ends = [(line_num, line_tag) for line_num, line_tag
+                         in end_regions if line_tag == tag]
 
-            if len(matching_starts) != len(matching_ends):
-                raise ValueError(
-                    f'Mismatched region tag [{tag}] in {source_path}')
+        if len(matching_starts) != len(matching_ends):
+            raise ValueError(
+                f'Mismatched region tag [{tag}] in {source_path}')
 
-            # Create regions_and_tags list
-            matching_tags = [region[1] for region in matching_starts]
-            matching_start_linenos = [region[0] for region in matching_starts]
-            matching_end_linenos = [region[0] for region in matching_ends]
+        # Create regions_and_tags list
+        matching_tags = [region[1] for region in matching_starts]
+        matching_start_linenos = [region[0] for region in matching_starts]
+        matching_end_linenos = [region[0] for region in matching_ends]
 
-            matching_regions_and_tags = list(zip(
-                matching_tags, matching_start_linenos, matching_end_linenos))
-            regions_and_tags += matching_regions_and_tags
+        matching_regions_and_tags = list(zip(
+            matching_tags, matching_start_linenos, matching_end_linenos))
+        regions_and_tags += matching_regions_and_tags
 
-        return (regions_and_tags, ignored_tag_names)
+    return (regions_and_tags, ignored_tag_names)
 
 
 def add_region_tags_to_method(
@@ -250,8 +262,8 @@ def add_region_tags_to_method(
     matching_regions = [region for region in regions_and_tags
                         if _overlaps(method, region)]
 
-    new_region_tags = list(set([
+    new_region_tags = intern_utils.intern_strings(set(
         region[0] for region in matching_regions
-    ]))
+    ))
 
     return method._replace(region_tags=new_region_tags)
@@ -60,7 +60,7 @@ class PolyglotParserTests(unittest.TestCase):
         method = source_methods[0]
 
         # this should NOT contain 'main_method'
-        self.assertEqual(method.region_tags, ['not_main'])
+        self.assertEqual(method.region_tags, ('not_main',))
 
     def test_region_tags_nested(self):
         source_methods = _create_fixtures('nested_tags')
@@ -68,11 +68,9 @@ class PolyglotParserTests(unittest.TestCase):
         method_1 = source_methods[0]
         method_2 = source_methods[1]
 
-        method_1.region_tags.sort()
-
         self.assertEqual(
-            method_1.region_tags, ['nested_tag', 'root_tag'])
-        self.assertEqual(method_2.region_tags, ['root_tag'])
+            sorted(method_1.region_tags), ['nested_tag', 'root_tag'])
+        self.assertEqual(method_2.region_tags, ('root_tag',))
 
     def test_handle_multi_block_region_tags(self):
         source_methods = _create_fixtures('nested_tags')
@@ -81,8 +79,8 @@ class PolyglotParserTests(unittest.TestCase):
         method_1 = source_methods[1]
         method_2 = source_methods[2]
 
-        self.assertEqual(method_1.region_tags, ['root_tag'])
-        self.assertEqual(method_2.region_tags, ['root_tag'])
+        self.assertEqual(method_1.region_tags, ('root_tag',))
+        self.assertEqual(method_2.region_tags, ('root_tag',))
 
     def test_flask_router_parser(self):
         source_methods = _create_fixtures('flask', True)
@@ -91,7 +89,7 @@ class PolyglotParserTests(unittest.TestCase):
                           method.parser == 'flask_router']
 
         method = source_methods[0]
-        self.assertEqual(method.region_tags, ['sample_route'])
+        self.assertEqual(method.region_tags, ('sample_route',))
 
     def test_direct_invocation_parser(self):
         source_methods = _create_fixtures('http', True)
@@ -103,10 +101,29 @@ class PolyglotParserTests(unittest.TestCase):
         source_methods = _create_fixtures('webapp2', True)
 
         method = source_methods[-1]
-        self.assertEqual(method.region_tags, ['sign_handler'])
+        self.assertEqual(method.region_tags, ('sign_handler',))
 
     def test_ignores_exclude_tags(self):
         source_methods = _create_fixtures('exclude_tags', True)
 
         # make sure the file was parsed properly
         assert len(source_methods) == 2
+
+    def test_counts_lines_like_the_ast(self):
+        # Form feeds (and other Unicode line breaks) don't end lines
+        content = (
+            '# [START a]\n'
+            'def a():\n'
+            '    pass\n'
+            '# [END a]\n'
+            '\x0c\n'
+            '# [START b]\n'
+            'def b():\n'
+            '    pass\n'
+            '# [END b]\n'
+        )
+
+        regions, _ = polyglot_parser.get_region_tag_regions(
+            'main.py', content)
+
+        assert sorted(regions) == [('a', 1, 4), ('b', 6, 9)]
@@ -0,0 +1,149 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file selects a cheap "smoke test" subset of a directory's tests, which
+still covers every region tag that any of its tests cover.
+"""
+
+import heapq
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from . import polyglot_drift_data as pdd
+from . import xunit_utils, yaml_utils
+
+
+# Tests are (test path, test name) tuples
+_Test = Tuple[str, str]
+
+# Used when no durations are known for any of the candidate tests
+_DEFAULT_DURATION = 1.0
+
+
+class SmokeTests(NamedTuple):
+    # A map from each selected test to its (estimated) duration in seconds
+    durations: Dict[_Test, float]
+
+    # The selected tests without a duration in any XUnit report (whose
+    # durations were estimated)
+    estimated_tests: Set[_Test]
+
+    # Region tags that none of the tests cover
+    uncovered_tags: List[str]
+
+    @property
+    def total_duration(self) -> float:
+        return sum(self.durations.values())
+
+
+def get_test_tags(
+    source_methods: Iterable[pdd.PolyglotDriftData],
+    region_tags: Set[str]
+) -> Dict[_Test, Set[str]]:
+    """Map tests to the region tags they cover
+
+    Args:
+        source_methods: snippet methods with their tests attached (see
+                        analyze.SnippetAnalysis.source_methods)
+        region_tags: the region tags to consider (other tags are omitted)
+
+    Returns:
+        A map from (test path, test name) tuples to region tag sets
+    """
+    test_tags: Dict[_Test, Set[str]] = {}
+
+    for method in source_methods:
+        method_tags = region_tags.intersection(method.region_tags)
+        if not method_tags:
+            continue
+
+        for test in yaml_utils.get_method_tests(method):
+            test_tags.setdefault(test, set()).update(method_tags)
+
+    return test_tags
+
+
+def select_smoke_tests(
+    source_methods: Iterable[pdd.PolyglotDriftData],
+    region_tags: Set[str],
+    durations: Dict[xunit_utils.XUnitTestKey, float],
+    default_duration: Optional[float] = None
+) -> SmokeTests:
+    """Select a near-minimal-cost set of tests that covers every region tag
+
+    Tests are chosen greedily (by duration per newly-covered region tag),
+    which approximates the (NP-hard) weighted set cover problem within a
+    logarithmic factor. Each test's ratio only grows as tags are covered, so
+    ratios are re-computed lazily instead of after every choice.
+
+    Args:
+        source_methods: snippet methods with their tests attached (see
+                        analyze.SnippetAnalysis.source_methods)
+        region_tags: the region tags to cover
+        durations: test durations (see xunit_utils.read_test_durations())
+        default_duration: (Optional) the duration of tests without a known
+                          duration. Defaults to the mean known duration of
+                          the candidate tests.
+
+    Returns:
+        The selected tests, and the region tags they can't cover
+    """
+    test_tags = get_test_tags(source_methods, region_tags)
+
+    test_durations = {}
+    for test in test_tags:
+        test_key = xunit_utils.get_test_method_key(test)
+        if test_key in durations:
+            test_durations[test] = durations[test_key]
+
+    estimated_tests = set(test_tags).difference(test_durations)
+    if default_duration is None:
+        default_duration = (
+            sum(test_durations.values()) / len(test_durations)
+            if test_durations else _DEFAULT_DURATION)
+    for test in estimated_tests:
+        test_durations[test] = default_duration
+
+    # Heap entries are (cost per new tag, -new tag count, test) tuples
+    heap = [(test_durations[test] / len(tags), -len(tags), test)
+            for test, tags in test_tags.items()]
+    heapq.heapify(heap)
+
+    covered_tags: Set[str] = set()
+    for tags in test_tags.values():
+        covered_tags.update(tags)
+
+    uncovered_tags = set(covered_tags)
+    selected_durations: Dict[_Test, float] = {}
+
+    while heap and uncovered_tags:
+        _, negative_tag_count, test = heapq.heappop(heap)
+
+        new_tag_count = len(test_tags[test] & uncovered_tags)
+        if not new_tag_count:
+            continue
+
+        if new_tag_count != -negative_tag_count:
+            # Stale entry: re-queue the test with its current ratio
+            heapq.heappush(heap, (
+                test_durations[test] / new_tag_count, -new_tag_count, test))
+            continue
+
+        selected_durations[test] = test_durations[test]
+        uncovered_tags -= test_tags[test]
+
+    return SmokeTests(
+        selected_durations,
+        estimated_tests.intersection(selected_durations),
+        sorted(region_tags - covered_tags))
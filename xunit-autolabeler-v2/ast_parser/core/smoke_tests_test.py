@@ -0,0 +1,105 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+
+from ast_parser.core import smoke_tests
+from ast_parser.core.drift_data_test_utils import create_method
+
+
+def _test(test_name):
+    return ('/repo/main_test.py', test_name)
+
+
+def _durations(**test_durations):
+    return {('main_test', test_name): duration
+            for test_name, duration in test_durations.items()}
+
+
+class SelectSmokeTestsTests(unittest.TestCase):
+    def test_prefers_cheaper_tests(self):
+        source_methods = [
+            create_method(['a'], ['test_slow_a', 'test_fast_a']),
+            create_method(['b'], ['test_fast_b'])
+        ]
+
+        selection = smoke_tests.select_smoke_tests(
+            source_methods,
+            {'a', 'b'},
+            _durations(test_slow_a=5, test_fast_a=1, test_fast_b=2))
+
+        assert selection.durations == {
+            _test('test_fast_a'): 1, _test('test_fast_b'): 2}
+        assert selection.total_duration == 3
+
+    def test_prefers_tests_covering_more_tags(self):
+        source_methods = [
+            create_method(['a'], ['test_a', 'test_all']),
+            create_method(['b'], ['test_b', 'test_all']),
+            create_method(['c'], ['test_c', 'test_all'])
+        ]
+
+        selection = smoke_tests.select_smoke_tests(
+            source_methods,
+            {'a', 'b', 'c'},
+            _durations(test_a=1, test_b=1, test_c=1, test_all=2))
+
+        assert list(selection.durations) == [_test('test_all')]
+
+    def test_requeues_tests_whose_tags_were_covered(self):
+        # test_ab is cheapest per tag, after which test_bc only covers
+        # one new tag (and test_c is cheaper for that tag)
+        source_methods = [
+            create_method(['a'], ['test_ab']),
+            create_method(['b'], ['test_ab', 'test_bc']),
+            create_method(['c'], ['test_bc', 'test_c'])
+        ]
+
+        selection = smoke_tests.select_smoke_tests(
+            source_methods,
+            {'a', 'b', 'c'},
+            _durations(test_ab=1, test_bc=1.5, test_c=1))
+
+        assert set(selection.durations) == {_test('test_ab'), _test('test_c')}
+
+    def test_reports_uncovered_tags(self):
+        selection = smoke_tests.select_smoke_tests(
+            [create_method(['a'], ['test_a']), create_method(['b'], [])],
+            {'a', 'b', 'c'},
+            {})
+
+        assert selection.uncovered_tags == ['b', 'c']
+
+    def test_estimates_missing_durations(self):
+        source_methods = [
+            create_method(['a'], ['test_a']),
+            create_method(['b'], ['test_b']),
+            create_method(['c'], ['test_c'])
+        ]
+
+        selection = smoke_tests.select_smoke_tests(
+            source_methods,
+            {'a', 'b', 'c'},
+            _durations(test_a=1, test_b=3))
+
+        assert selection.durations[_test('test_c')] == 2
+        assert selection.estimated_tests == {_test('test_c')}
+
+    def test_uses_default_duration(self):
+        selection = smoke_tests.select_smoke_tests(
+            [create_method(['a'], ['test_a'])], {'a'}, {},
+            default_duration=0.5)
+
+        assert selection.total_duration == 0.5
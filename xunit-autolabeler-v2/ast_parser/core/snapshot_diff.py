@@ -0,0 +1,232 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file compares two snapshots of analyzed snippet data, such as those of
+the base and head revisions of a pull request.
+
+Snapshots are snippet databases (see snippet_db.py), in which every snippet
+has a fingerprint. Snippets with a fingerprint found in both snapshots are
+unchanged, so only the region tags and source files of the remaining
+snippets need to be compared.
+"""
+
+import collections
+import os
+import sqlite3
+from typing import Counter, Dict, Iterable, List, NamedTuple
+from typing import Optional, Set, Tuple
+
+from ast_parser.lib import git_utils
+
+from . import analyze, snippet_db
+
+
+class SnapshotDiff(NamedTuple):
+    # Region tags detected in only one of the snapshots
+    added_tags: List[str]
+    removed_tags: List[str]
+
+    # Maps from region tags (detected in both snapshots) to the
+    # (test path, test name) tuples they gained or lost
+    gained_tests: Dict[str, List[Tuple[str, str]]]
+    lost_tests: Dict[str, List[Tuple[str, str]]]
+
+    # A map from source files to their (before, after) tested statuses
+    # (snippet_db.*_TESTED values, or None for files without region-tagged
+    # snippets) - for files whose status changed
+    changed_files: Dict[str, Tuple[Optional[str], Optional[str]]]
+
+
+def create_snapshot(
+    data_json: str,
+    root_dir: str,
+    cache_dir: Optional[str] = None,
+    snippet_data: Optional[analyze.SnippetData] = None,
+    revision: Optional[git_utils.GitRevision] = None
+) -> sqlite3.Connection:
+    """Analyze a directory and store the results as an in-memory snapshot
+
+    Args:
+        data_json: A path to a polyglot_drift_data.json file for the specified
+                   root directory
+        root_dir: A path to the target root directory.
+        cache_dir: (Optional) A directory to cache analysis inputs (such as
+                   parsed .drift-data.yml files) in between runs.
+        snippet_data: (Optional) In-memory snippet data (see
+                      analyze.create_snippet_data()) to use instead of
+                      data_json.
+        revision: (Optional) A git revision of root_dir to analyze instead
+                  of the working tree.
+
+    Returns:
+        A connection to the snapshot's (in-memory) snippet database
+    """
+    analysis = analyze.SnippetAnalysis(
+        data_json, root_dir, cache_dir, snippet_data, revision)
+
+    # Undetected tags don't affect comparisons, so
+    # skip searching the root directory for them
+    return snippet_db.create_snippet_db(
+        root_dir,
+        set(),
+        analysis.source_tags,
+        analysis.ignored_tags,
+        analysis.source_methods)
+
+
+def open_snapshot(
+    snapshot_path: str,
+    cache_dir: Optional[str] = None
+) -> sqlite3.Connection:
+    """Open a snapshot of analyzed snippet data
+
+    Args:
+        snapshot_path: a snippet database file (see export_snippet_db), a
+                       polyglot_snippet_data.json file, or a directory
+                       containing a polyglot_snippet_data.json file. (Snippet
+                       data files are analyzed relative to the directory
+                       that contains them.)
+        cache_dir: (Optional) A directory to cache analysis inputs (such as
+                   parsed .drift-data.yml files) in between runs.
+
+    Raises:
+        ValueError: if the snapshot doesn't exist, or uses an unsupported
+                    format
+
+    Returns:
+        A connection to the snapshot's snippet database
+    """
+    if os.path.isdir(snapshot_path):
+        return create_snapshot(
+            os.path.join(snapshot_path, 'polyglot_snippet_data.json'),
+            snapshot_path,
+            cache_dir)
+
+    if snapshot_path.endswith('.json'):
+        return create_snapshot(
+            snapshot_path,
+            os.path.dirname(os.path.abspath(snapshot_path)),
+            cache_dir)
+
+    return snippet_db.open_snippet_db(snapshot_path)
+
+
+def _get_fingerprint_counts(connection: sqlite3.Connection) -> Counter[str]:
+    return collections.Counter(dict(connection.execute(
+        'SELECT fingerprint, COUNT(*) FROM snippets GROUP BY fingerprint')))
+
+
+def _get_snippet_tags_and_files(
+    connection: sqlite3.Connection,
+    fingerprints: Iterable[str]
+) -> Tuple[Set[str], Set[str]]:
+    """Find the region tags and source files of a set of snippets
+
+    Args:
+        connection: a snippet database connection
+        fingerprints: the snippets' fingerprints
+
+    Returns:
+        A tuple containing the snippets' region tags and source file paths
+    """
+    tags: Set[str] = set()
+    paths: Set[str] = set()
+
+    for fingerprint in fingerprints:
+        tags.update(row[0] for row in connection.execute(
+            'SELECT tags.name FROM snippets '
+            'JOIN snippet_tags ON snippet_tags.snippet_id = snippets.id '
+            'JOIN tags ON tags.id = snippet_tags.tag_id '
+            'WHERE snippets.fingerprint = ?',
+            (fingerprint,)))
+        paths.update(row[0] for row in connection.execute(
+            'SELECT files.path FROM snippets '
+            'JOIN files ON files.id = snippets.file_id '
+            'WHERE snippets.fingerprint = ?',
+            (fingerprint,)))
+
+    return tags, paths
+
+
+def _is_tag_detected(connection: sqlite3.Connection, tag: str) -> bool:
+    return connection.execute(
+        'SELECT 1 FROM tags '
+        'JOIN snippet_tags ON snippet_tags.tag_id = tags.id '
+        'WHERE tags.name = ? LIMIT 1',
+        (tag,)).fetchone() is not None
+
+
+def _get_tested_status(
+    connection: sqlite3.Connection,
+    path: str
+) -> Optional[str]:
+    row = connection.execute(
+        'SELECT tested_status FROM files WHERE path = ?',
+        (path,)).fetchone()
+
+    return row[0] if row else None
+
+
+def diff_snapshots(
+    base: sqlite3.Connection,
+    head: sqlite3.Connection
+) -> SnapshotDiff:
+    """Compare two snapshots of analyzed snippet data
+
+    Args:
+        base: a connection to the earlier snapshot's snippet database
+        head: a connection to the later snapshot's snippet database
+
+    Returns:
+        The differences between the snapshots' region tags, tests and
+        tested source files
+    """
+    base_counts = _get_fingerprint_counts(base)
+    head_counts = _get_fingerprint_counts(head)
+
+    base_tags, base_paths = _get_snippet_tags_and_files(
+        base, base_counts - head_counts)
+    head_tags, head_paths = _get_snippet_tags_and_files(
+        head, head_counts - base_counts)
+
+    diff = SnapshotDiff([], [], {}, {}, {})
+
+    for tag in sorted(base_tags | head_tags):
+        in_base = _is_tag_detected(base, tag)
+        in_head = _is_tag_detected(head, tag)
+
+        if in_base != in_head:
+            if in_head:
+                diff.added_tags.append(tag)
+            else:
+                diff.removed_tags.append(tag)
+            continue
+
+        base_tests = set(snippet_db.get_tests_for_tag(base, tag))
+        head_tests = set(snippet_db.get_tests_for_tag(head, tag))
+
+        if head_tests - base_tests:
+            diff.gained_tests[tag] = sorted(head_tests - base_tests)
+        if base_tests - head_tests:
+            diff.lost_tests[tag] = sorted(base_tests - head_tests)
+
+    for path in sorted(base_paths | head_paths):
+        base_status = _get_tested_status(base, path)
+        head_status = _get_tested_status(head, path)
+
+        if base_status != head_status:
+            diff.changed_files[path] = (base_status, head_status)
+
+    return diff
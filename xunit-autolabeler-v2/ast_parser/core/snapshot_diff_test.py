@@ -0,0 +1,148 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import unittest
+
+from ast_parser.core import analyze, snapshot_diff, snippet_db
+from ast_parser.core.drift_data_test_utils import ROOT_DIR
+from ast_parser.core.drift_data_test_utils import create_named_method
+
+import pytest
+
+
+_TEST_DIR = os.path.join(
+    os.path.dirname(__file__),
+    'test_data/parser'
+)
+
+
+def _create_snapshot(source_methods):
+    return snippet_db.create_snippet_db(
+        ROOT_DIR, set(), set(), set(), source_methods)
+
+
+_BASE_METHODS = [
+    create_named_method(
+        'a/main.py', 'tested', ['tag_a'], [('a/main_test.py', 'test_a')]),
+    create_named_method('a/main.py', 'untested', ['tag_b']),
+    create_named_method(
+        'b/main.py', 'tested', ['tag_c'], [('b/main_test.py', 'test_c')]),
+]
+
+
+class DiffSnapshotsTests(unittest.TestCase):
+    def _diff(self, head_methods):
+        base = _create_snapshot(_BASE_METHODS)
+        head = _create_snapshot(head_methods)
+
+        try:
+            return snapshot_diff.diff_snapshots(base, head)
+        finally:
+            base.close()
+            head.close()
+
+    def test_ignores_unchanged_snippets(self):
+        moved_methods = [
+            create_named_method(
+                'a/main.py', 'untested', ['tag_b'], start_line=10),
+            _BASE_METHODS[0],
+            _BASE_METHODS[2]
+        ]
+
+        assert self._diff(moved_methods) == snapshot_diff.SnapshotDiff(
+            [], [], {}, {}, {})
+
+    def test_finds_added_and_removed_tags(self):
+        diff = self._diff(_BASE_METHODS[:2] + [
+            create_named_method(
+                'b/main.py', 'tested', ['tag_d'],
+                [('b/main_test.py', 'test_c')])
+        ])
+
+        assert diff.added_tags == ['tag_d']
+        assert diff.removed_tags == ['tag_c']
+        assert diff.gained_tests == {}
+        assert diff.lost_tests == {}
+
+    def test_finds_gained_and_lost_tests(self):
+        diff = self._diff([
+            create_named_method(
+                'a/main.py', 'tested', ['tag_a'],
+                [('a/main_test.py', 'test_a2')]),
+            create_named_method(
+                'a/main.py', 'untested', ['tag_b'],
+                [('a/main_test.py', 'test_b')]),
+            _BASE_METHODS[2]
+        ])
+
+        assert diff.gained_tests == {
+            'tag_a': [('a/main_test.py', 'test_a2')],
+            'tag_b': [('a/main_test.py', 'test_b')]
+        }
+        assert diff.lost_tests == {
+            'tag_a': [('a/main_test.py', 'test_a')]
+        }
+        assert diff.changed_files == {
+            'a/main.py': (snippet_db.SOME_TESTED, snippet_db.ALL_TESTED)
+        }
+
+    def test_ignores_tests_shared_by_other_snippets(self):
+        diff = self._diff(_BASE_METHODS + [
+            create_named_method(
+                'c/main.py', 'tested', ['tag_a'],
+                [('a/main_test.py', 'test_a')])
+        ])
+
+        assert diff.gained_tests == {}
+        assert diff.changed_files == {
+            'c/main.py': (None, snippet_db.ALL_TESTED)
+        }
+
+
+class OpenSnapshotTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _tmpdir(self, tmpdir):
+        self.tmpdir = tmpdir
+
+    def test_opens_directories_and_databases(self):
+        analysis = analyze.SnippetAnalysis(
+            os.path.join(_TEST_DIR, 'polyglot_snippet_data.json'),
+            _TEST_DIR
+        )
+
+        db_path = os.path.join(self.tmpdir, snippet_db.DB_FILE_NAME)
+        snippet_db.export_snippet_db(
+            db_path,
+            _TEST_DIR,
+            analysis.grep_tags,
+            analysis.source_tags,
+            analysis.ignored_tags,
+            analysis.source_methods)
+
+        base = snapshot_diff.open_snapshot(db_path)
+        head = snapshot_diff.open_snapshot(_TEST_DIR)
+        try:
+            diff = snapshot_diff.diff_snapshots(base, head)
+        finally:
+            base.close()
+            head.close()
+
+        assert diff == snapshot_diff.SnapshotDiff([], [], {}, {}, {})
+
+    def test_errors_on_missing_database(self):
+        with pytest.raises(ValueError):
+            snapshot_diff.open_snapshot(
+                os.path.join(self.tmpdir, snippet_db.DB_FILE_NAME))
@@ -0,0 +1,134 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file merges sharded snippet data into a single snippet data file.
+
+Large directories can be split into shards (by top-level sub-directory), and
+each shard parsed by a separate language-specific parser run. Every shard
+produces its own polyglot_snippet_data.shard-<index>-of-<count>.json file.
+Since snippet records and test-method-map entries are independent of one
+another, these files can be combined without re-parsing any source files.
+"""
+
+import glob
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+
+SHARD_FILE_PREFIX = 'polyglot_snippet_data.shard-'
+
+
+def get_shard_path(root_dir: str, shard_index: int, shard_count: int) -> str:
+    """Get the path of a shard's snippet data file
+
+    Args:
+        root_dir: The root directory being sharded
+        shard_index: The (zero-based) index of the shard
+        shard_count: The total number of shards
+
+    Returns:
+        The path that the shard's snippet data should be written to
+    """
+    return os.path.join(
+        root_dir, f'{SHARD_FILE_PREFIX}{shard_index}-of-{shard_count}.json')
+
+
+def find_shard_paths(
+    root_dir: str,
+    shard_count: Optional[int] = None
+) -> List[str]:
+    """List the shard snippet data files within a root directory
+
+    Args:
+        root_dir: The root directory that was sharded
+        shard_count: (Optional) The number of shards the directory was split
+                     into. If specified, shard files left over from runs
+                     with other shard counts are ignored.
+
+    Returns:
+        The paths of the root directory's shard snippet data files
+    """
+    shard_suffix = f'*-of-{shard_count}.json' if shard_count else '*.json'
+
+    return sorted(glob.glob(os.path.join(
+        glob.escape(root_dir), f'{SHARD_FILE_PREFIX}{shard_suffix}')))
+
+
+def merge_shards(shard_paths: List[str]) -> Dict[str, Any]:
+    """Merge the snippet data of every shard of a directory
+
+    Snippets are combined in shard order, and test-method-map entries with
+    the same key are concatenated (in shard order).
+
+    Args:
+        shard_paths: Paths to the snippet data file of each shard
+
+    Raises:
+        ValueError: if the files don't form a complete set of shards
+
+    Returns:
+        The combined snippet data, in polyglot_snippet_data.json format
+    """
+    shards: Dict[int, Dict[str, Any]] = {}
+    shard_count = None
+    schema_versions = set()
+
+    for shard_path in shard_paths:
+        with open(shard_path, 'r') as file:
+            shard_json = json.load(file)
+
+        shard_info = shard_json.get('shard')
+        if not shard_info:
+            raise ValueError(f'File {shard_path} is not a shard!')
+
+        if shard_count is None:
+            shard_count = shard_info['count']
+        elif shard_info['count'] != shard_count:
+            raise ValueError(
+                f'Shard {shard_path} is one of {shard_info["count"]} shards, '
+                f'but other shards are one of {shard_count}.')
+
+        schema_versions.add(shard_json.get('schema_version', 1))
+
+        if shard_info['index'] in shards:
+            raise ValueError(
+                f'Shard {shard_info["index"]} found more than once.')
+
+        shards[shard_info['index']] = shard_json
+
+    missing_shards = set(range(shard_count or 0)) - set(shards)
+    if not shards or missing_shards:
+        raise ValueError(
+            f'Missing shard(s): {sorted(missing_shards) or "all"}')
+
+    if len(schema_versions) != 1:
+        raise ValueError('Shards use different snippet data formats.')
+
+    snippets: List[Dict[str, Any]] = []
+    test_method_map: Dict[str, List[List[str]]] = {}
+
+    for shard_index in sorted(shards):
+        shard_json = shards.pop(shard_index)
+
+        snippets += shard_json['snippets']
+        for test_key, tests in shard_json['test_method_map'].items():
+            test_method_map.setdefault(test_key, []).extend(tests)
+
+    return {
+        'schema_version': schema_versions.pop(),
+        'snippets': snippets,
+        'test_method_map': test_method_map
+    }
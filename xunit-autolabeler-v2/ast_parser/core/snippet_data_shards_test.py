@@ -0,0 +1,94 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+
+import pytest
+
+from . import snippet_data_shards
+
+
+class MergeShardsTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _root_dir(self, tmpdir):
+        self.root_dir = str(tmpdir)
+
+    def _write_shard(
+        self, shard_index, shard_count, snippets, test_map, schema_version=2
+    ):
+        shard_path = snippet_data_shards.get_shard_path(
+            self.root_dir, shard_index, shard_count)
+        with open(shard_path, 'w') as file:
+            json.dump({
+                'schema_version': schema_version,
+                'snippets': snippets,
+                'test_method_map': test_map,
+                'shard': {'index': shard_index, 'count': shard_count}
+            }, file)
+
+    def _merge(self):
+        return snippet_data_shards.merge_shards(
+            snippet_data_shards.find_shard_paths(self.root_dir))
+
+    def test_merges_shards_in_order(self):
+        self._write_shard(1, 2, [{'name': 'b'}], {'main@b': [['t', 'b']]})
+        self._write_shard(0, 2, [{'name': 'a'}], {
+            'main@a': [['t', 'a']],
+            'main@b': [['t', 'b0']]
+        })
+
+        merged = self._merge()
+
+        assert merged['snippets'] == [{'name': 'a'}, {'name': 'b'}]
+        assert merged['test_method_map'] == {
+            'main@a': [['t', 'a']],
+            'main@b': [['t', 'b0'], ['t', 'b']]
+        }
+        assert merged['schema_version'] == 2
+        assert 'shard' not in merged
+
+    def test_rejects_missing_shards(self):
+        self._write_shard(0, 2, [], {})
+
+        with self.assertRaises(ValueError):
+            self._merge()
+
+    def test_rejects_mismatched_shard_counts(self):
+        self._write_shard(0, 2, [], {})
+        self._write_shard(1, 3, [], {})
+
+        with self.assertRaises(ValueError):
+            self._merge()
+
+    def test_ignores_shards_of_other_counts(self):
+        self._write_shard(0, 2, [{'name': 'a'}], {})
+        self._write_shard(1, 2, [{'name': 'b'}], {})
+        self._write_shard(1, 3, [{'name': 'stale'}], {})
+
+        merged = snippet_data_shards.merge_shards(
+            snippet_data_shards.find_shard_paths(self.root_dir, 2))
+
+        assert merged['snippets'] == [{'name': 'a'}, {'name': 'b'}]
+
+    def test_rejects_mismatched_schema_versions(self):
+        self._write_shard(0, 2, [], {}, schema_version=1)
+        self._write_shard(1, 2, [], {}, schema_version=2)
+
+        with self.assertRaises(ValueError):
+            self._merge()
+
+    def test_rejects_empty_shard_lists(self):
+        with self.assertRaises(ValueError):
+            self._merge()
@@ -0,0 +1,469 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file stores analyzed snippet data in (and queries it from) a SQLite
+database.
+
+Each table is indexed by the columns it is queried on, so queries only
+require index lookups - rather than a full analysis run followed by a scan
+of every snippet. Paths are stored relative to the analyzed root directory,
+so the database file can be copied (or served) independently of it.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import uuid
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from . import polyglot_drift_data as pdd
+from . import yaml_utils
+
+
+DB_FILE_NAME = 'polyglot_snippet_data.db'
+
+SCHEMA_VERSION = 2
+
+# Values of the files.tested_status column
+# (files without any region-tagged methods have a NULL status)
+ALL_TESTED = 'all'
+SOME_TESTED = 'some'
+NOT_TESTED = 'none'
+
+# Values of the tags.status column
+DETECTED = 'detected'
+UNDETECTED = 'undetected'
+IGNORED = 'ignored'
+
+_SCHEMA = """
+CREATE TABLE metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    tested_status TEXT
+);
+CREATE INDEX files_by_status ON files (tested_status, path);
+
+CREATE TABLE snippets (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    name TEXT NOT NULL,
+    class_name TEXT,
+    method_name TEXT,
+    start_line INTEGER NOT NULL,
+    end_line INTEGER NOT NULL,
+    parser TEXT NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE INDEX snippets_by_file ON snippets (file_id);
+CREATE INDEX snippets_by_fingerprint ON snippets (fingerprint);
+
+CREATE TABLE tags (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL
+);
+
+CREATE TABLE tests (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    UNIQUE (name, path)
+);
+
+CREATE TABLE snippet_tags (
+    tag_id INTEGER NOT NULL REFERENCES tags (id),
+    snippet_id INTEGER NOT NULL REFERENCES snippets (id),
+    PRIMARY KEY (tag_id, snippet_id)
+) WITHOUT ROWID;
+CREATE INDEX snippet_tags_by_snippet ON snippet_tags (snippet_id, tag_id);
+
+CREATE TABLE snippet_tests (
+    snippet_id INTEGER NOT NULL REFERENCES snippets (id),
+    test_id INTEGER NOT NULL REFERENCES tests (id),
+    PRIMARY KEY (snippet_id, test_id)
+) WITHOUT ROWID;
+CREATE INDEX snippet_tests_by_test ON snippet_tests (test_id, snippet_id);
+"""
+
+
+def get_snippet_fingerprint(
+    source_path: str,
+    name: str,
+    region_tags: Iterable[str],
+    test_methods: Iterable[Tuple[str, str]]
+) -> str:
+    """Compute a hash of the parts of a snippet that analysis reports on
+
+    Line numbers aren't included, so moving a snippet within its source
+    file doesn't change its fingerprint.
+
+    Args:
+        source_path: the snippet's source file (relative to the root
+                     directory)
+        name: the snippet's name
+        region_tags: the snippet's region tags
+        test_methods: the snippet's (test file, test name) tuples, with test
+                      files relative to the root directory
+
+    Returns:
+        A hex digest identifying the snippet's contents
+    """
+    fingerprint_json = json.dumps([
+        source_path,
+        name,
+        sorted(set(region_tags)),
+        sorted(set(tuple(test) for test in test_methods))
+    ])
+
+    return hashlib.sha256(fingerprint_json.encode('utf-8')).hexdigest()
+
+
+def _get_tested_status(methods: List[pdd.PolyglotDriftData]) -> Optional[str]:
+    """Classify a source file by how many of its snippet methods are tested
+
+    (This uses the same rules as the list-source-files command.)
+
+    Args:
+        methods: the source file's snippet methods
+
+    Returns:
+        One of {ALL_TESTED, SOME_TESTED, NOT_TESTED}, or None if the file
+        has no region-tagged methods
+    """
+    tagged_methods = [method for method in methods if method.region_tags]
+    if not tagged_methods:
+        return None
+
+    tested_count = sum(1 for method in tagged_methods if method.test_methods)
+    if tested_count == len(tagged_methods):
+        return ALL_TESTED
+    if tested_count:
+        return SOME_TESTED
+
+    return NOT_TESTED
+
+
+def _get_tag_statuses(
+    grep_tags: Set[str],
+    source_tags: Set[str],
+    ignored_tags: Set[str],
+    source_methods: List[pdd.PolyglotDriftData]
+) -> Dict[str, str]:
+    tag_statuses = {tag: UNDETECTED for tag in grep_tags}
+    tag_statuses.update({tag: IGNORED for tag in ignored_tags})
+
+    # Tags can be both detected *and* ignored via .drift-data.yml
+    # (validate-yaml warns about this), so detection takes priority
+    for method in source_methods:
+        tag_statuses.update({tag: DETECTED for tag in method.region_tags})
+    tag_statuses.update({tag: DETECTED for tag in source_tags})
+
+    return tag_statuses
+
+
+def _insert_snippet_data(
+    connection: sqlite3.Connection,
+    root_dir: str,
+    grep_tags: Set[str],
+    source_tags: Set[str],
+    ignored_tags: Set[str],
+    source_methods: List[pdd.PolyglotDriftData]
+) -> None:
+    def _relpath(file_path: str) -> str:
+        return os.path.relpath(file_path, root_dir)
+
+    file_methods: Dict[str, List[pdd.PolyglotDriftData]] = {}
+    for method in source_methods:
+        file_methods.setdefault(method.source_path, []).append(method)
+
+    file_ids = {file_path: idx for idx, file_path
+                in enumerate(sorted(file_methods), 1)}
+    connection.executemany(
+        'INSERT INTO files (id, path, tested_status) VALUES (?, ?, ?)',
+        [(file_id, _relpath(file_path),
+          _get_tested_status(file_methods[file_path]))
+         for file_path, file_id in file_ids.items()])
+
+    tag_statuses = _get_tag_statuses(
+        grep_tags, source_tags, ignored_tags, source_methods)
+    tag_ids = {tag: idx for idx, tag in enumerate(sorted(tag_statuses), 1)}
+    connection.executemany(
+        'INSERT INTO tags (id, name, status) VALUES (?, ?, ?)',
+        [(tag_id, tag, tag_statuses[tag]) for tag, tag_id in tag_ids.items()])
+
+    test_ids: Dict[Tuple[str, str], int] = {}
+    snippet_rows = []
+    snippet_tag_rows = []
+    snippet_test_rows = []
+    for snippet_id, method in enumerate(source_methods, 1):
+        tests = {(_relpath(test_path), test_name) for test_path, test_name
+                 in yaml_utils.get_method_tests(method)}
+
+        snippet_rows.append((
+            snippet_id,
+            file_ids[method.source_path],
+            method.name,
+            method.class_name,
+            method.method_name,
+            method.start_line,
+            method.end_line,
+            method.parser,
+            get_snippet_fingerprint(
+                _relpath(method.source_path),
+                method.name,
+                method.region_tags,
+                tests)))
+
+        snippet_tag_rows += [(tag_ids[tag], snippet_id)
+                             for tag in set(method.region_tags)]
+
+        for test_path, test_name in tests:
+            test_id = test_ids.setdefault(
+                (test_name, test_path), len(test_ids) + 1)
+            snippet_test_rows.append((snippet_id, test_id))
+
+    connection.executemany(
+        'INSERT INTO snippets (id, file_id, name, class_name, method_name, '
+        'start_line, end_line, parser, fingerprint) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        snippet_rows)
+    connection.executemany(
+        'INSERT INTO tests (id, name, path) VALUES (?, ?, ?)',
+        [(test_id, name, test_path)
+         for (name, test_path), test_id in test_ids.items()])
+    connection.executemany(
+        'INSERT INTO snippet_tags (tag_id, snippet_id) VALUES (?, ?)',
+        snippet_tag_rows)
+    connection.executemany(
+        'INSERT INTO snippet_tests (snippet_id, test_id) VALUES (?, ?)',
+        snippet_test_rows)
+
+
+def _write_snippet_db(
+    connection: sqlite3.Connection,
+    root_dir: str,
+    grep_tags: Set[str],
+    source_tags: Set[str],
+    ignored_tags: Set[str],
+    source_methods: List[pdd.PolyglotDriftData]
+) -> None:
+    connection.executescript(_SCHEMA)
+    with connection:
+        connection.execute(
+            'INSERT INTO metadata (key, value) VALUES (?, ?)',
+            ('schema_version', str(SCHEMA_VERSION)))
+        _insert_snippet_data(
+            connection, root_dir, grep_tags, source_tags, ignored_tags,
+            source_methods)
+
+
+def create_snippet_db(
+    root_dir: str,
+    grep_tags: Set[str],
+    source_tags: Set[str],
+    ignored_tags: Set[str],
+    source_methods: List[pdd.PolyglotDriftData]
+) -> sqlite3.Connection:
+    """Store analyzed snippet data in an in-memory SQLite database
+
+    This is useful for comparing freshly-analyzed snippet data with data
+    stored by export_snippet_db, as both can be queried in the same way.
+
+    Args:
+        root_dir: the analyzed root directory (which stored paths are
+                  relative to)
+        grep_tags: tags found (via grep/text search) in the root directory
+        source_tags: tags detected by the AST parser in the root directory
+        ignored_tags: tags ignored due to constants or .drift-data.yml files
+        source_methods: snippet methods with their tests and YAML data
+                        attached (see analyze.SnippetAnalysis)
+
+    Returns:
+        A connection to the in-memory database
+    """
+    connection = sqlite3.connect(':memory:')
+    _write_snippet_db(
+        connection, root_dir, grep_tags, source_tags, ignored_tags,
+        source_methods)
+
+    return connection
+
+
+def export_snippet_db(
+    db_path: str,
+    root_dir: str,
+    grep_tags: Set[str],
+    source_tags: Set[str],
+    ignored_tags: Set[str],
+    source_methods: List[pdd.PolyglotDriftData]
+) -> None:
+    """Write analyzed snippet data to a SQLite database file
+
+    The database is written to a temporary file that then replaces db_path,
+    so concurrent readers never see a partially-written database.
+
+    Args:
+        db_path: the path of the database file to (over)write
+        root_dir: the analyzed root directory (which stored paths are
+                  relative to)
+        grep_tags: tags found (via grep/text search) in the root directory
+        source_tags: tags detected by the AST parser in the root directory
+        ignored_tags: tags ignored due to constants or .drift-data.yml files
+        source_methods: snippet methods with their tests and YAML data
+                        attached (see analyze.SnippetAnalysis)
+    """
+    temp_path = f'{db_path}.{uuid.uuid4().hex}.tmp'
+
+    try:
+        connection = sqlite3.connect(temp_path)
+        try:
+            _write_snippet_db(
+                connection, root_dir, grep_tags, source_tags, ignored_tags,
+                source_methods)
+        finally:
+            connection.close()
+
+        os.replace(temp_path, db_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def open_snippet_db(db_path: str) -> sqlite3.Connection:
+    """Open a snippet database (created by export_snippet_db) for reading
+
+    Args:
+        db_path: the path of the database file
+
+    Raises:
+        ValueError: if the file doesn't exist, or uses a different schema
+
+    Returns:
+        A read-only connection to the database
+    """
+    if not os.path.isfile(db_path):
+        raise ValueError(
+            f'Snippet database {db_path} not found! '
+            'Try running export-snippet-db first?')
+
+    # Read-only connections never create (or modify) database files
+    connection = sqlite3.connect(
+        f'file:{os.path.abspath(db_path)}?mode=ro', uri=True)
+
+    version_row = connection.execute(
+        'SELECT value FROM metadata WHERE key = ?',
+        ('schema_version',)).fetchone()
+    if not version_row or int(version_row[0]) != SCHEMA_VERSION:
+        connection.close()
+        raise ValueError(
+            f'Snippet database {db_path} uses an unsupported format. '
+            'Try re-running export-snippet-db?')
+
+    return connection
+
+
+def get_tests_for_tag(
+    connection: sqlite3.Connection,
+    tag: str
+) -> List[Tuple[str, str]]:
+    """List the tests that cover a region tag
+
+    Args:
+        connection: a snippet database connection
+        tag: the region tag to look up
+
+    Returns:
+        Sorted (test path, test name) tuples
+    """
+    return connection.execute(
+        'SELECT DISTINCT tests.path, tests.name FROM tags '
+        'JOIN snippet_tags ON snippet_tags.tag_id = tags.id '
+        'JOIN snippet_tests '
+        'ON snippet_tests.snippet_id = snippet_tags.snippet_id '
+        'JOIN tests ON tests.id = snippet_tests.test_id '
+        'WHERE tags.name = ? '
+        'ORDER BY tests.path, tests.name',
+        (tag,)).fetchall()
+
+
+def get_tags_for_test(
+    connection: sqlite3.Connection,
+    test_name: str,
+    test_path: Optional[str] = None
+) -> List[str]:
+    """List the region tags that a test covers
+
+    Args:
+        connection: a snippet database connection
+        test_name: the name of the test method
+        test_path: (Optional) the test's file path, relative to the root
+                   directory. If omitted, every test named test_name is
+                   included.
+
+    Returns:
+        A sorted list of region tags
+    """
+    query = (
+        'SELECT DISTINCT tags.name FROM tests '
+        'JOIN snippet_tests ON snippet_tests.test_id = tests.id '
+        'JOIN snippet_tags '
+        'ON snippet_tags.snippet_id = snippet_tests.snippet_id '
+        'JOIN tags ON tags.id = snippet_tags.tag_id '
+        'WHERE tests.name = ?')
+    params: Tuple[str, ...] = (test_name,)
+
+    if test_path is not None:
+        query += ' AND tests.path = ?'
+        params += (os.path.normpath(test_path),)
+
+    return [row[0] for row in
+            connection.execute(query + ' ORDER BY tags.name', params)]
+
+
+def get_untested_files(
+    connection: sqlite3.Connection,
+    directory: str = ''
+) -> List[str]:
+    """List the source files (within a directory) with no tested snippets
+
+    Args:
+        connection: a snippet database connection
+        directory: (Optional) a directory path, relative to the root
+                   directory. If omitted, every source file is considered.
+
+    Returns:
+        A sorted list of source file paths, relative to the root directory
+    """
+    directory = os.path.normpath(directory) if directory else os.curdir
+    if directory == os.curdir:
+        return [row[0] for row in connection.execute(
+            'SELECT path FROM files WHERE tested_status = ? ORDER BY path',
+            (NOT_TESTED,))]
+
+    # Paths within a directory sort between "<dir>/" and "<dir>0"
+    # (since "0" follows "/"), so they can be found with a range scan
+    prefix = directory.rstrip(os.sep) + os.sep
+    upper_bound = prefix[:-1] + chr(ord(os.sep) + 1)
+
+    return [row[0] for row in connection.execute(
+        'SELECT path FROM files WHERE tested_status = ? '
+        'AND path >= ? AND path < ? ORDER BY path',
+        (NOT_TESTED, prefix, upper_bound))]
@@ -0,0 +1,138 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import unittest
+
+from ast_parser.core import analyze, snippet_db
+from ast_parser.core.drift_data_test_utils import ROOT_DIR
+from ast_parser.core.drift_data_test_utils import create_named_method
+
+import pytest
+
+
+_TEST_DIR = os.path.join(
+    os.path.dirname(__file__),
+    'test_data/parser'
+)
+
+
+class SnippetDbTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _db(self, tmpdir):
+        source_methods = [
+            create_named_method(
+                'a/main.py', 'tested', ['tag_a', 'shared'],
+                [('a/main_test.py', 'test_a')]),
+            create_named_method('a/main.py', 'untested', ['tag_b']),
+            create_named_method('a/other.py', 'untested', ['tag_c']),
+            create_named_method('ab/main.py', 'untested', ['tag_d']),
+            create_named_method(
+                'b/main.py', 'tested', ['shared'],
+                [('b/main_test.py', 'test_a')]),
+        ]
+
+        self.db_path = os.path.join(tmpdir, snippet_db.DB_FILE_NAME)
+        snippet_db.export_snippet_db(
+            self.db_path,
+            ROOT_DIR,
+            {'tag_a', 'tag_b', 'tag_c', 'tag_d', 'shared', 'undetected'},
+            {'tag_a', 'tag_b', 'tag_c', 'tag_d', 'shared'},
+            {'ignored'},
+            source_methods)
+
+        self.connection = snippet_db.open_snippet_db(self.db_path)
+        yield
+        self.connection.close()
+
+    def test_gets_tests_for_tag(self):
+        assert snippet_db.get_tests_for_tag(self.connection, 'shared') == [
+            ('a/main_test.py', 'test_a'), ('b/main_test.py', 'test_a')]
+        assert snippet_db.get_tests_for_tag(self.connection, 'tag_b') == []
+
+    def test_gets_tags_for_test(self):
+        assert snippet_db.get_tags_for_test(self.connection, 'test_a') == [
+            'shared', 'tag_a']
+        assert snippet_db.get_tags_for_test(
+            self.connection, 'test_a', 'b/main_test.py') == ['shared']
+
+    def test_gets_untested_files(self):
+        assert snippet_db.get_untested_files(self.connection) == [
+            'a/other.py', 'ab/main.py']
+
+    def test_gets_untested_files_within_directory(self):
+        assert snippet_db.get_untested_files(self.connection, 'a') == [
+            'a/other.py']
+        assert snippet_db.get_untested_files(self.connection, 'a/') == [
+            'a/other.py']
+
+    def test_stores_file_tested_status(self):
+        statuses = dict(self.connection.execute(
+            'SELECT path, tested_status FROM files'))
+
+        assert statuses['a/main.py'] == snippet_db.SOME_TESTED
+        assert statuses['b/main.py'] == snippet_db.ALL_TESTED
+        assert statuses['a/other.py'] == snippet_db.NOT_TESTED
+
+    def test_stores_tag_status(self):
+        statuses = dict(self.connection.execute(
+            'SELECT name, status FROM tags'))
+
+        assert statuses['shared'] == snippet_db.DETECTED
+        assert statuses['undetected'] == snippet_db.UNDETECTED
+        assert statuses['ignored'] == snippet_db.IGNORED
+
+    def test_connections_are_read_only(self):
+        with pytest.raises(Exception):
+            self.connection.execute('DELETE FROM tags')
+
+
+class OpenSnippetDbTests(unittest.TestCase):
+    def test_errors_on_missing_file(self):
+        missing_path = os.path.join(_TEST_DIR, snippet_db.DB_FILE_NAME)
+
+        with pytest.raises(ValueError, match='export-snippet-db'):
+            snippet_db.open_snippet_db(missing_path)
+
+        assert not os.path.exists(missing_path)
+
+
+class ExportAnalysisTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _tmpdir(self, tmpdir):
+        self.tmpdir = tmpdir
+
+    def test_exports_analyzed_directory(self):
+        analysis = analyze.SnippetAnalysis(
+            os.path.join(_TEST_DIR, 'polyglot_snippet_data.json'),
+            _TEST_DIR
+        )
+
+        db_path = os.path.join(self.tmpdir, snippet_db.DB_FILE_NAME)
+        snippet_db.export_snippet_db(
+            db_path,
+            _TEST_DIR,
+            analysis.grep_tags,
+            analysis.source_tags,
+            analysis.ignored_tags,
+            analysis.source_methods)
+
+        connection = snippet_db.open_snippet_db(db_path)
+        try:
+            tests = snippet_db.get_tests_for_tag(connection, 'not_main')
+        finally:
+            connection.close()
+
+        assert tests == [('edge_cases/edge_cases_test.py', 'test_not_main')]
@@ -0,0 +1,218 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file aggregates the results of many XUnit reports (e.g. from a night of
+test runs) into a pass/fail status for each region tag.
+"""
+
+import collections
+import concurrent.futures
+import contextlib
+import xml.etree.ElementTree as etree
+from typing import Counter, Dict, FrozenSet, Iterable, List, NamedTuple
+from typing import Optional, Set
+
+from . import polyglot_drift_data as pdd
+from . import xunit_utils, yaml_utils
+
+
+# Region tag statuses
+PASSING = 'passing'
+FAILING = 'failing'
+FLAKY = 'flaky'
+SKIPPED = 'skipped'
+
+# The test keys to count outcomes for (in each worker process)
+_worker_test_keys: FrozenSet[xunit_utils.XUnitTestKey] = frozenset()
+
+
+class TagStatus(NamedTuple):
+    # One of PASSING, FAILING, FLAKY or SKIPPED
+    status: str
+
+    # A map from test case outcomes (see xunit_utils) to their counts,
+    # across every test of the region tag
+    outcomes: Counter[str]
+
+
+class AggregatedStatuses(NamedTuple):
+    # A map from region tags (with at least one test result) to their
+    # statuses
+    tag_statuses: Dict[str, TagStatus]
+
+    # The paths of reports that couldn't be parsed (e.g. truncated reports
+    # from crashed test runs), and so were skipped
+    skipped_reports: List[str]
+
+
+def get_test_tag_index(
+    source_methods: Iterable[pdd.PolyglotDriftData]
+) -> Dict[xunit_utils.XUnitTestKey, Set[str]]:
+    """Map XUnit test keys to the region tags their tests cover
+
+    This is the reverse of the snippet-to-test mapping, keyed the same way
+    inject_snippet_mapping matches XUnit test cases.
+
+    Args:
+        source_methods: snippet methods with their tests attached (see
+                        analyze.SnippetAnalysis.source_methods)
+
+    Returns:
+        A map from (module name, test name) keys to region tag sets
+    """
+    test_tags: Dict[xunit_utils.XUnitTestKey, Set[str]] = {}
+
+    for method in source_methods:
+        for test in yaml_utils.get_method_tests(method):
+            test_tags.setdefault(
+                xunit_utils.get_test_method_key(test), set()
+            ).update(method.region_tags)
+
+    return test_tags
+
+
+def _init_worker(test_keys: FrozenSet[xunit_utils.XUnitTestKey]) -> None:
+    global _worker_test_keys
+    _worker_test_keys = test_keys
+
+
+def _count_report_outcomes(
+    xunit_path: str
+) -> Optional[Dict[xunit_utils.XUnitTestKey, Counter[str]]]:
+    """Count the outcomes of an XUnit report's (known) tests
+
+    Args:
+        xunit_path: the path of an XUnit report
+
+    Returns:
+        A map from test keys to their outcome counts, or None if the report
+        couldn't be parsed. (Tests that aren't in _worker_test_keys, and
+        test cases without a class name, are omitted.)
+    """
+    outcomes: Dict[xunit_utils.XUnitTestKey, Counter[str]] = {}
+
+    try:
+        for testcase in xunit_utils.iter_testcases(xunit_path):
+            try:
+                test_key = xunit_utils.get_xunit_test_key(testcase.attrib)
+            except (KeyError, IndexError):
+                continue
+
+            if test_key in _worker_test_keys:
+                outcomes.setdefault(test_key, collections.Counter())[
+                    xunit_utils.get_testcase_outcome(testcase)] += 1
+    except etree.ParseError:
+        return None
+
+    return outcomes
+
+
+def _get_status(test_outcomes: List[Counter[str]]) -> str:
+    """Get the status of a region tag from the outcomes of its tests
+
+    A region tag is flaky if any of its tests both passed and failed (or
+    passed after being re-run), and failing if any of its tests failed.
+
+    Args:
+        test_outcomes: the outcome counts of each of the region tag's tests
+
+    Returns:
+        One of PASSING, FAILING, FLAKY or SKIPPED
+    """
+    if any(outcomes[xunit_utils.FLAKY] or (
+           outcomes[xunit_utils.PASSED] and outcomes[xunit_utils.FAILED])
+           for outcomes in test_outcomes):
+        return FLAKY
+    if any(outcomes[xunit_utils.FAILED] for outcomes in test_outcomes):
+        return FAILING
+    if any(outcomes[xunit_utils.PASSED] for outcomes in test_outcomes):
+        return PASSING
+
+    return SKIPPED
+
+
+def aggregate_tag_statuses(
+    source_methods: Iterable[pdd.PolyglotDriftData],
+    xunit_paths: List[str],
+    max_workers: Optional[int] = None
+) -> AggregatedStatuses:
+    """Aggregate the results of XUnit reports by region tag
+
+    Reports are streamed (see xunit_utils.iter_testcases()) by a pool of
+    worker processes, each of which only returns per-test outcome counts.
+    Those counts are then combined by region tag. Reports that can't be
+    parsed (such as truncated ones) are skipped, rather than aborting the
+    aggregation.
+
+    Args:
+        source_methods: snippet methods with their tests attached (see
+                        analyze.SnippetAnalysis.source_methods)
+        xunit_paths: the paths of the XUnit reports to aggregate
+        max_workers: (Optional) the maximum number of worker processes.
+                     Defaults to the number of CPUs.
+
+    Returns:
+        The statuses of region tags (with at least one test result), and
+        the paths of any skipped reports
+    """
+    test_tags = get_test_tag_index(source_methods)
+    test_keys = frozenset(test_tags)
+
+    test_outcomes: Dict[xunit_utils.XUnitTestKey, Counter[str]] = {}
+    skipped_reports = []
+
+    with contextlib.ExitStack() as stack:
+        report_outcomes: Iterable[
+            Optional[Dict[xunit_utils.XUnitTestKey, Counter[str]]]]
+
+        if len(xunit_paths) <= 1 or max_workers == 1:
+            # Skip the overhead of a process pool
+            _init_worker(test_keys)
+            report_outcomes = map(_count_report_outcomes, xunit_paths)
+        else:
+            executor = stack.enter_context(
+                concurrent.futures.ProcessPoolExecutor(
+                    max_workers,
+                    initializer=_init_worker,
+                    initargs=(test_keys,)))
+            report_outcomes = executor.map(
+                _count_report_outcomes, xunit_paths, chunksize=8)
+
+        # Each report's results are merged (and released) as soon as
+        # they arrive, rather than after every report is processed
+        for xunit_path, outcomes in zip(xunit_paths, report_outcomes):
+            if outcomes is None:
+                skipped_reports.append(xunit_path)
+                continue
+
+            for test_key, counts in outcomes.items():
+                test_outcomes.setdefault(
+                    test_key, collections.Counter()).update(counts)
+
+    tag_outcomes: Dict[str, List[Counter[str]]] = {}
+    for test_key, counts in test_outcomes.items():
+        for tag in test_tags[test_key]:
+            tag_outcomes.setdefault(tag, []).append(counts)
+
+    tag_statuses = {}
+    for tag, outcomes_list in tag_outcomes.items():
+        total_outcomes: Counter[str] = collections.Counter()
+        for counts in outcomes_list:
+            total_outcomes.update(counts)
+
+        tag_statuses[tag] = TagStatus(
+            _get_status(outcomes_list), total_outcomes)
+
+    return AggregatedStatuses(tag_statuses, skipped_reports)
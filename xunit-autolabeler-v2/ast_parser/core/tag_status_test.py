@@ -0,0 +1,116 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import unittest
+
+from ast_parser.core import tag_status, xunit_utils
+from ast_parser.core.drift_data_test_utils import create_method
+
+import pytest
+
+
+_SOURCE_METHODS = [
+    create_method(['tag_a'], ['test_a']),
+    create_method(['tag_b'], ['test_a', 'test_b']),
+    create_method(['tag_c'], ['test_c'])
+]
+
+
+class AggregateTagStatusesTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _tmpdir(self, tmpdir):
+        self.tmpdir = tmpdir
+        self.report_count = 0
+
+    def _write_xunit(self, **outcomes):
+        testcases = []
+        for test_name, outcome in outcomes.items():
+            child = f'<{outcome}/>' if outcome else ''
+            testcases.append(
+                f'<testcase classname="main_test" name="{test_name}">'
+                f'{child}</testcase>')
+
+        self.report_count += 1
+        xunit_path = os.path.join(self.tmpdir, f'{self.report_count}.xml')
+        with open(xunit_path, 'w') as file:
+            file.write('<testsuites><testsuite>' + ''.join(testcases) +
+                       '</testsuite></testsuites>')
+
+        return xunit_path
+
+    def test_combines_outcomes_by_tag(self):
+        xunit_paths = [
+            self._write_xunit(test_a=None, test_b='failure'),
+            self._write_xunit(test_a=None, test_b='failure', test_c='skipped')
+        ]
+
+        statuses, _ = tag_status.aggregate_tag_statuses(
+            _SOURCE_METHODS, xunit_paths, max_workers=1)
+
+        assert statuses['tag_a'].status == tag_status.PASSING
+        assert statuses['tag_b'].status == tag_status.FAILING
+        assert statuses['tag_c'].status == tag_status.SKIPPED
+        assert statuses['tag_b'].outcomes == {
+            xunit_utils.PASSED: 2, xunit_utils.FAILED: 2}
+
+    def test_detects_flaky_tests(self):
+        xunit_paths = [
+            self._write_xunit(test_a=None, test_c='flakyFailure'),
+            self._write_xunit(test_a='error')
+        ]
+
+        statuses, _ = tag_status.aggregate_tag_statuses(
+            _SOURCE_METHODS, xunit_paths, max_workers=1)
+
+        assert statuses['tag_a'].status == tag_status.FLAKY
+        assert statuses['tag_c'].status == tag_status.FLAKY
+
+    def test_ignores_unknown_tests(self):
+        statuses, _ = tag_status.aggregate_tag_statuses(
+            _SOURCE_METHODS, [self._write_xunit(test_other=None)])
+
+        assert statuses == {}
+
+    def test_skips_unreadable_reports_and_unkeyed_testcases(self):
+        xunit_paths = [self._write_xunit(test_a=None)]
+
+        truncated_path = self._write_xunit(test_a='failure')
+        with open(truncated_path, 'r+') as file:
+            file.truncate(60)
+        xunit_paths.append(truncated_path)
+
+        unkeyed_path = os.path.join(self.tmpdir, 'unkeyed.xml')
+        with open(unkeyed_path, 'w') as file:
+            file.write('<testsuite><testcase name="test_a"/></testsuite>')
+        xunit_paths.append(unkeyed_path)
+
+        statuses, skipped_reports = tag_status.aggregate_tag_statuses(
+            _SOURCE_METHODS, xunit_paths, max_workers=1)
+
+        assert statuses['tag_a'].outcomes == {xunit_utils.PASSED: 1}
+        assert skipped_reports == [truncated_path]
+
+    def test_processes_reports_in_parallel(self):
+        xunit_paths = [self._write_xunit(test_a=None, test_b='failure')
+                       for _ in range(10)]
+
+        parallel_statuses, _ = tag_status.aggregate_tag_statuses(
+            _SOURCE_METHODS, xunit_paths, max_workers=2)
+        serial_statuses, _ = tag_status.aggregate_tag_statuses(
+            _SOURCE_METHODS, xunit_paths, max_workers=1)
+
+        assert parallel_statuses == serial_statuses
+        assert parallel_statuses['tag_a'].outcomes == {xunit_utils.PASSED: 10}
@@ -0,0 +1,163 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file rewrites XUnit documents incrementally, as they are being written
+(e.g. by a long-running test suite, or to a pipe).
+"""
+
+import os
+import stat
+import time
+import xml.etree.ElementTree as etree
+from typing import (
+    Callable, Iterable, Iterator, List, Optional, Tuple, cast)
+from xml.sax.saxutils import quoteattr
+
+
+# Elements that contain test cases. (These are written as separate start and
+# end tags, while other elements are written once they're complete.)
+_CONTAINER_TAGS = ('testsuites', 'testsuite')
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def read_chunks(
+    fd: int,
+    poll_interval: float = 0.5,
+    idle_timeout: Optional[float] = None
+) -> Iterator[bytes]:
+    """Read a file descriptor's data as it becomes available
+
+    Pipes are read until they are closed. Regular files are assumed to still
+    be growing, so their (current) end is polled for new data.
+
+    Args:
+        fd: the file descriptor to read from
+        poll_interval: (Optional) the number of seconds to wait between
+                       checks for new data in a regular file
+        idle_timeout: (Optional) the number of seconds a regular file can go
+                      without growing before reading stops. If omitted,
+                      reading only stops once the caller stops iterating.
+
+    Returns:
+        An iterator of (non-empty) data chunks
+    """
+    is_regular_file = stat.S_ISREG(os.fstat(fd).st_mode)
+    last_read_time = time.monotonic()
+
+    while True:
+        chunk = os.read(fd, _CHUNK_SIZE)
+        if chunk:
+            last_read_time = time.monotonic()
+            yield chunk
+            continue
+
+        if not is_regular_file:
+            return  # Closed pipe
+
+        if idle_timeout is not None and \
+           time.monotonic() - last_read_time >= idle_timeout:
+            return
+
+        time.sleep(poll_interval)
+
+
+def _get_start_tag(elem: etree.Element) -> str:
+    attributes = ''.join(f' {name}={quoteattr(value)}'
+                         for name, value in elem.attrib.items())
+    return f'<{elem.tag}{attributes}>'
+
+
+def iter_annotated_xunit(
+    chunks: Iterable[bytes],
+    annotate_testcase: Callable[[etree.Element], None]
+) -> Iterator[str]:
+    """Annotate the test cases of an XUnit document as it is read
+
+    Each test case is annotated (and output) as soon as its element closes.
+    Test suites' start and end tags are output as they are read, so the
+    output is a well-formed XUnit document once the input is. If the input
+    ends early, any unclosed test suites are closed (and incomplete test
+    cases are dropped).
+
+    Args:
+        chunks: the XUnit document's data, in (arbitrarily-sized) chunks
+        annotate_testcase: a function that updates a <testcase> element
+
+    Raises:
+        ValueError: if the input is malformed. (The output is completed
+                    before this is raised.)
+
+    Returns:
+        An iterator of the output document's parts
+    """
+    parser: etree.XMLPullParser = etree.XMLPullParser(
+        events=('start', 'end'))
+
+    # The currently-open elements, and the (container) elements among them
+    # whose start tags have been output. Other elements whose parent is in
+    # open_containers are output (as a whole) once they close.
+    parents: List[etree.Element] = []
+    open_containers: List[etree.Element] = []
+
+    parse_error = None
+    root_closed = False
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+
+            # ('start' and 'end' events' data is always an element)
+            events = cast(Iterator[Tuple[str, etree.Element]],
+                          parser.read_events())
+            for event, elem in events:
+                if event == 'start':
+                    is_child = not parents or parents[-1] in open_containers
+                    if is_child and elem.tag in _CONTAINER_TAGS:
+                        open_containers.append(elem)
+                        yield _get_start_tag(elem)
+
+                    parents.append(elem)
+                    continue
+
+                parents.pop()
+                is_child = not parents or parents[-1] in open_containers
+
+                if open_containers and elem is open_containers[-1]:
+                    open_containers.pop()
+                    yield f'</{elem.tag}>'
+                elif is_child:
+                    if elem.tag == 'testcase':
+                        annotate_testcase(elem)
+
+                    elem.tail = None
+                    yield etree.tostring(elem, encoding='unicode')
+
+                # Discard elements once they've been output
+                if parents and is_child:
+                    parents[-1].remove(elem)
+
+                root_closed = not parents
+
+            # (Growing files are polled until their document is complete)
+            if root_closed:
+                break
+    except etree.ParseError as err:
+        parse_error = err
+
+    for elem in reversed(open_containers):
+        yield f'</{elem.tag}>'
+
+    if parse_error:
+        raise ValueError(f'Malformed XUnit input: {parse_error}')
@@ -0,0 +1,115 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import unittest
+import xml.etree.ElementTree as etree
+
+from ast_parser.core import xunit_stream
+
+import pytest
+
+
+def _annotate(testcase):
+    testcase.set('region_tags', testcase.attrib['name'].upper())
+
+
+class IterAnnotatedXUnitTests(unittest.TestCase):
+    def test_outputs_testcases_as_they_close(self):
+        chunks = [
+            b'<testsuites><testsuite name="a">',
+            b'<testcase name="test_a"><failure message="x"/>',
+            b'</testcase>\n<testcase name="test_b"',
+            b'/></testsuite></testsuites>'
+        ]
+        read_chunks = []
+
+        def _read_chunks():
+            for chunk in chunks:
+                read_chunks.append(chunk)
+                yield chunk
+
+        output = xunit_stream.iter_annotated_xunit(_read_chunks(), _annotate)
+
+        assert next(output) == '<testsuites>'
+        assert next(output) == '<testsuite name="a">'
+        assert next(output) == (
+            '<testcase name="test_a" region_tags="TEST_A">'
+            '<failure message="x" /></testcase>')
+        assert len(read_chunks) == 3
+
+        assert list(output) == [
+            '<testcase name="test_b" region_tags="TEST_B" />',
+            '</testsuite>',
+            '</testsuites>'
+        ]
+
+    def test_closes_truncated_documents(self):
+        output = ''.join(xunit_stream.iter_annotated_xunit([
+            b'<testsuites><testsuite>'
+            b'<properties><property name="a"/></properties>'
+            b'<testcase name="test_a"/><testcase name="test_b">'
+        ], _annotate))
+
+        assert output == (
+            '<testsuites><testsuite>'
+            '<properties><property name="a" /></properties>'
+            '<testcase name="test_a" region_tags="TEST_A" />'
+            '</testsuite></testsuites>')
+        etree.fromstring(output)
+
+    def test_completes_output_of_malformed_documents(self):
+        output = []
+
+        with pytest.raises(ValueError):
+            for part in xunit_stream.iter_annotated_xunit(
+                    [b'<testsuite><testcase name="test_a"/>', b'</x>'],
+                    _annotate):
+                output.append(part)
+
+        assert output[-1] == '</testsuite>'
+
+
+class ReadChunksTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _tmpdir(self, tmpdir):
+        self.tmpdir = tmpdir
+
+    def test_reads_pipes_until_closed(self):
+        read_fd, write_fd = os.pipe()
+        os.write(write_fd, b'<testsuite/>')
+        os.close(write_fd)
+
+        try:
+            assert b''.join(xunit_stream.read_chunks(read_fd)) == \
+                b'<testsuite/>'
+        finally:
+            os.close(read_fd)
+
+    def test_polls_growing_files(self):
+        xunit_path = os.path.join(self.tmpdir, 'a.xml')
+        with open(xunit_path, 'wb') as file:
+            file.write(b'<testsuite>')
+
+        with open(xunit_path, 'rb') as file:
+            chunks = xunit_stream.read_chunks(
+                file.fileno(), poll_interval=0.01, idle_timeout=0.5)
+
+            assert next(chunks) == b'<testsuite>'
+
+            with open(xunit_path, 'ab') as writer:
+                writer.write(b'</testsuite>')
+
+            assert list(chunks) == [b'</testsuite>']
@@ -0,0 +1,175 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file contains helpers for reading XUnit test reports, and for matching
+their test cases with the tests found by the AST parser.
+"""
+
+import os
+import xml.etree.ElementTree as etree
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple
+
+
+# Tests are matched with XUnit test cases by (module name, test name) keys
+XUnitTestKey = Tuple[str, str]
+
+# Test case outcomes
+PASSED = 'passed'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+FLAKY = 'flaky'
+
+# Child elements of failed test cases
+_FAILURE_TAGS = ('failure', 'error')
+
+# Child elements recording failed attempts of (eventually) passing test cases
+# (as written by e.g. Maven Surefire when re-running failed tests)
+_FLAKY_TAGS = ('flakyFailure', 'flakyError', 'rerunFailure', 'rerunError')
+
+
+def get_xunit_test_key(attrib: Mapping[str, str]) -> XUnitTestKey:
+    """Get the test key of an XUnit test case
+
+    Args:
+        attrib: the attributes of a <testcase> element
+
+    Returns:
+        A (module name, test name) tuple. (Class names beginning with "Test"
+        are skipped when finding the module name.)
+    """
+    class_parts = [part for part in attrib['classname'].split('.')
+                   if not part.startswith('Test')]
+    return (class_parts[-1], attrib['name'])
+
+
+def get_test_method_key(test: Tuple[str, str]) -> XUnitTestKey:
+    """Get the XUnit test key of a test detected by the AST parser
+
+    Args:
+        test: a (test path, test name) tuple
+
+    Returns:
+        A (module name, test name) tuple
+    """
+    test_path, test_name = test
+    return (os.path.splitext(os.path.basename(test_path))[0], test_name)
+
+
+def find_xunit_files(paths: Iterable[str]) -> List[str]:
+    """Find the XUnit reports within a list of files and directories
+
+    Args:
+        paths: paths to XUnit report files, or to directories that contain
+               them (recursively) as .xml files
+
+    Returns:
+        A list of XUnit report paths
+    """
+    xunit_paths = []
+    for xunit_path in paths:
+        if not os.path.isdir(xunit_path):
+            xunit_paths.append(xunit_path)
+            continue
+
+        for dir_path, dir_names, file_names in os.walk(xunit_path):
+            dir_names.sort()
+            xunit_paths += [os.path.join(dir_path, file_name)
+                            for file_name in sorted(file_names)
+                            if file_name.endswith('.xml')]
+
+    return xunit_paths
+
+
+def iter_testcases(xunit_path: str) -> Iterator[etree.Element]:
+    """Iterate over the <testcase> elements of an XUnit report
+
+    Reports are parsed incrementally, and elements are discarded once they
+    (and the caller) are done with them, so memory usage doesn't grow with
+    the size of a report.
+
+    Args:
+        xunit_path: the path of an XUnit report
+
+    Returns:
+        An iterator of <testcase> elements (including their children). Each
+        element is only valid until the next one is requested.
+    """
+    parents: List[etree.Element] = []
+
+    for event, elem in etree.iterparse(xunit_path, events=('start', 'end')):
+        if event == 'start':
+            parents.append(elem)
+            continue
+
+        parents.pop()
+        if elem.tag == 'testcase':
+            yield elem
+
+        # (A test case's children are kept until the test case is done)
+        if parents and parents[-1].tag != 'testcase':
+            parents[-1].remove(elem)
+
+
+def get_testcase_outcome(testcase: etree.Element) -> str:
+    """Get the outcome of an XUnit test case
+
+    Args:
+        testcase: a <testcase> element
+
+    Returns:
+        FAILED if the test failed (or errored), SKIPPED if it was skipped,
+        FLAKY if it passed after failing (and being re-run), or PASSED
+    """
+    child_tags = set(child.tag for child in testcase)
+
+    if child_tags.intersection(_FAILURE_TAGS):
+        return FAILED
+    if 'skipped' in child_tags:
+        return SKIPPED
+    if child_tags.intersection(_FLAKY_TAGS):
+        return FLAKY
+
+    return PASSED
+
+
+def read_test_durations(
+    xunit_paths: Iterable[str]
+) -> Dict[XUnitTestKey, float]:
+    """Read the test durations stored in XUnit reports
+
+    Args:
+        xunit_paths: the paths of the XUnit reports to read
+
+    Returns:
+        A map from test keys to their durations (in seconds). Tests found in
+        several reports are mapped to their mean duration. Test cases without
+        a (numeric) "time" attribute are skipped.
+    """
+    totals: Dict[XUnitTestKey, float] = {}
+    counts: Dict[XUnitTestKey, int] = {}
+
+    for xunit_path in xunit_paths:
+        for testcase in iter_testcases(xunit_path):
+            try:
+                duration = float(testcase.attrib['time'])
+                test_key = get_xunit_test_key(testcase.attrib)
+            except (KeyError, IndexError, ValueError):
+                continue
+
+            totals[test_key] = totals.get(test_key, 0) + duration
+            counts[test_key] = counts.get(test_key, 0) + 1
+
+    return {test_key: totals[test_key] / counts[test_key]
+            for test_key in totals}
@@ -0,0 +1,130 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import unittest
+
+from ast_parser.core import xunit_utils
+
+import pytest
+
+
+_TEST_DIR = os.path.join(
+    os.path.dirname(__file__),
+    'test_data/parser'
+)
+
+
+class GetTestKeyTests(unittest.TestCase):
+    def test_skips_test_class_names(self):
+        test_key = xunit_utils.get_xunit_test_key({
+            'classname': 'samples.main_test.TestMain',
+            'name': 'test_a'
+        })
+
+        assert test_key == ('main_test', 'test_a')
+
+    def test_matches_test_method_keys(self):
+        test_key = xunit_utils.get_test_method_key(
+            ('/repo/samples/main_test.py', 'test_a'))
+
+        assert test_key == ('main_test', 'test_a')
+
+
+class ReadTestDurationsTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _tmpdir(self, tmpdir):
+        self.tmpdir = tmpdir
+
+    def _write_xunit(self, name, testcases):
+        xunit_path = os.path.join(self.tmpdir, name)
+        with open(xunit_path, 'w') as file:
+            file.write(f'<testsuites><testsuite>{testcases}'
+                       '</testsuite></testsuites>')
+
+        return xunit_path
+
+    def test_reads_durations(self):
+        durations = xunit_utils.read_test_durations([
+            os.path.join(_TEST_DIR, 'edge_cases/xunit_example.xml')])
+
+        assert durations == {('edge_cases_test', 'test_not_main'): 0.002}
+
+    def test_averages_durations_across_reports(self):
+        testcase = ('<testcase classname="main_test" name="test_a" '
+                    'time="{}"/>')
+
+        durations = xunit_utils.read_test_durations([
+            self._write_xunit('a.xml', testcase.format(1)),
+            self._write_xunit('b.xml', testcase.format(3))
+        ])
+
+        assert durations == {('main_test', 'test_a'): 2.0}
+
+    def test_skips_testcases_without_times(self):
+        durations = xunit_utils.read_test_durations([self._write_xunit(
+            'a.xml',
+            '<testcase classname="main_test" name="test_a"/>'
+            '<testcase classname="main_test" name="test_b" time="?"/>')])
+
+        assert durations == {}
+
+
+class IterTestcasesTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _tmpdir(self, tmpdir):
+        self.tmpdir = tmpdir
+
+    def test_gets_testcase_outcomes(self):
+        xunit_path = os.path.join(self.tmpdir, 'a.xml')
+        with open(xunit_path, 'w') as file:
+            file.write(
+                '<testsuites><testsuite>'
+                '<testcase classname="main_test" name="test_pass"/>'
+                '<testcase classname="main_test" name="test_fail">'
+                '<failure/></testcase>'
+                '<testcase classname="main_test" name="test_error">'
+                '<error/></testcase>'
+                '<testcase classname="main_test" name="test_skip">'
+                '<skipped/></testcase>'
+                '<testcase classname="main_test" name="test_flaky">'
+                '<flakyFailure/><system-out/></testcase>'
+                '</testsuite></testsuites>')
+
+        outcomes = [(testcase.attrib['name'],
+                     xunit_utils.get_testcase_outcome(testcase))
+                    for testcase in xunit_utils.iter_testcases(xunit_path)]
+
+        assert outcomes == [
+            ('test_pass', xunit_utils.PASSED),
+            ('test_fail', xunit_utils.FAILED),
+            ('test_error', xunit_utils.FAILED),
+            ('test_skip', xunit_utils.SKIPPED),
+            ('test_flaky', xunit_utils.FLAKY)
+        ]
+
+    def test_finds_xunit_files_in_directories(self):
+        os.mkdir(os.path.join(self.tmpdir, 'b'))
+        for name in ['a.xml', 'b/c.xml', 'b/d.txt']:
+            with open(os.path.join(self.tmpdir, name), 'w') as file:
+                file.write('')
+
+        assert xunit_utils.find_xunit_files(
+            [str(self.tmpdir), '/other.xml']
+        ) == [
+            os.path.join(self.tmpdir, 'a.xml'),
+            os.path.join(self.tmpdir, 'b/c.xml'),
+            '/other.xml'
+        ]
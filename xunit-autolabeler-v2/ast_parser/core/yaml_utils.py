@@ -12,18 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import os
-from typing import Any, Dict, List, Set, Tuple
+from typing import FrozenSet, Iterable, List, Mapping, Set, Tuple
 
-from ast_parser.core import constants, polyglot_drift_data
-from ast_parser.lib import file_utils
-
-import yaml
+from ast_parser.core import polyglot_drift_data
+from ast_parser.core.drift_yaml_store import DriftYamlStore
 
 
 def _handle_overwrites(
     source_methods_json: List[polyglot_drift_data.PolyglotDriftData],
-    root_dir: str
+    yaml_store: DriftYamlStore
 ) -> None:
     """Handle overwrites in .drift-data.yml files
 
@@ -35,27 +32,15 @@ def _handle_overwrites(
 
     Args:
         source_methods_json: A list of language-agnostic snippet methods
-        root_dir: A path to the directory source_methods_json was created from
+        yaml_store: The parsed .drift-data.yml files of the directory
+                    source_methods_json was created from
 
     Modifies:
         source_methods_json: Clears test_methods attribute on
                              source_methods_json entries for which an
                              'overwrite' YAML keyword exists
     """
-    yaml_paths = file_utils.get_drift_yaml_files(root_dir)
-
-    overwritten_tags = set()
-
-    for path in yaml_paths:
-        with open(path, 'r') as file:
-            yaml_contents = '\n'.join(file.readlines())
-            parsed_yaml = yaml.safe_load(yaml_contents)
-
-            for tag in parsed_yaml.keys():
-                yaml_entry = parsed_yaml[tag]
-                if 'overwrite' in yaml_entry:
-                    if yaml_entry.get('overwrite', False) is True:
-                        overwritten_tags.add(tag)
+    overwritten_tags = yaml_store.overwritten_tags
 
     for idx, method in enumerate(source_methods_json):
         if set(method.region_tags).intersection(overwritten_tags):
@@ -63,19 +48,20 @@ def _handle_overwrites(
             # (named-tuples themselves are immutable)
             # so we must update the underlying array
             source_methods_json[idx] = \
-                method._replace(test_methods=[])
+                method._replace(test_methods=())
 
 
 def _handle_additions_clause(
     source_methods_json: List[polyglot_drift_data.PolyglotDriftData],
-    root_dir: str
+    yaml_store: DriftYamlStore
 ) -> None:
     """Handle additions clause in .drift-data.yml files
 
     The "additions" clause is used to specify lists of region tags
     that correspond to the same set of tests. If a given snippet
     method contains one of these region tags, it will be deemed to
-    contain *all* of them!
+    contain *all* of them! (Additions groups that share a region tag
+    are merged, so this relationship is transitive.)
 
     This is useful for multi-region-tag samples like the following:
      - my_sample_setup
@@ -85,50 +71,79 @@ def _handle_additions_clause(
 
     Args:
         source_methods_json: A list of language-agnostic snippet methods
-        root_dir: A path to the directory source_methods_json was created from
+        yaml_store: The parsed .drift-data.yml files of the directory
+                    source_methods_json was created from
 
     Modifies:
         source_methods_json: Adds grouped region tags to source_methods_json
                              entries with corresponding 'additions' YAML
                              keyword exists
     """
-    yaml_paths = file_utils.get_drift_yaml_files(root_dir)
+    additions_index = yaml_store.additions_index
+
+    for idx, method in enumerate(source_methods_json):
+        added_groups = [additions_index[tag] for tag in method.region_tags
+                        if tag in additions_index]
+
+        if added_groups:
+            new_method_tags = tuple(
+                set(method.region_tags).union(*added_groups))
+
+            # _replace() creates a *copy*
+            # (named-tuples themselves are immutable)
+            # so we must update the underlying array
+            source_methods_json[idx] = \
+                method._replace(region_tags=new_method_tags)
 
-    for path in yaml_paths:
-        with open(path, 'r') as file:
-            yaml_contents = '\n'.join(file.readlines())
-            parsed_yaml = yaml.safe_load(yaml_contents)
 
-            additions_tags = [key for key in parsed_yaml.keys() if
-                              key not in constants.RESERVED_YAML_KEYS]
+def add_additions_tags(
+    region_tags: Set[str],
+    additions_index: Mapping[str, FrozenSet[str]]
+) -> Set[str]:
+    """Expand a set of region tags with any "additions" groups it touches
 
-            for tag in additions_tags:
-                yaml_entry = parsed_yaml[tag]
-                if 'additions' in yaml_entry and \
-                   isinstance(yaml_entry['additions'], list):
+    This applies the "additions" clause to a set of region tags (rather than
+    to individual snippet methods). The result is equal to the union of the
+    methods' region tags after _handle_additions_clause() runs.
 
-                    added_tags = set(yaml_entry['additions'])
-                    added_tags.add(tag)
+    Args:
+        region_tags: A set of region tags
+        additions_index: A directory's merged additions groups
+                         (see DriftYamlStore.additions_index)
 
-                    for idx, method in enumerate(source_methods_json):
-                        method_tags = set(method.region_tags)
+    Returns:
+        A new set containing region_tags and any grouped tags added to it
+    """
+    return set(region_tags).union(
+        get_additions_tags(region_tags, additions_index))
 
-                        if added_tags.intersection(method_tags):
-                            new_method_tags = list(
-                                set(method.region_tags)
-                                .union(added_tags)
-                            )
-                            # _replace() creates a *copy*
-                            # (named-tuples themselves are immutable)
-                            # so we must update the underlying array
-                            source_methods_json[idx] = \
-                                method._replace(
-                                    region_tags=new_method_tags)
+
+def get_additions_tags(
+    region_tags: Iterable[str],
+    additions_index: Mapping[str, FrozenSet[str]]
+) -> Set[str]:
+    """Get the region tags of the "additions" groups a set of tags touches
+
+    Args:
+        region_tags: An iterable of region tags
+        additions_index: A directory's merged additions groups
+                         (see DriftYamlStore.additions_index)
+
+    Returns:
+        The region tags of every (merged) additions group containing one of
+        the given tags, or an empty set if there are none
+    """
+    additions_tags: Set[str] = set()
+    for tag in region_tags:
+        if tag in additions_index:
+            additions_tags.update(additions_index[tag])
+
+    return additions_tags
 
 
 def _handle_manually_specified_tests(
     source_methods_json: List[polyglot_drift_data.PolyglotDriftData],
-    root_dir: str
+    yaml_store: DriftYamlStore
 ) -> None:
     """Handle manually specified tests in .drift-data.yml files
 
@@ -143,7 +158,8 @@ def _handle_manually_specified_tests(
 
     Args:
         source_methods_json: A list of language-agnostic snippet methods
-        root_dir: A path to the directory source_methods_json was created from
+        yaml_store: The parsed .drift-data.yml files of the directory
+                    source_methods_json was created from
 
     Modifies:
         source_methods_json: Adds manually-specified test data to
@@ -151,73 +167,63 @@ def _handle_manually_specified_tests(
                              corresponding manual-test-specifying YAML
                              entry.
     """
+    test_tag_map = yaml_store.manual_tests
 
-    def _no_banned_subkeys(
-        yaml_entry: Dict[str, Any],
-        banned_keys: Set[str]
-    ) -> bool:
-        """Determine whether a given yaml entry has "banned" keys
-
-        (Banned keys cannot exist in a manually-specified test entry.)
-        """
-        return not set(yaml_entry.keys()).intersection(banned_keys)
-
-    yaml_paths = file_utils.get_drift_yaml_files(root_dir)
-
-    test_tag_map: Dict[str, List[Tuple[str, str]]] = {}
+    for method in source_methods_json:
+        for tag in method.region_tags:
+            if tag in test_tag_map and test_tag_map[tag]:
+                method.test_methods = (
+                    *method.test_methods, test_tag_map[tag])
 
-    for path in yaml_paths:
-        with open(path, 'r') as file:
-            yaml_dir = os.path.dirname(path)
-            yaml_contents = '\n'.join(file.readlines())
-            parsed_yaml = yaml.safe_load(yaml_contents)
 
-            # Manually specified tests cannot contain any keys in
-            # RESERVED_YAML_KEYS (except for "overwrite"), so filter
-            # out any yaml entries that *do* have these keys
-            banned_keys = set(constants.RESERVED_YAML_KEYS)
-            banned_keys.remove('overwrite')
+def get_method_tests(
+    method: polyglot_drift_data.PolyglotDriftData
+) -> List[Tuple[str, str]]:
+    """Get a snippet method's (test path, test name) tuples
 
-            manual_tags = [tag for tag in parsed_yaml.keys() if
-                           _no_banned_subkeys(parsed_yaml[tag], banned_keys)]
+    _handle_manually_specified_tests() adds each region tag's manually
+    specified tests to a method's test_methods as a single (nested) list.
+    This function flattens those lists.
 
-            for tag in manual_tags:
-                yaml_entry = parsed_yaml[tag]
-                test_tag_map[tag] = []
+    Args:
+        method: A language-agnostic snippet method
 
-                for test_rel_path in yaml_entry.keys():
-                    test_path = os.path.join(yaml_dir, test_rel_path)
-                    if test_path and os.path.exists(test_path):
-                        for test_name in yaml_entry[test_rel_path]:
-                            test_tag_map[tag].append((test_path, test_name))
+    Returns:
+        The method's tests, as (test path, test name) tuples
+    """
+    tests = []
+    for test in method.test_methods:
+        if test and isinstance(test[0], str):
+            tests.append((test[0], test[1]))
+        else:
+            tests += [(test_path, test_name)
+                      for test_path, test_name in test]
 
-    for method in source_methods_json:
-        for tag in method.region_tags:
-            if tag in test_tag_map and test_tag_map[tag]:
-                method.test_methods.append(test_tag_map[tag])
+    return tests
 
 
 def add_yaml_data_to_source_methods(
-    source_methods_json: List[Dict],
-    root_dir: str
+    source_methods_json: List[polyglot_drift_data.PolyglotDriftData],
+    yaml_store: DriftYamlStore
 ) -> None:
     """Coordination method that handles major .drift-data.yml clauses
 
     Args:
         source_methods_json: A list of language-agnostic snippet methods
-        root_dir: A path to the directory source_methods_json was created from
+        yaml_store: The parsed .drift-data.yml files of the directory
+                    source_methods_json was created from
 
     Modifies:
         source_methods_json: Adds data based on the .drift-data.yml
                              files in the root directory (and,
                              recursively, its sub-directories).
     """
-    _handle_overwrites(source_methods_json, root_dir)
-    _handle_manually_specified_tests(source_methods_json, root_dir)
-    _handle_additions_clause(source_methods_json, root_dir)
+    _handle_overwrites(source_methods_json, yaml_store)
+    _handle_manually_specified_tests(source_methods_json, yaml_store)
+    _handle_additions_clause(source_methods_json, yaml_store)
 
 
-def get_untested_region_tags(root_dir: str) -> List[str]:
+def get_untested_region_tags(yaml_store: DriftYamlStore) -> List[str]:
     """Get the 'untested' region tags for a given directory
 
     In this method, 'untested' region tags are those *explicitly marked*
@@ -225,18 +231,7 @@ def get_untested_region_tags(root_dir: str) -> List[str]:
     tags for which a test exists, but could not be found by automatically.)
 
     Args:
-        root_dir: A directory containing snippets and .drift-data.yml files
+        yaml_store: The parsed .drift-data.yml files of a directory
+                    containing snippets
     """
-    yaml_paths = file_utils.get_drift_yaml_files(root_dir)
-    all_untested_tags = []
-
-    for path in yaml_paths:
-        with open(path, 'r') as file:
-            yaml_contents = '\n'.join(file.readlines())
-            parsed_yaml = yaml.safe_load(yaml_contents)
-
-            local_untested_tags = [key for key in parsed_yaml.keys()
-                                   if parsed_yaml[key].get('tested') is False]
-            all_untested_tags += local_untested_tags
-
-    return list(set(all_untested_tags))
+    return list(yaml_store.untested_tags)
@@ -16,6 +16,7 @@ import os
 import unittest
 
 from ast_parser.core import polyglot_drift_data, yaml_utils
+from ast_parser.core.drift_yaml_store import DriftYamlStore
 
 import pytest
 
@@ -45,12 +46,13 @@ class HandleOverwritesTests(unittest.TestCase):
             os.path.dirname(__file__),
             'test_data/yaml/overwrite_tests/'
         )
+        self.yaml_store = DriftYamlStore(self.TEST_DIR)
 
     def test_noop_if_region_tag_not_modified(self):
         source_methods_json = \
             _create_source_methods_json(
                 'method_0', [('some_test_file.py', 'test_something')])
-        yaml_utils._handle_overwrites(source_methods_json, self.TEST_DIR)
+        yaml_utils._handle_overwrites(source_methods_json, self.yaml_store)
 
         assert len(source_methods_json[0].test_methods) == 1
 
@@ -58,15 +60,15 @@ class HandleOverwritesTests(unittest.TestCase):
         source_methods_json = \
             _create_source_methods_json(
                 'method_1', [('some_test_file.py', 'test_something')])
-        yaml_utils._handle_overwrites(source_methods_json, self.TEST_DIR)
+        yaml_utils._handle_overwrites(source_methods_json, self.yaml_store)
         assert len(source_methods_json[0].test_methods) == 1
 
     def test_handles_overwrite_if_true(self):
         source_methods_json = \
             _create_source_methods_json(
                 'method_2', [('some_test_file.py', 'test_something')])
-        yaml_utils._handle_overwrites(source_methods_json, self.TEST_DIR)
-        assert source_methods_json[0].test_methods == []
+        yaml_utils._handle_overwrites(source_methods_json, self.yaml_store)
+        assert source_methods_json[0].test_methods == ()
 
 
 class HandleAdditionsClauseTests(unittest.TestCase):
@@ -76,12 +78,13 @@ class HandleAdditionsClauseTests(unittest.TestCase):
             os.path.dirname(__file__),
             'test_data/yaml/smoke_tests/'
         )
+        self.yaml_store = DriftYamlStore(self.TEST_DIR)
 
     def test_handles_additions_tag(self):
         source_methods_json = \
             _create_source_methods_json('additions_tests', [])
         yaml_utils._handle_additions_clause(
-            source_methods_json, self.TEST_DIR)
+            source_methods_json, self.yaml_store)
 
         actual_tags = set(source_methods_json[0].region_tags)
         expected_tags = set(['additions_tests', 'detectable_tag'])
@@ -92,7 +95,7 @@ class HandleAdditionsClauseTests(unittest.TestCase):
         source_methods_json = \
             _create_source_methods_json('detectable_tag', [])
         yaml_utils._handle_additions_clause(
-            source_methods_json, self.TEST_DIR)
+            source_methods_json, self.yaml_store)
 
         actual_tags = set(source_methods_json[0].region_tags)
         expected_tags = set(['additions_tests', 'detectable_tag'])
@@ -103,10 +106,19 @@ class HandleAdditionsClauseTests(unittest.TestCase):
         source_methods_json = \
             _create_source_methods_json('not_mentioned', [])
         yaml_utils._handle_additions_clause(
-            source_methods_json, self.TEST_DIR)
+            source_methods_json, self.yaml_store)
 
         assert source_methods_json[0].region_tags == ['not_mentioned']
 
+    def test_gets_additions_tags(self):
+        additions_index = self.yaml_store.additions_index
+
+        assert yaml_utils.get_additions_tags(
+            ['detectable_tag', 'not_mentioned'], additions_index
+        ) == {'additions_tests', 'detectable_tag'}
+        assert yaml_utils.get_additions_tags(
+            ['not_mentioned'], additions_index) == set()
+
 
 class HandleManuallySpecifiedTests(unittest.TestCase):
     def test_ignores_reserved_keys(self):
@@ -121,7 +133,7 @@ class HandleManuallySpecifiedTests(unittest.TestCase):
         )
 
         yaml_utils._handle_manually_specified_tests(
-            source_methods_json, ROOT_DIR)
+            source_methods_json, DriftYamlStore(ROOT_DIR))
 
         actual_test_methods = source_methods_json[0].test_methods
 
@@ -142,14 +154,29 @@ class HandleManuallySpecifiedTests(unittest.TestCase):
         )
 
         yaml_utils._handle_manually_specified_tests(
-            source_methods_json, ROOT_DIR)
+            source_methods_json, DriftYamlStore(ROOT_DIR))
 
         expected_test = [(
             os.path.join(ROOT_DIR, 'overwrite_test.py'),
             'nonexistent_test_method'
         )]
 
-        assert source_methods_json[0].test_methods == [expected_test]
+        assert source_methods_json[0].test_methods == (expected_test,)
+
+
+class GetMethodTestsTests(unittest.TestCase):
+    def test_flattens_manually_specified_tests(self):
+        source_methods_json = _create_source_methods_json(
+            'method_2',
+            [('a_test.py', 'test_a'),
+             [('b_test.py', 'test_b'), ('b_test.py', 'test_c')]]
+        )
+
+        assert yaml_utils.get_method_tests(source_methods_json[0]) == [
+            ('a_test.py', 'test_a'),
+            ('b_test.py', 'test_b'),
+            ('b_test.py', 'test_c')
+        ]
 
 
 class GetUntestedRegionTagTests(unittest.TestCase):
@@ -159,15 +186,16 @@ class GetUntestedRegionTagTests(unittest.TestCase):
             os.path.dirname(__file__),
             'test_data/yaml/invalid/'
         )
+        self.yaml_store = DriftYamlStore(self.TEST_DIR)
 
     def test_handles_tested_equal_false(self):
-        tags = yaml_utils.get_untested_region_tags(self.TEST_DIR)
+        tags = yaml_utils.get_untested_region_tags(self.yaml_store)
         assert 'detectable_tag' in tags
 
     def test_ignores_tested_equal_true(self):
-        tags = yaml_utils.get_untested_region_tags(self.TEST_DIR)
+        tags = yaml_utils.get_untested_region_tags(self.yaml_store)
         assert 'undetectable_tag' not in tags
 
     def test_ignores_tested_not_set(self):
-        tags = yaml_utils.get_untested_region_tags(self.TEST_DIR)
+        tags = yaml_utils.get_untested_region_tags(self.yaml_store)
         assert 'overwritten_tag' not in tags
@@ -19,6 +19,11 @@ import re
 # Character used to separate different parts of a key in test-method maps
 KEY_SEPARATOR = '@'
 
+# Version of the polyglot_snippet_data.json format
+#  1: source and test paths are absolute
+#  2: source and test paths are relative to the JSON file's directory
+SNIPPET_DATA_SCHEMA_VERSION = 2
+
 
 IGNORED_METHOD_NAMES = (
     'run_command',
@@ -12,64 +12,236 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
 import os
 import re
-from typing import Callable, List, Set
+import uuid
+from collections import deque
+from typing import (Callable, Deque, Dict, Iterator, List, Optional, Set,
+                    Tuple)
 
 from . import constants
 
 
+# The maximum number of concurrent directory listings and file reads.
+# (File system calls are I/O-bound, so threads overlap their latency.)
+IO_THREAD_COUNT = 16
+
+# The maximum number of files read ahead of their consumer
+PREFETCH_FILE_COUNT = 64
+
+
+def _is_dot_dir(dir_path: str) -> bool:
+    return os.path.basename(os.path.normpath(dir_path)).startswith('.')
+
+
+def _list_dir(dir_path: str) -> Tuple[List[str], List[str]]:
+    """List a directory's files and (non-file) sub-entries
+
+    Args:
+        dir_path: the directory to list
+
+    Returns:
+        A tuple containing the paths of the directory's files and the paths
+        of its other entries, each in os.listdir() order
+    """
+    files = []
+    folders = []
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                files.append(entry.path)
+            else:
+                folders.append(entry.path)
+
+    return files, folders
+
+
+def _list_dirs(
+    root_dir: str,
+    recursive: bool
+) -> Dict[str, Tuple[List[str], List[str]]]:
+    """List a directory tree, listing sibling directories concurrently
+
+    Args:
+        root_dir: the root directory to list
+        recursive: whether to list root_dir's sub-directories
+
+    Returns:
+        A map from each listed directory to its _list_dir() result
+    """
+    listings: Dict[str, Tuple[List[str], List[str]]] = {}
+
+    with concurrent.futures.ThreadPoolExecutor(IO_THREAD_COUNT) as executor:
+        pending = {executor.submit(_list_dir, root_dir): root_dir}
+        while pending:
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for future in done:
+                dir_path = pending.pop(future)
+                listings[dir_path] = future.result()
+
+                if not recursive:
+                    continue
+
+                for folder in listings[dir_path][1]:
+                    if not _is_dot_dir(folder):
+                        pending[executor.submit(_list_dir, folder)] = folder
+
+    return listings
+
+
 def _get_file_paths(
     root_dir: str,
-    predicate: Callable[[str], bool]
+    predicate: Callable[[str], bool],
+    recursive: bool = True
 ) -> List[str]:
     """Recursively list the files in a given directory
        whose names match the provided predicate function
 
+    Directories are listed concurrently, but files are
+    returned in the same order as a sequential search.
+
     Args:
         root_dir: the root directory to search from
         predicate: the predicate function
                    to filter filenames with
+        recursive: whether to search root_dir's sub-directories
 
     Returns:
         A list of filepaths relative to root_dir that match the predicate
     """
-    if os.path.basename(os.path.normpath(root_dir)).startswith('.'):
+    if _is_dot_dir(root_dir):
         # Ignore dot-directories
         return []
 
-    paths = [os.path.join(root_dir, path) for path in os.listdir(root_dir)]
+    listings = _list_dirs(root_dir, recursive)
+
+    def _collect_files(dir_path: str) -> List[str]:
+        files, folders = listings[dir_path]
+        files = [path for path in files if predicate(path)]
+
+        # Dot-directories (and non-recursive searches'
+        # sub-directories) weren't listed
+        for folder in folders:
+            if folder in listings:
+                files += _collect_files(folder)
+
+        return files
 
-    folders = [path for path in paths if not os.path.isfile(path)]
+    return _collect_files(root_dir)
 
-    files = [path for path in paths if os.path.isfile(path)
-             and predicate(path)]
 
-    for file in folders:
-        files += _get_file_paths(file, predicate)
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r') as file:
+            return file.read()
+    except OSError:
+        return None
+
 
-    return files
+def write_file_atomically(path: str, data: bytes) -> None:
+    """Write a file, so that concurrent readers never see partial contents
 
+    The data is written to a (uniquely-named) temporary file first, which
+    is then renamed into place. The temporary file is removed if either
+    step fails.
 
-def get_python_files(root_dir: str) -> List[str]:
+    Args:
+        path: the path of the file to write
+        data: the file's contents
+    """
+    temp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def read_files(
+    paths: List[str],
+    max_pending: int = PREFETCH_FILE_COUNT
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """Read files in the background, ahead of their (sequential) consumer
+
+    At most max_pending files are read ahead of the consumer, so memory
+    usage stays bounded no matter how slowly the files are consumed.
+
+    Args:
+        paths: the paths of the files to read
+        max_pending: the maximum number of files to read ahead
+
+    Returns:
+        An iterator of (path, contents) tuples, in the same order as paths.
+        Contents are None if a file couldn't be read.
+    """
+    path_iter = iter(paths)
+
+    with concurrent.futures.ThreadPoolExecutor(
+        min(IO_THREAD_COUNT, max_pending)
+    ) as executor:
+        pending: Deque[Tuple[str, concurrent.futures.Future]] = deque()
+
+        def _read_next() -> None:
+            path = next(path_iter, None)
+            if path is not None:
+                pending.append((path, executor.submit(_read_text, path)))
+
+        for _ in range(max_pending):
+            _read_next()
+
+        while pending:
+            path, future = pending.popleft()
+            contents = future.result()
+
+            # Only read another file once one has been consumed
+            _read_next()
+            yield path, contents
+
+
+# Not language-agnostic, so keep it in this module
+_GAE_LIB_REGEX = re.compile(r'/appengine/(.+/)*lib/')
+
+
+def is_python_file(path: str) -> bool:
+    """Check whether a file is a (non-vendored) Python file
+
+    Args:
+        path: the file's path
+
+    Returns:
+        True if the file should be parsed as Python, False otherwise
+    """
+    return path.endswith('.py') and not _GAE_LIB_REGEX.search(path)
+
+
+def is_drift_yaml_file(path: str) -> bool:
+    """Check whether a file is a DRIFT yaml metadata file
+
+    Args:
+        path: the file's path
+
+    Returns:
+        True if the file is a .drift-data.yml file, False otherwise
+    """
+    return os.path.basename(path) in ('.drift-data.yml', '.drift-data.yaml')
+
+
+def get_python_files(root_dir: str, recursive: bool = True) -> List[str]:
     """Recursively lists the Python files in a directory
 
     Args:
         root_dir: the root directory to search from
+        recursive: whether to search root_dir's sub-directories
 
     Returns:
         A list of Python filepaths relative to root_dir
     """
-
-    # Not language-agnostic, so keep it in this method
-    gae_lib_regex = re.compile(r'/appengine/(.+/)*lib/')
-
-    return _get_file_paths(
-        root_dir,
-        lambda path: (
-            path.endswith('.py') and not gae_lib_regex.search(path)
-        )
-    )
+    return _get_file_paths(root_dir, is_python_file, recursive)
 
 
 def get_drift_yaml_files(root_dir: str) -> List[str]:
@@ -81,13 +253,7 @@ def get_drift_yaml_files(root_dir: str) -> List[str]:
     Returns:
         A list of DRIFT yaml metadata filepaths relative to root_dir
     """
-    return _get_file_paths(
-        root_dir,
-        lambda path: (
-            os.path.basename(path) == '.drift-data.yml'
-            or os.path.basename(path) == '.drift-data.yaml'
-        )
-    )
+    return _get_file_paths(root_dir, is_drift_yaml_file)
 
 
 def get_region_tags(root_dir: str) -> List[str]:
@@ -13,7 +13,9 @@
 # limitations under the License.
 
 import os
+import tempfile
 import unittest
+from unittest import mock
 
 from . import file_utils
 
@@ -30,6 +32,83 @@ class GetFilesTest(unittest.TestCase):
 
         assert 'dotfile_tag' not in str(files)
 
+    def test_getfiles_matches_sequential_search_order(self):
+        def _sequential_search(root_dir):
+            paths = [os.path.join(root_dir, path)
+                     for path in os.listdir(root_dir)]
+            files = [path for path in paths if os.path.isfile(path)]
+            for path in paths:
+                if not os.path.isfile(path) and (
+                        not os.path.basename(path).startswith('.')):
+                    files += _sequential_search(path)
+            return files
+
+        files = file_utils._get_file_paths(TEST_DIR, lambda x: True)
+
+        assert files == _sequential_search(TEST_DIR)
+
+    def test_getfiles_non_recursive(self):
+        files = file_utils._get_file_paths(
+            TEST_DIR, lambda x: True, recursive=False)
+
+        assert files
+        assert all(os.path.dirname(path) == TEST_DIR for path in files)
+
+
+class ReadFilesTest(unittest.TestCase):
+    def test_reads_files_in_order(self):
+        paths = file_utils.get_python_files(TEST_DIR)
+
+        contents = list(file_utils.read_files(paths, max_pending=2))
+
+        assert [path for path, _ in contents] == paths
+        for path, content in contents:
+            with open(path, 'r') as file:
+                assert content == file.read()
+
+    def test_returns_none_for_unreadable_files(self):
+        missing_path = os.path.join(TEST_DIR, 'missing.py')
+
+        assert list(file_utils.read_files([missing_path])) == [
+            (missing_path, None)]
+
+    def test_reads_a_bounded_number_of_files_ahead(self):
+        paths = file_utils.get_python_files(TEST_DIR)
+        assert len(paths) > 2
+
+        with mock.patch.object(
+            file_utils, '_read_text', wraps=file_utils._read_text
+        ) as read_mock:
+            contents = file_utils.read_files(paths, max_pending=2)
+            next(contents)
+
+            # The first file, plus (at most) 2 read ahead of the consumer
+            assert read_mock.call_count <= 3
+
+            contents.close()
+
+
+class WriteFileAtomicallyTest(unittest.TestCase):
+    def test_writes_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'file')
+            file_utils.write_file_atomically(path, b'data')
+
+            with open(path, 'rb') as file:
+                assert file.read() == b'data'
+            assert os.listdir(temp_dir) == ['file']
+
+    def test_removes_temporary_file_on_failure(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'file')
+
+            with mock.patch.object(
+                    file_utils.os, 'replace', side_effect=OSError):
+                with self.assertRaises(OSError):
+                    file_utils.write_file_atomically(path, b'data')
+
+            assert os.listdir(temp_dir) == []
+
 
 class GetPythonFilesTest(unittest.TestCase):
     def test_finds_python_files(self):
@@ -0,0 +1,265 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file reads the files of a git revision directly from a repository's
+object store, so that revisions can be analyzed without checking them out.
+"""
+
+import io
+import os
+import subprocess
+import threading
+from typing import (Any, Callable, Dict, IO, Iterator, List, Optional, Set,
+                    Tuple, cast)
+
+# git ls-tree modes of regular (non-executable and executable) files.
+# (Symlinks and submodules are skipped.)
+_FILE_MODES = ('100644', '100755')
+
+
+def _run_git(cwd: str, *args: str) -> str:
+    """Run a git command and return its output
+
+    Args:
+        cwd: the directory to run the command in
+        args: the command's arguments (excluding "git")
+
+    Raises:
+        ValueError: if the command fails
+
+    Returns:
+        The command's output, with trailing newlines removed
+    """
+    try:
+        output = subprocess.run(
+            ['git', *args],
+            cwd=cwd,
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as err:
+        stderr = getattr(err, 'stderr', None) or b''
+        raise ValueError(
+            f'git {" ".join(args)} failed in {cwd}: '
+            f'{stderr.decode("utf-8", "replace").strip() or err}')
+
+    return output.decode('utf-8', 'surrogateescape').rstrip('\n')
+
+
+def _get_listing_key(rel_path: str) -> Tuple[Tuple[int, str], ...]:
+    # Sort a directory's files before its sub-directories, matching the
+    # (depth-first) order that file_utils lists working tree files in
+    parts = rel_path.split('/')
+    return tuple([(1, part) for part in parts[:-1]] + [(0, parts[-1])])
+
+
+class GitRevision:
+    """The files within a directory at a given git revision
+
+    Files are read from the repository's object store (through a single,
+    persistent "git cat-file --batch" process), so neither the revision nor
+    the working tree's current contents matter. Paths are reported as if the
+    revision were checked out in the given root directory.
+
+    Objects of this class hold a subprocess open, so they should be closed
+    (or used as context managers).
+    """
+
+    def __init__(self, root_dir: str, revision: str) -> None:
+        """
+        Args:
+            root_dir: a directory within a git repository's working tree
+            revision: the revision (e.g. a commit SHA, branch or tag name) to
+                      read files from
+
+        Raises:
+            ValueError: if root_dir isn't within a git repository, or the
+                        revision isn't a valid commit
+        """
+        self.root_dir = os.path.abspath(root_dir)
+        self.revision = revision
+
+        self._top_level = _run_git(
+            self.root_dir, 'rev-parse', '--show-toplevel')
+        prefix = _run_git(self.root_dir, 'rev-parse', '--show-prefix')
+
+        if revision.startswith('-'):
+            raise ValueError(f'Invalid revision: {revision}')
+        self.commit = _run_git(
+            self.root_dir, 'rev-parse', '--verify', '--quiet',
+            f'{revision}^{{commit}}')
+
+        ls_tree_args = ['ls-tree', '-r', '-z', self.commit]
+        if prefix:
+            ls_tree_args += ['--', prefix]
+        tree_listing = _run_git(self._top_level, *ls_tree_args)
+
+        # Maps from (virtual) file paths to blob SHAs, in listing order
+        self._blobs: Dict[str, str] = {}
+        self._dirs: Set[str] = {self.root_dir}
+
+        entries = []
+        for entry in tree_listing.split('\0'):
+            if not entry:
+                continue
+
+            entry_info, repo_path = entry.split('\t', 1)
+            mode, object_type, blob_sha = entry_info.split(' ')
+            if object_type == 'blob' and mode in _FILE_MODES:
+                entries.append((repo_path[len(prefix):], blob_sha))
+
+        for rel_path, blob_sha in sorted(
+                entries, key=lambda entry: _get_listing_key(entry[0])):
+            file_path = os.path.join(self.root_dir, *rel_path.split('/'))
+            self._blobs[file_path] = blob_sha
+
+            dir_path = os.path.dirname(file_path)
+            while dir_path not in self._dirs:
+                self._dirs.add(dir_path)
+                dir_path = os.path.dirname(dir_path)
+
+        # The "git cat-file" process (and its stdin and stdout),
+        # which is started when the first file is read
+        self._process: Optional[subprocess.Popen] = None
+        self._pipes: Optional[Tuple[IO[bytes], IO[bytes]]] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'GitRevision':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the revision's "git cat-file" process (if it's running)"""
+        if self._process and self._pipes:
+            stdin, stdout = self._pipes
+            stdin.close()
+            self._process.wait()
+            stdout.close()
+
+        self._process = None
+        self._pipes = None
+
+    def get_files(self, predicate: Callable[[str], bool]) -> List[str]:
+        """List the revision's files whose paths match a predicate
+
+        Like file_utils' listing functions, files within dot-directories are
+        skipped, and a directory's files are listed before those of its
+        sub-directories.
+
+        Args:
+            predicate: the predicate function to filter file paths with
+
+        Returns:
+            A list of matching file paths
+        """
+        if os.path.basename(self.root_dir).startswith('.'):
+            return []
+
+        return [
+            file_path for file_path in self._blobs
+            if predicate(file_path) and not any(
+                part.startswith('.') for part in os.path.relpath(
+                    os.path.dirname(file_path), self.root_dir).split(os.sep)
+                if part != os.curdir)
+        ]
+
+    def exists(self, path: str) -> bool:
+        """Check whether a file or directory exists in the revision
+
+        Args:
+            path: the file or directory's path
+
+        Returns:
+            True if the path exists in the revision, False otherwise
+        """
+        path = os.path.abspath(path)
+        return path in self._blobs or path in self._dirs
+
+    def get_blob_sha(self, path: str) -> Optional[str]:
+        """Get the SHA of a file's blob
+
+        Files with the same blob SHA (e.g. in different revisions) have the
+        same contents.
+
+        Args:
+            path: the file's path
+
+        Returns:
+            The file's blob SHA, or None if the file doesn't exist
+        """
+        return self._blobs.get(os.path.abspath(path))
+
+    def _read_blob(self, blob_sha: str) -> bytes:
+        with self._lock:
+            if self._pipes is None:
+                self._process = subprocess.Popen(
+                    ['git', 'cat-file', '--batch'],
+                    cwd=self._top_level,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE)
+                self._pipes = (
+                    cast(IO[bytes], self._process.stdin),
+                    cast(IO[bytes], self._process.stdout))
+
+            stdin, stdout = self._pipes
+            stdin.write(f'{blob_sha}\n'.encode('ascii'))
+            stdin.flush()
+
+            # Headers are "<sha> <type> <size>" (or "<sha> missing")
+            header = stdout.readline().decode('ascii').split()
+            if len(header) != 3:
+                raise ValueError(f'Could not read git object {blob_sha}.')
+
+            contents = stdout.read(int(header[2]))
+            stdout.read(1)  # Trailing newline
+
+            return contents
+
+    def read_text(self, path: str) -> Optional[str]:
+        """Read a file's contents
+
+        Contents are decoded the same way as open() would decode them (i.e.
+        using the default encoding and universal newlines).
+
+        Args:
+            path: the file's path
+
+        Returns:
+            The file's contents, or None if the file doesn't exist
+        """
+        blob_sha = self.get_blob_sha(path)
+        if blob_sha is None:
+            return None
+
+        return io.TextIOWrapper(io.BytesIO(self._read_blob(blob_sha))).read()
+
+    def read_files(
+        self,
+        paths: List[str]
+    ) -> Iterator[Tuple[str, Optional[str]]]:
+        """Read files in order (like file_utils.read_files())
+
+        Args:
+            paths: the paths of the files to read
+
+        Returns:
+            An iterator of (path, contents) tuples, in the same order as paths.
+            Contents are None if a file doesn't exist.
+        """
+        for path in paths:
+            yield path, self.read_text(path)
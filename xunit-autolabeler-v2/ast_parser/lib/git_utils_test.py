@@ -0,0 +1,94 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import subprocess
+import unittest
+
+import pytest
+
+from . import file_utils, git_utils
+
+
+def _git(repo_dir, *args):
+    subprocess.run(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+         *args],
+        cwd=repo_dir, check=True, stdout=subprocess.DEVNULL)
+
+
+def _write(path, contents):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        file.write(contents)
+
+
+class GitRevisionTest(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _repo(self, tmpdir):
+        self.repo_dir = str(tmpdir)
+
+        _git(self.repo_dir, 'init', '-q')
+        for rel_path in ('a.py', 'sub/z.py', 'sub/deeper/c.py',
+                         'sub/b.py', '.hidden/d.py'):
+            _write(os.path.join(self.repo_dir, rel_path), f'# {rel_path}\n')
+        _write(os.path.join(self.repo_dir, 'sub/.drift-data.yml'), 'a: {}\n')
+        _write(os.path.join(self.repo_dir, 'sub/crlf.py'), 'a = 1\r\n')
+        _git(self.repo_dir, 'add', '-A')
+        _git(self.repo_dir, 'commit', '-q', '-m', 'Initial commit')
+
+        # Later changes to the working tree shouldn't be visible
+        _write(os.path.join(self.repo_dir, 'a.py'), '# changed\n')
+        os.remove(os.path.join(self.repo_dir, 'sub/b.py'))
+
+        self.revision = git_utils.GitRevision(self.repo_dir, 'HEAD')
+        yield
+        self.revision.close()
+
+    def _path(self, rel_path):
+        return os.path.join(self.repo_dir, rel_path)
+
+    def test_lists_files_in_working_tree_order(self):
+        files = self.revision.get_files(file_utils.is_python_file)
+
+        assert files == [self._path(rel_path) for rel_path in (
+            'a.py', 'sub/b.py', 'sub/crlf.py', 'sub/z.py', 'sub/deeper/c.py')]
+
+    def test_reads_committed_contents(self):
+        assert self.revision.read_text(self._path('a.py')) == '# a.py\n'
+        assert self.revision.read_text(self._path('sub/b.py')) == (
+            '# sub/b.py\n')
+
+    def test_translates_newlines_like_open(self):
+        assert self.revision.read_text(self._path('sub/crlf.py')) == 'a = 1\n'
+
+    def test_returns_none_for_missing_files(self):
+        assert self.revision.read_text(self._path('missing.py')) is None
+
+    def test_checks_whether_paths_exist(self):
+        assert self.revision.exists(self._path('sub/b.py'))
+        assert self.revision.exists(self._path('sub/deeper'))
+        assert not self.revision.exists(self._path('sub/missing.py'))
+
+    def test_lists_sub_directory_files(self):
+        with git_utils.GitRevision(self._path('sub'), 'HEAD') as revision:
+            files = revision.get_files(file_utils.is_drift_yaml_file)
+
+            assert files == [self._path('sub/.drift-data.yml')]
+            assert revision.read_text(files[0]) == 'a: {}\n'
+
+    def test_errors_on_invalid_revisions(self):
+        with pytest.raises(ValueError):
+            git_utils.GitRevision(self.repo_dir, 'no-such-branch')
@@ -0,0 +1,167 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from typing import Callable, Dict, List
+
+
+# The shard unit containing the files directly within the root directory
+ROOT_FILES_UNIT = '.'
+
+
+def _get_unit_files(
+    root_dir: str,
+    unit: str,
+    get_files: Callable[..., List[str]]
+) -> List[str]:
+    """List the files within a single shard unit
+
+    Args:
+        root_dir: the root directory being sharded
+        unit: a top-level sub-directory name (or ROOT_FILES_UNIT)
+        get_files: a file_utils function (such as get_python_files) that
+                   lists a directory's files
+
+    Returns:
+        The unit's files, in the order get_files() lists them
+    """
+    if unit == ROOT_FILES_UNIT:
+        return get_files(root_dir, recursive=False)
+
+    return get_files(os.path.join(root_dir, unit))
+
+
+def get_shard_units(root_dir: str) -> List[str]:
+    """List the units (top-level directories) that a root is sharded by
+
+    Args:
+        root_dir: the root directory to shard
+
+    Returns:
+        ROOT_FILES_UNIT, followed by the root's (non-dot) sub-directory
+        names in sorted order
+    """
+    sub_dirs = [name for name in os.listdir(root_dir)
+                if not name.startswith('.') and
+                os.path.isdir(os.path.join(root_dir, name))]
+
+    return [ROOT_FILES_UNIT] + sorted(sub_dirs)
+
+
+def _get_units_files(
+    root_dir: str,
+    get_files: Callable[..., List[str]]
+) -> Dict[str, List[str]]:
+    """List the files within each of a root directory's shard units
+
+    Args:
+        root_dir: the root directory being sharded
+        get_files: a file_utils function (such as get_python_files) that
+                   lists a directory's files
+
+    Returns:
+        A map from each unit (see get_shard_units()) to the files it contains
+    """
+    return {unit: _get_unit_files(root_dir, unit, get_files)
+            for unit in get_shard_units(root_dir)}
+
+
+def _assign_units(
+    unit_files: Dict[str, List[str]],
+    shard_count: int
+) -> List[List[str]]:
+    """Assign units to shards, balancing the number of files in each shard
+
+    Args:
+        unit_files: a map from each unit to the files it contains
+        shard_count: the number of shards to create
+
+    Returns:
+        A list of shard_count lists, each containing a shard's units (in
+        sorted order)
+    """
+    if shard_count < 1:
+        raise ValueError('Shard count must be at least 1.')
+
+    # Place the largest units first (breaking ties by
+    # name, so that plans are deterministic)
+    units = sorted(unit_files, key=lambda unit: (-len(unit_files[unit]), unit))
+
+    shards: List[List[str]] = [[] for _ in range(shard_count)]
+    shard_sizes = [0] * shard_count
+    for unit in units:
+        shard_idx = shard_sizes.index(min(shard_sizes))
+        shards[shard_idx].append(unit)
+        shard_sizes[shard_idx] += len(unit_files[unit])
+
+    return [sorted(shard) for shard in shards]
+
+
+def plan_shards(
+    root_dir: str,
+    shard_count: int,
+    get_files: Callable[..., List[str]]
+) -> List[List[str]]:
+    """Split a root directory's units into (roughly) equally-sized shards
+
+    Units are assigned to shards greedily (largest unit first) based on how
+    many files they contain. The result depends only on the directory tree
+    (not on file system listing order), so every worker computes the same
+    plan.
+
+    Args:
+        root_dir: the root directory to shard
+        shard_count: the number of shards to create
+        get_files: a file_utils function (such as get_python_files) that
+                   lists a directory's files
+
+    Returns:
+        A list of shard_count lists, each containing a shard's units (in
+        sorted order)
+    """
+    return _assign_units(_get_units_files(root_dir, get_files), shard_count)
+
+
+def get_shard_files(
+    root_dir: str,
+    shard_index: int,
+    shard_count: int,
+    get_files: Callable[..., List[str]]
+) -> List[str]:
+    """List the files within a single shard of a root directory
+
+    Args:
+        root_dir: the root directory to shard
+        shard_index: the (zero-based) index of the shard to list
+        shard_count: the number of shards
+        get_files: a file_utils function (such as get_python_files) that
+                   lists a directory's files
+
+    Returns:
+        The shard's files, grouped by unit (in sorted unit order)
+    """
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(
+            f'Shard index {shard_index} must be between 0 and '
+            f'{shard_count - 1}.')
+
+    # (Each unit is only listed once, and its files are reused below)
+    unit_files = _get_units_files(root_dir, get_files)
+    shard_units = _assign_units(unit_files, shard_count)[shard_index]
+
+    files = []
+    for unit in shard_units:
+        files += unit_files[unit]
+
+    return files
@@ -0,0 +1,71 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import unittest
+
+import pytest
+
+from . import file_utils, shard_utils
+
+
+class ShardTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _root_dir(self, tmpdir):
+        self.root_dir = str(tmpdir)
+
+        # Unit sizes: big = 3, small = 1, tiny = 1, root files = 1
+        for path in ['root.py', 'big/a.py', 'big/b.py', 'big/nested/c.py',
+                     'small/d.py', 'tiny/e.py', '.hidden/f.py']:
+            full_path = os.path.join(self.root_dir, path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, 'w') as file:
+                file.write('')
+
+    def _get_shard_files(self, shard_index, shard_count):
+        return shard_utils.get_shard_files(
+            self.root_dir, shard_index, shard_count,
+            file_utils.get_python_files)
+
+    def test_lists_units(self):
+        assert shard_utils.get_shard_units(self.root_dir) == [
+            shard_utils.ROOT_FILES_UNIT, 'big', 'small', 'tiny']
+
+    def test_balances_shards_by_file_count(self):
+        plan = shard_utils.plan_shards(
+            self.root_dir, 2, file_utils.get_python_files)
+
+        assert plan == [['big'], ['.', 'small', 'tiny']]
+
+    def test_shards_cover_every_file_exactly_once(self):
+        all_files = file_utils.get_python_files(self.root_dir)
+
+        shard_files = []
+        for shard_index in range(3):
+            shard_files += self._get_shard_files(shard_index, 3)
+
+        assert sorted(shard_files) == sorted(all_files)
+
+    def test_root_files_unit_is_not_recursive(self):
+        plan = shard_utils.plan_shards(
+            self.root_dir, 4, file_utils.get_python_files)
+        root_shard = [idx for idx, units in enumerate(plan)
+                      if shard_utils.ROOT_FILES_UNIT in units][0]
+
+        assert self._get_shard_files(root_shard, 4) == [
+            os.path.join(self.root_dir, 'root.py')]
+
+    def test_rejects_invalid_shard_index(self):
+        with self.assertRaises(ValueError):
+            self._get_shard_files(2, 2)
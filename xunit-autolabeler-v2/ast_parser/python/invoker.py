@@ -14,46 +14,164 @@
 
 
 import dataclasses
+import itertools
+import json
 import os
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
+from ast_parser.core import analyze
 from ast_parser.lib import constants as lib_constants, file_utils
+from ast_parser.lib import git_utils, shard_utils
 
-from . import constants, source_parser, test_parser
+from . import constants, drift_data_tuple, parse_cache, source_parser
+from . import test_parser
 
 
-def _parse_source(source_path: str) -> List[Any]:
-    source_methods = source_parser.get_top_level_methods(source_path)
-    return [method for method in source_methods]
+# The sub-directory of a cache directory that parser results are stored in
+PARSE_CACHE_SUBDIR = 'python-parse'
+
+
+def _get_parse_cache(
+    cache_dir: Optional[str]
+) -> Optional[parse_cache.ParseCache]:
+    if not cache_dir:
+        return None
+
+    # Keep parser results separate from other cached analysis inputs
+    return parse_cache.ParseCache(
+        os.path.join(cache_dir, PARSE_CACHE_SUBDIR))
+
+
+def _get_cache_key(
+    file_path: str,
+    kind: str,
+    content: Optional[str],
+    cache: Optional[parse_cache.ParseCache],
+    revision: Optional[git_utils.GitRevision]
+) -> Optional[str]:
+    if not cache:
+        return None
+
+    # Files in git revisions are keyed by their blob SHAs, so
+    # they're only read if they don't have a cache entry
+    if revision:
+        blob_sha = revision.get_blob_sha(file_path)
+        return cache.get_blob_key(file_path, kind, blob_sha) \
+            if blob_sha else None
+
+    # Files that couldn't be read (or weren't read
+    # ahead of time) are parsed without caching
+    if content is None:
+        return None
+
+    return cache.get_key(file_path, kind, content)
+
+
+def _parse_source(
+    source_path: str,
+    content: Optional[str] = None,
+    cache: Optional[parse_cache.ParseCache] = None,
+    revision: Optional[git_utils.GitRevision] = None
+) -> List[drift_data_tuple.DriftData]:
+    cache_key = _get_cache_key(
+        source_path, 'source', content, cache, revision)
+
+    if cache and cache_key:
+        cached_methods = cache.get(cache_key)
+        if cached_methods is not None:
+            abs_source_path = os.path.abspath(source_path)
+            return [
+                drift_data_tuple.DriftData(
+                    **dict(fields, source_path=abs_source_path))
+                for fields in cached_methods
+            ]
+
+    if revision:
+        content = revision.read_text(source_path)
+
+    # Only keep the (AST-free) snippet data, so that
+    # each file's AST can be freed once it's been parsed
+    methods = source_parser.get_top_level_drift_data(source_path, content)
+
+    # Files without snippets aren't cached, so that parse
+    # warnings are still displayed when they're re-parsed
+    if cache and cache_key and methods:
+        # Cache entries are shared between checkouts,
+        # so they don't include (absolute) file paths
+        cached_methods = [dataclasses.asdict(method) for method in methods]
+        for fields in cached_methods:
+            del fields['source_path']
+
+        cache.put(cache_key, cached_methods)
+
+    return methods
 
 
 def _parse_test(
     test_path: str,
-    source_methods: List[Any]
+    source_methods: List[drift_data_tuple.DriftData],
+    content: Optional[str] = None,
+    cache: Optional[parse_cache.ParseCache] = None,
+    revision: Optional[git_utils.GitRevision] = None
 ) -> Dict[Tuple[str, str], List[Tuple[str, str]]]:
-    test_methods = test_parser.get_test_methods(test_path)
+    cache_key = _get_cache_key(test_path, 'test', content, cache, revision)
+
+    if cache and cache_key:
+        cached_map = cache.get(cache_key)
+        if cached_map is not None:
+            abs_test_path = os.path.abspath(test_path)
+            return {
+                test_key: [(abs_test_path, test_name)
+                           for test_name in test_names]
+                for test_key, test_names in cached_map.items()
+            }
+
+    if revision:
+        content = revision.read_text(test_path)
+
+    # Test keys and values are plain strings,
+    # so test file ASTs can be freed here too
+    test_methods = test_parser.get_test_methods(test_path, content)
     test_method_map: Dict[Tuple[str, str], List[Tuple[str, str]]] = (
         test_parser.get_test_key_to_snippet_map(test_methods))
 
-    return test_method_map
+    if cache and cache_key and test_method_map:
+        # Every test in the map is in test_path, so only store test names
+        cache.put(cache_key, {
+            test_key: [test_name for _, test_name in tests]
+            for test_key, tests in test_method_map.items()
+        })
 
+    return test_method_map
 
-def get_json_for_dir(root_dir: str) -> Dict[str, Union[List, Dict]]:
-    python_files = file_utils.get_python_files(root_dir)
 
-    source_methods = []
+def _get_drift_data_for_files(
+    python_files: List[str],
+    cache: Optional[parse_cache.ParseCache] = None,
+    revision: Optional[git_utils.GitRevision] = None
+) -> Tuple[List[drift_data_tuple.DriftData], Dict[str, List[Tuple[str, str]]]]:
+    source_methods: List[drift_data_tuple.DriftData] = []
     source_files = [file for file in python_files
                     if constants.TEST_FILE_MARKER not in file]
-
-    for file in source_files:
-        source_methods += _parse_source(file)
-
     test_files = [file for file in python_files
                   if constants.TEST_FILE_MARKER in file]
 
-    test_method_map: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
-    for file in test_files:
-        tests = _parse_test(file, source_methods)
+    file_contents: Iterator[Tuple[str, Optional[str]]]
+    if revision:
+        # Files are read from the revision by the parsing
+        # functions (and only if they aren't cached)
+        file_contents = ((file, None) for file in source_files + test_files)
+    else:
+        # Read files in the background while earlier ones are being parsed
+        # (test files are read ahead while the last source files are parsed)
+        file_contents = file_utils.read_files(source_files + test_files)
+
+    for file, content in itertools.islice(file_contents, len(source_files)):
+        source_methods += _parse_source(file, content, cache, revision)
+
+    test_method_map: Dict[str, List[Tuple[str, str]]] = {}
+    for file, content in file_contents:
+        tests = _parse_test(file, source_methods, content, cache, revision)
         for test_keys, test_value in tests.items():
             key_str = (
                 test_keys[0] + lib_constants.KEY_SEPARATOR + test_keys[1])
@@ -63,14 +181,151 @@ def get_json_for_dir(root_dir: str) -> Dict[str, Union[List, Dict]]:
 
             test_method_map[key_str] += test_value
 
+    if cache:
+        cache.evict_if_full()
+
+    return source_methods, test_method_map
+
+
+def _to_json(
+    source_methods: List[drift_data_tuple.DriftData],
+    test_method_map: Dict[str, List[Tuple[str, str]]],
+    base_dir: str
+) -> Dict[str, Any]:
+    """Serialize snippet data, storing paths relative to a base directory
+
+    Args:
+        source_methods: Snippet data of each top-level method
+        test_method_map: A map from test keys to (test path, test name)
+                         tuples
+        base_dir: The directory the JSON file will be stored in
+
+    Returns:
+        The snippet data, in polyglot_snippet_data.json format
+    """
+    snippets = []
     for method in source_methods:
-        new_source_path = os.path.abspath(
-            method.drift.source_path)
-        method.drift.source_path = new_source_path
+        snippet = dataclasses.asdict(method)
+        snippet['source_path'] = os.path.relpath(
+            snippet['source_path'], base_dir)
+        snippets.append(snippet)
+
+    relative_test_map = {
+        test_key: [(os.path.relpath(test_path, base_dir), test_name)
+                   for test_path, test_name in tests]
+        for test_key, tests in test_method_map.items()
+    }
 
     return {
-        'snippets': [
-            dataclasses.asdict(method.drift) for method in source_methods
-        ],
-        'test_method_map': test_method_map
+        'schema_version': lib_constants.SNIPPET_DATA_SCHEMA_VERSION,
+        'snippets': snippets,
+        'test_method_map': relative_test_map
     }
+
+
+def _get_python_files(
+    root_dir: str,
+    revision: Optional[git_utils.GitRevision]
+) -> List[str]:
+    if revision:
+        return revision.get_files(file_utils.is_python_file)
+
+    return file_utils.get_python_files(root_dir)
+
+
+def get_json_for_dir(
+    root_dir: str,
+    cache_dir: Optional[str] = None,
+    revision: Optional[git_utils.GitRevision] = None
+) -> Dict[str, Union[List, Dict]]:
+    source_methods, test_method_map = _get_drift_data_for_files(
+        _get_python_files(root_dir, revision),
+        _get_parse_cache(cache_dir),
+        revision)
+
+    # Paths are stored relative to root_dir, so the JSON
+    # file (and root_dir) can be moved after it's written
+    return _to_json(source_methods, test_method_map, root_dir)
+
+
+def get_json_for_shard(
+    root_dir: str,
+    shard_index: int,
+    shard_count: int,
+    cache_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """Parse a single shard of a directory's Python files
+
+    Shards are made up of the root directory's top-level sub-directories
+    (see shard_utils.plan_shards()). Each shard can be parsed by a different
+    worker, and the results combined (without re-parsing) by
+    snippet_data_shards.merge_shards().
+
+    Args:
+        root_dir: The directory to parse Python files in
+        shard_index: The (zero-based) index of the shard to parse
+        shard_count: The total number of shards
+        cache_dir: (Optional) A directory to cache per-file parser results
+                   in (see parse_cache.ParseCache)
+
+    Returns:
+        The shard's snippet data, in the format returned by
+        get_json_for_dir() (plus the shard's index and count)
+    """
+    python_files = shard_utils.get_shard_files(
+        root_dir, shard_index, shard_count, file_utils.get_python_files)
+
+    source_methods, test_method_map = _get_drift_data_for_files(
+        python_files, _get_parse_cache(cache_dir))
+
+    shard_json = _to_json(source_methods, test_method_map, root_dir)
+    shard_json['shard'] = {'index': shard_index, 'count': shard_count}
+
+    return shard_json
+
+
+def get_snippet_data_for_dir(
+    root_dir: str,
+    output_path: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    revision: Optional[git_utils.GitRevision] = None
+) -> analyze.SnippetData:
+    """Parse a directory's Python files into in-memory snippet data
+
+    This method runs the same analysis as get_json_for_dir(), but returns
+    snippet data that can be passed directly to analyze.SnippetAnalysis
+    (skipping the serialization round-trip through a JSON file).
+
+    Args:
+        root_dir: The directory to parse Python files in
+        output_path: (Optional) A path to write the equivalent
+                     polyglot_snippet_data.json file to
+        cache_dir: (Optional) A directory to cache per-file parser results
+                   in (see parse_cache.ParseCache)
+        revision: (Optional) A git revision of root_dir to parse files from,
+                  instead of the working tree
+
+    Returns:
+        Snippet data in the format returned by analyze.create_snippet_data()
+    """
+    source_methods, test_method_map = _get_drift_data_for_files(
+        _get_python_files(root_dir, revision),
+        _get_parse_cache(cache_dir),
+        revision)
+
+    if output_path:
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        with open(output_path, 'w') as file:
+            json.dump(
+                _to_json(source_methods, test_method_map, output_dir), file)
+
+    # Snippet records are only used once, so (unlike asdict())
+    # a shallow copy of each record's fields is sufficient
+    field_names = [
+        field.name for field in dataclasses.fields(drift_data_tuple.DriftData)]
+    snippets = [
+        {name: getattr(method, name) for name in field_names}
+        for method in source_methods
+    ]
+
+    return analyze.create_snippet_data(snippets, test_method_map)
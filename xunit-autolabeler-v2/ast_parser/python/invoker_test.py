@@ -12,9 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import ast
 import os
+import shutil
+import subprocess
 
-from . import invoker
+from ast_parser.core import analyze
+from ast_parser.lib import constants as lib_constants
+from ast_parser.lib import git_utils
+
+from . import drift_data_tuple, invoker
 
 
 PARSER_DATA_PATH = os.path.join(
@@ -65,3 +72,124 @@ def test_get_json_for_dir():
     assert 'start_line' in first_repo_obj
     assert 'end_line' in first_repo_obj
     assert 'method_name' in first_repo_obj
+
+
+def test_get_json_for_dir_uses_relative_paths():
+    repo_json = invoker.get_json_for_dir(PARSER_DATA_PATH)
+
+    assert repo_json['schema_version'] == (
+        lib_constants.SNIPPET_DATA_SCHEMA_VERSION)
+    assert not any(os.path.isabs(snippet['source_path'])
+                   for snippet in repo_json['snippets'])
+    assert not any(os.path.isabs(test_path)
+                   for tests in repo_json['test_method_map'].values()
+                   for test_path, _ in tests)
+
+
+def test_parse_source_returns_detached_snippet_data():
+    methods = invoker._parse_source(source_path)
+
+    assert all(isinstance(method, drift_data_tuple.DriftData)
+               for method in methods)
+    assert not any(isinstance(method, ast.AST) for method in methods)
+
+
+def test_get_snippet_data_for_dir_matches_json(tmpdir):
+    output_path = os.path.join(tmpdir, 'polyglot_snippet_data.json')
+
+    methods, test_method_map = invoker.get_snippet_data_for_dir(
+        PARSER_DATA_PATH, output_path)
+    json_methods, json_test_method_map = analyze._get_data(output_path)
+
+    assert methods == json_methods
+    assert test_method_map == json_test_method_map
+
+
+def test_get_json_for_shard_splits_snippets():
+    json_for_dir = invoker.get_json_for_dir(PARSER_DATA_PATH)
+
+    shard_snippets = []
+    for shard_index in range(2):
+        shard_json = invoker.get_json_for_shard(
+            PARSER_DATA_PATH, shard_index, 2)
+        shard_snippets += shard_json['snippets']
+
+        assert shard_json['shard'] == {'index': shard_index, 'count': 2}
+
+    def _key(snippet):
+        return (snippet['source_path'], snippet['start_line'])
+
+    assert sorted(shard_snippets, key=_key) == sorted(
+        json_for_dir['snippets'], key=_key)
+
+
+def test_get_json_for_dir_uses_parse_cache(tmpdir):
+    uncached_json = invoker.get_json_for_dir(PARSER_DATA_PATH)
+
+    cache_dir = str(tmpdir)
+    cold_json = invoker.get_json_for_dir(PARSER_DATA_PATH, cache_dir)
+    warm_json = invoker.get_json_for_dir(PARSER_DATA_PATH, cache_dir)
+
+    assert os.listdir(os.path.join(cache_dir, invoker.PARSE_CACHE_SUBDIR))
+    assert cold_json == uncached_json
+    assert warm_json == uncached_json
+
+
+def _commit_copy(src_dir, repo_dir):
+    shutil.copytree(src_dir, repo_dir)
+    for args in (['init', '-q'], ['add', '-A'],
+                 ['commit', '-q', '-m', 'Add test data']):
+        subprocess.run(
+            ['git', '-c', 'user.name=test', '-c', 'user.email=test@x.com',
+             *args],
+            cwd=repo_dir, check=True)
+
+
+def _sorted_json(snippet_json):
+    return (
+        sorted(snippet_json['snippets'],
+               key=lambda snippet: (snippet['source_path'],
+                                    snippet['start_line'])),
+        {key: sorted(tests)
+         for key, tests in snippet_json['test_method_map'].items()}
+    )
+
+
+def test_get_json_for_dir_reads_git_revisions(tmpdir):
+    repo_dir = os.path.join(tmpdir, 'repo')
+    _commit_copy(PARSER_DATA_PATH, repo_dir)
+    working_tree_json = invoker.get_json_for_dir(repo_dir)
+
+    # Revisions are read from the object store, not the working tree
+    for entry in os.scandir(repo_dir):
+        if entry.name == '.git':
+            continue
+        elif entry.is_dir():
+            shutil.rmtree(entry.path)
+        else:
+            os.remove(entry.path)
+
+    with git_utils.GitRevision(repo_dir, 'HEAD') as revision:
+        revision_json = invoker.get_json_for_dir(
+            repo_dir, revision=revision)
+
+    assert _sorted_json(revision_json) == _sorted_json(working_tree_json)
+
+
+def test_get_json_for_dir_caches_git_blobs(tmpdir):
+    repo_dir = os.path.join(tmpdir, 'repo')
+    _commit_copy(PARSER_DATA_PATH, repo_dir)
+    cache_dir = os.path.join(tmpdir, 'cache')
+
+    def _count_cache_entries():
+        return sum(len(files) for _, _, files in os.walk(cache_dir))
+
+    with git_utils.GitRevision(repo_dir, 'HEAD') as revision:
+        cold_json = invoker.get_json_for_dir(repo_dir, cache_dir, revision)
+        entry_count = _count_cache_entries()
+
+        warm_json = invoker.get_json_for_dir(repo_dir, cache_dir, revision)
+
+    assert entry_count
+    assert warm_json == cold_json
+    assert _count_cache_entries() == entry_count
@@ -0,0 +1,329 @@
+# Copyright 2020 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file contains a content-addressed cache of per-file parser results.
+
+Each entry is keyed by a hash of a file's contents, its name and the version
+of the parser (computed from the parser's own source code). Entries don't
+depend on a file's location, so a single cache directory can be shared
+between checkouts (and between concurrent CI jobs, e.g. via a shared mount).
+
+Entries are written to temporary files and then atomically renamed into
+place, so readers never need locks. Reads refresh an entry's modification
+time, which evict() uses to remove the least-recently-used entries.
+
+Scanning a (large, shared) cache directory is slow, so the cache's total size
+is also recorded in a usage file. evict_if_full() only scans the directory
+once writes may have pushed that total past the cache's size limit.
+"""
+
+import glob
+import hashlib
+import marshal
+import os
+import sys
+from typing import Any, List, Optional, Tuple
+
+from ast_parser.lib import file_utils
+
+from .source_parsers import registry
+
+
+# The default maximum size of a parse cache directory
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Evicting entries brings a cache down to this fraction of its maximum size
+# (so that it isn't evicted again as soon as the next entry is written)
+_EVICTION_TARGET_RATIO = 0.8
+
+_ENTRY_SUFFIX = '.marshal'
+
+# The file (in the cache's root directory) that records the cache's size
+_USAGE_FILE_NAME = 'usage'
+
+_parser_version: Optional[str] = None
+
+
+def get_parser_version() -> str:
+    """Get a hash that identifies the current version of the Python parser
+
+    The hash covers the source code of the parser modules (including
+    python/constants.py and the source parsers), the names of any registered
+    third-party source parsers and the Python version (as ast output differs
+    between Python versions).
+
+    Returns:
+        A hex digest that changes whenever parser output might change
+    """
+    global _parser_version
+
+    if _parser_version is None:
+        parser_dir = os.path.dirname(os.path.abspath(__file__))
+        lib_dir = os.path.join(os.path.dirname(parser_dir), 'lib')
+
+        module_paths = sorted(
+            glob.glob(os.path.join(parser_dir, '*.py')) +
+            glob.glob(os.path.join(parser_dir, 'source_parsers', '*.py')) +
+            [os.path.join(lib_dir, 'constants.py')])
+
+        version_hash = hashlib.sha256()
+        for module_path in module_paths:
+            if module_path.endswith('_test.py'):
+                continue
+
+            with open(module_path, 'rb') as file:
+                version_hash.update(file.read())
+
+        for parser in registry.get_source_parsers():
+            version_hash.update(parser.name.encode('utf-8'))
+
+        version_hash.update(repr(sys.version_info[:2]).encode('utf-8'))
+
+        _parser_version = version_hash.hexdigest()
+
+    return _parser_version
+
+
+class ParseCache:
+    """A (possibly shared) directory of cached per-file parser results
+
+    Values must be serializable with marshal (i.e. they must consist of
+    built-in types only).
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """
+        Args:
+            cache_dir: The directory to store cache entries in
+            max_bytes: The size that evict() limits the cache directory to
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        # The number of bytes written to the cache since it was last
+        # evicted (or its recorded size was last updated)
+        self.bytes_written = 0
+
+    def get_key(self, file_path: str, kind: str, content: str) -> str:
+        """Compute the cache key for a given file
+
+        Args:
+            file_path: The path of the file to be parsed
+            kind: The kind of result being cached (e.g. 'source' or 'test')
+            content: The file's contents
+
+        Returns:
+            The file's cache key
+        """
+        key_hash = hashlib.sha256()
+        for part in (get_parser_version(), kind, os.path.basename(file_path)):
+            key_hash.update(part.encode('utf-8'))
+            key_hash.update(b'\0')
+        key_hash.update(content.encode('utf-8', 'surrogateescape'))
+
+        return key_hash.hexdigest()
+
+    def get_blob_key(self, file_path: str, kind: str, blob_sha: str) -> str:
+        """Compute the cache key for a file stored in a git repository
+
+        Blob SHAs identify file contents, so (unlike get_key()) this doesn't
+        require reading the file. Files with the same blob SHA in different
+        revisions share cache entries.
+
+        Args:
+            file_path: The path of the file to be parsed
+            kind: The kind of result being cached (e.g. 'source' or 'test')
+            blob_sha: The SHA of the file's git blob
+
+        Returns:
+            The file's cache key
+        """
+        key_hash = hashlib.sha256()
+        for part in (get_parser_version(), kind, os.path.basename(file_path),
+                     'git-blob', blob_sha):
+            key_hash.update(part.encode('utf-8'))
+            key_hash.update(b'\0')
+
+        return key_hash.hexdigest()
+
+    def _get_entry_path(self, key: str) -> str:
+        # Spread entries across sub-directories, to keep directories small
+        return os.path.join(self.cache_dir, key[:2], f'{key}{_ENTRY_SUFFIX}')
+
+    def get(self, key: str) -> Optional[Any]:
+        """Read a cache entry
+
+        Args:
+            key: A cache key returned by get_key()
+
+        Returns:
+            The cached value, or None if there isn't one
+        """
+        entry_path = self._get_entry_path(key)
+
+        try:
+            with open(entry_path, 'rb') as file:
+                cached_key, value = marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            cached_key = None  # Missing, corrupt or concurrently-evicted
+
+        if cached_key != key:
+            self.misses += 1
+            return None
+
+        # Mark the entry as recently used (on a best-effort basis)
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Write a cache entry
+
+        Caching is best-effort, so errors (such as a read-only cache
+        directory) are ignored.
+
+        Args:
+            key: A cache key returned by get_key()
+            value: The value to cache
+        """
+        entry_path = self._get_entry_path(key)
+
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+            data = marshal.dumps((key, value))
+            file_utils.write_file_atomically(entry_path, data)
+            self.bytes_written += len(data)
+        except (OSError, ValueError):
+            pass
+
+    def _get_usage_path(self) -> str:
+        return os.path.join(self.cache_dir, _USAGE_FILE_NAME)
+
+    def _read_usage(self) -> Optional[int]:
+        try:
+            with open(self._get_usage_path(), 'rb') as file:
+                return int(file.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_usage(self, total_bytes: int) -> None:
+        # (Recording the cache's size is best-effort, like caching itself)
+        try:
+            file_utils.write_file_atomically(
+                self._get_usage_path(), str(total_bytes).encode('utf-8'))
+        except OSError:
+            pass
+
+    def evict_if_full(self) -> int:
+        """Evict entries if writes may have filled the cache
+
+        The cache directory is only scanned (see evict()) if entries were
+        written and the cache's recorded size plus those entries exceeds the
+        size limit, or if the cache's size hasn't been recorded yet.
+        Otherwise, the written entries are added to the recorded size.
+
+        Concurrent jobs may overwrite each other's updates to the recorded
+        size, so it can fall behind the actual size. Any such drift is
+        corrected by the next scan.
+
+        Returns:
+            The number of entries removed
+        """
+        if not self.bytes_written:
+            return 0
+
+        recorded_bytes = self._read_usage()
+        if recorded_bytes is not None and \
+           recorded_bytes + self.bytes_written <= self.max_bytes:
+            self._write_usage(recorded_bytes + self.bytes_written)
+            self.bytes_written = 0
+            return 0
+
+        return self.evict()
+
+    def evict(self) -> int:
+        """Remove least-recently-used entries until the cache fits its size
+
+        This scans every entry in the cache directory, and records the
+        cache's resulting size (see evict_if_full()). Entries removed
+        concurrently (e.g. by another job's eviction) are skipped.
+
+        Returns:
+            The number of entries removed
+        """
+        # (modification time, size, path) tuples
+        entries: List[Tuple[float, int, str]] = []
+
+        try:
+            sub_dirs = [sub_dir.path for sub_dir in os.scandir(self.cache_dir)
+                        if sub_dir.is_dir()]
+        except OSError:
+            return 0
+
+        for sub_dir in sub_dirs:
+            try:
+                dir_entries = list(os.scandir(sub_dir))
+            except OSError:
+                continue
+
+            for entry in dir_entries:
+                if not entry.name.endswith(_ENTRY_SUFFIX):
+                    continue
+
+                try:
+                    entry_stat = entry.stat()
+                except OSError:
+                    continue
+
+                entries.append(
+                    (entry_stat.st_mtime, entry_stat.st_size, entry.path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        self.bytes_written = 0
+
+        if total_bytes <= self.max_bytes:
+            self._write_usage(total_bytes)
+            return 0
+
+        # Remove the least-recently-used entries first
+        target_bytes = self.max_bytes * _EVICTION_TARGET_RATIO
+        entries.sort()
+
+        removed_count = 0
+        for _, size, entry_path in entries:
+            if total_bytes <= target_bytes:
+                break
+
+            total_bytes -= size
+            try:
+                os.remove(entry_path)
+                removed_count += 1
+            except OSError:
+                pass
+
+        self._write_usage(total_bytes)
+        return removed_count
@@ -0,0 +1,109 @@
+# Copyright 2020 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import unittest
+from unittest import mock
+
+import pytest
+
+from . import parse_cache
+
+
+class ParseCacheTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _cache(self, tmpdir):
+        self.cache = parse_cache.ParseCache(os.path.join(tmpdir, 'cache'))
+
+    def test_round_trips_values(self):
+        key = self.cache.get_key('a.py', 'source', 'x = 1')
+
+        assert self.cache.get(key) is None
+        self.cache.put(key, [{'name': 'a', 'start_line': 1}])
+
+        assert self.cache.get(key) == [{'name': 'a', 'start_line': 1}]
+        assert (self.cache.hits, self.cache.misses) == (1, 1)
+
+    def test_keys_depend_on_content_name_and_kind(self):
+        key = self.cache.get_key('a.py', 'source', 'x = 1')
+
+        assert key == self.cache.get_key('a.py', 'source', 'x = 1')
+        assert key != self.cache.get_key('a.py', 'test', 'x = 1')
+        assert key != self.cache.get_key('b.py', 'source', 'x = 1')
+        assert key != self.cache.get_key('a.py', 'source', 'x = 2')
+
+    def test_keys_do_not_depend_on_directory(self):
+        assert self.cache.get_key('/one/a.py', 'source', 'x = 1') == (
+            self.cache.get_key('/two/a.py', 'source', 'x = 1'))
+
+    def test_corrupt_entries_are_misses(self):
+        key = self.cache.get_key('a.py', 'source', 'x = 1')
+        self.cache.put(key, ['value'])
+
+        with open(self.cache._get_entry_path(key), 'wb') as file:
+            file.write(b'not marshal data')
+
+        assert self.cache.get(key) is None
+
+    def test_evicts_least_recently_used_entries(self):
+        keys = [self.cache.get_key(f'{idx}.py', 'source', str(idx))
+                for idx in range(4)]
+        for idx, key in enumerate(keys):
+            self.cache.put(key, 'x' * 1000)
+            os.utime(self.cache._get_entry_path(key), (idx, idx))
+
+        entry_size = os.path.getsize(self.cache._get_entry_path(keys[0]))
+        self.cache.max_bytes = entry_size * 3
+
+        assert self.cache.evict() == 2
+        assert self.cache.get(keys[0]) is None
+        assert self.cache.get(keys[1]) is None
+        assert self.cache.get(keys[3]) == 'x' * 1000
+
+    def test_does_not_evict_caches_within_size_limit(self):
+        key = self.cache.get_key('a.py', 'source', 'x = 1')
+        self.cache.put(key, ['value'])
+
+        assert self.cache.evict() == 0
+        assert self.cache.get(key) == ['value']
+
+    def test_evict_if_full_skips_scans_within_recorded_size(self):
+        self.cache.put(self.cache.get_key('a.py', 'source', '1'), ['value'])
+        self.cache.evict_if_full()  # Records the cache's size
+
+        with mock.patch.object(
+                parse_cache.os, 'scandir', side_effect=AssertionError):
+            assert self.cache.evict_if_full() == 0
+
+            self.cache.put(self.cache.get_key('b.py', 'source', '2'), ['x'])
+            assert self.cache.evict_if_full() == 0
+
+    def test_evict_if_full_evicts_once_writes_exceed_size_limit(self):
+        keys = [self.cache.get_key(f'{idx}.py', 'source', str(idx))
+                for idx in range(4)]
+
+        self.cache.put(keys[0], 'x' * 1000)
+        entry_size = os.path.getsize(self.cache._get_entry_path(keys[0]))
+        self.cache.max_bytes = entry_size * 3
+
+        assert self.cache.evict_if_full() == 0
+        for idx, key in enumerate(keys[1:]):
+            self.cache.put(key, 'x' * 1000)
+            os.utime(self.cache._get_entry_path(key), (idx + 1, idx + 1))
+        os.utime(self.cache._get_entry_path(keys[0]), (0, 0))
+
+        assert self.cache.evict_if_full() == 2
+        assert self.cache.get(keys[0]) is None
+        assert self.cache.get(keys[3]) == 'x' * 1000
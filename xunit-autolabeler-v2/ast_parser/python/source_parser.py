@@ -16,9 +16,10 @@
 import ast
 import os
 import sys
-from typing import Any, List
+from typing import Any, List, Optional
 
-from .source_parsers import direct_invocation, flask_router, webapp2_router
+from . import drift_data_tuple
+from .source_parsers import registry
 
 
 def _get_method_children(expr: Any) -> List[Any]:
@@ -121,40 +122,47 @@ def _get_ending_line(expr: Any) -> int:
     return highest_line_no
 
 
-def get_top_level_methods(source_path: str) -> List[Any]:
+def get_top_level_methods(
+    source_path: str,
+    content: Optional[str] = None
+) -> List[Any]:
     """Gets the top-level methods within a file
 
     Args:
         source_path: path to the file to process
+        content: (Optional) the file's (already-read) contents
 
     Returns:
         List[ast.AST]: a list of the top-level
                        methods within the provided file
     """
     try:
-        with open(source_path, 'r') as f:
-            content = ''.join(f.readlines())
-            nodes = list(ast.iter_child_nodes(ast.parse(content)))
+        if content is None:
+            with open(source_path, 'r') as f:
+                content = ''.join(f.readlines())
 
-            # Webapp2 is the only parser that detects class names explicitly
-            # Other parsers use the module name (filename minus ".py" suffix)
-            module_name = os.path.splitext(
-                os.path.basename(source_path))[0]
+        nodes = list(ast.iter_child_nodes(ast.parse(content)))
 
-            methods = []
+        # Webapp2 is the only parser that detects class names explicitly
+        # Other parsers use the module name (filename minus ".py" suffix)
+        module_name = os.path.splitext(
+            os.path.basename(source_path))[0]
 
-            methods += webapp2_router.parse(nodes)
-            methods += flask_router.parse(nodes, module_name)
+        module = registry.ParsedModule(
+            nodes, module_name, content, registry.get_imports(nodes))
 
-            # run direct_invocation parser after flask_router to avoid dupes
-            methods += direct_invocation.parse(nodes, module_name)
+        # Parsers run in priority order, so framework-specific parsers
+        # label methods before direct_invocation (to avoid dupes)
+        methods = []
+        for parser in registry.get_applicable_parsers(module):
+            methods += parser.parse(nodes, module_name)
 
-            for method in methods:
-                method.drift.source_path = os.path.abspath(source_path)
-                method.drift.children = _get_method_children(method)
-                method.drift.end_line = _get_ending_line(method)
+        for method in methods:
+            method.drift.source_path = os.path.abspath(source_path)
+            method.drift.children = _get_method_children(method)
+            method.drift.end_line = _get_ending_line(method)
 
-            return methods
+        return methods
     except IOError as err:
         # Fail gracefully if a file can't be read
         # (This shouldn't happen, but if it doess
@@ -173,3 +181,25 @@ def get_top_level_methods(source_path: str) -> List[Any]:
             f'\t{str(err)}\n')
 
         return []
+
+
+def get_top_level_drift_data(
+    source_path: str,
+    content: Optional[str] = None
+) -> List[drift_data_tuple.DriftData]:
+    """Gets the snippet data of the top-level methods within a file
+
+    Unlike get_top_level_methods(), this method returns only the (detached)
+    DriftData records of each method. These records don't reference the
+    file's AST, so it can be freed as soon as the file has been processed.
+
+    Args:
+        source_path: path to the file to process
+        content: (Optional) the file's (already-read) contents
+
+    Returns:
+        List[DriftData]: the snippet data of each top-level
+                         method within the provided file
+    """
+    return [method.drift for method in
+            get_top_level_methods(source_path, content)]
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 
+import ast
 from typing import Any, List
 
 from ast_parser.lib import constants
@@ -20,7 +21,7 @@ from ast_parser.python import drift_data_tuple
 
 
 def _is_unique_method(node: Any) -> bool:
-    if '.FunctionDef' not in str(type(node)):
+    if not isinstance(node, ast.FunctionDef):
         return False
 
     if not hasattr(node, 'name'):
@@ -0,0 +1,255 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file contains the registry of source parsers used on snippet files.
+
+Each source parser declares a cheap applicability predicate, which is
+evaluated against a module's (precomputed) import set and source text.
+Only parsers whose predicates match a given module are run on its nodes.
+
+Third-party source parsers can be registered either by calling
+register_parser() or via the ENTRY_POINT_GROUP entry point group. Each
+entry point should refer to a SourceParser object.
+"""
+
+import ast
+import sys
+from typing import Any, Callable, FrozenSet, List, NamedTuple, Optional
+
+from . import direct_invocation, flask_router, webapp2_router
+
+
+ENTRY_POINT_GROUP = 'xunit_autolabeler.python_source_parsers'
+
+# Parsers run in ascending priority order. Framework-specific parsers must
+# label methods before the generic direct_invocation parser sees them.
+FRAMEWORK_PARSER_PRIORITY = 500
+DIRECT_INVOCATION_PRIORITY = 1000
+
+
+class ParsedModule(NamedTuple):
+    """The parsed contents of a single snippet-containing Python file"""
+    nodes: List[Any]
+    module_name: str
+    source: str
+    imports: FrozenSet[str]
+
+
+class SourceParser(NamedTuple):
+    """A source parser and the conditions under which it should run
+
+    Args:
+        name: The parser's name
+        parse: A function that accepts a module's top-level AST nodes and
+               its module name, and returns the snippet methods (as AST nodes
+               with 'drift' attributes) that it found
+        is_applicable: A function that accepts a ParsedModule and returns
+                       False if the parser cannot find snippets in it
+        priority: Parsers with lower priorities run first
+    """
+    name: str
+    parse: Callable[[List[Any], str], List[Any]]
+    is_applicable: Callable[[ParsedModule], bool]
+    priority: int = FRAMEWORK_PARSER_PRIORITY
+
+
+def _add_import_names(imports: set, module: Optional[str]) -> None:
+    if not module:
+        return
+
+    # Add each parent package too (e.g. "google.cloud.storage"
+    # adds "google", "google.cloud" and "google.cloud.storage")
+    parts = module.split('.')
+    for idx in range(len(parts)):
+        imports.add('.'.join(parts[:idx + 1]))
+
+
+def get_imports(nodes: List[Any]) -> FrozenSet[str]:
+    """Get the names of the modules imported by a Python module
+
+    This method only considers module-level import statements (including
+    those nested in "if", "try" and "with" blocks), not those within function
+    or class definitions.
+
+    Args:
+        nodes: A module's top-level AST nodes
+
+    Returns:
+        The names of every imported module and its parent packages
+    """
+    imports: set = set()
+
+    pending = list(nodes)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                _add_import_names(imports, alias.name)
+        elif isinstance(node, ast.ImportFrom):
+            if not node.level:
+                _add_import_names(imports, node.module)
+        elif isinstance(node, (ast.If, ast.Try, ast.With)):
+            pending += node.body
+            pending += getattr(node, 'orelse', [])
+            pending += getattr(node, 'finalbody', [])
+            for handler in getattr(node, 'handlers', []):
+                pending += handler.body
+
+    return frozenset(imports)
+
+
+def imports_any(*modules: str) -> Callable[[ParsedModule], bool]:
+    """Create a predicate that matches modules importing any given module
+
+    Args:
+        modules: (Fully-qualified) module names, such as "flask"
+
+    Returns:
+        A predicate for use as a SourceParser's is_applicable function
+    """
+    return lambda module: not module.imports.isdisjoint(modules)
+
+
+def mentions_any(*words: str) -> Callable[[ParsedModule], bool]:
+    """Create a predicate that matches modules containing any given text
+
+    Args:
+        words: Strings that a module's source must contain (at least one of)
+               for a parser to find snippets in it
+
+    Returns:
+        A predicate for use as a SourceParser's is_applicable function
+    """
+    return lambda module: any(word in module.source for word in words)
+
+
+def _always(module: ParsedModule) -> bool:
+    return True
+
+
+# Built-in parsers use text-based predicates, since route-handling objects
+# (e.g. Flask apps) are often created in (and imported from) other modules.
+_BUILT_IN_PARSERS = [
+    SourceParser(
+        'webapp2_router',
+        lambda nodes, module_name: webapp2_router.parse(nodes),
+        mentions_any('WSGIApplication'),
+        priority=100
+    ),
+    SourceParser(
+        'flask_router',
+        flask_router.parse,
+        mentions_any('route'),
+        priority=200
+    ),
+    SourceParser(
+        'direct_invocation',
+        direct_invocation.parse,
+        _always,
+        priority=DIRECT_INVOCATION_PRIORITY
+    ),
+]
+
+_registered_parsers: List[SourceParser] = []
+_entry_point_parsers: Optional[List[SourceParser]] = None
+_source_parsers: Optional[List[SourceParser]] = None
+
+
+def register_parser(parser: SourceParser) -> None:
+    """Register an additional source parser
+
+    Args:
+        parser: The source parser to register
+    """
+    global _source_parsers
+
+    _registered_parsers.append(parser)
+    _source_parsers = None
+
+
+def _load_entry_point_parsers() -> List[SourceParser]:
+    """Load the source parsers registered via entry points
+
+    Returns:
+        The SourceParser objects referenced by ENTRY_POINT_GROUP entry points
+    """
+    try:
+        from importlib import metadata
+    except ImportError:  # Python < 3.8
+        return []
+
+    all_entry_points: Any = metadata.entry_points()
+    if hasattr(all_entry_points, 'select'):
+        entry_points = all_entry_points.select(group=ENTRY_POINT_GROUP)
+    else:
+        entry_points = all_entry_points.get(ENTRY_POINT_GROUP, [])
+
+    parsers = []
+    for entry_point in entry_points:
+        try:
+            parser = entry_point.load()
+        except Exception as err:
+            # A broken plugin shouldn't "break the build"
+            sys.stderr.write(
+                f'WARNING: could not load source parser: {entry_point.name}\n')
+            sys.stderr.write(f'\t{str(err)}\n')
+            continue
+
+        if not isinstance(parser, SourceParser):
+            sys.stderr.write(
+                f'WARNING: not a SourceParser: {entry_point.name}\n')
+            continue
+
+        parsers.append(parser)
+
+    return parsers
+
+
+def get_source_parsers() -> List[SourceParser]:
+    """Get every available source parser, in the order they should run
+
+    Entry points are only loaded once per process.
+
+    Returns:
+        The built-in, entry-point and registered parsers, sorted by priority
+    """
+    global _entry_point_parsers, _source_parsers
+
+    if _entry_point_parsers is None:
+        _entry_point_parsers = _load_entry_point_parsers()
+
+    if _source_parsers is None:
+        # sorted() is stable, so parsers with equal
+        # priorities run in the order they were added
+        _source_parsers = sorted(
+            _BUILT_IN_PARSERS +
+            _entry_point_parsers +
+            _registered_parsers,
+            key=lambda parser: parser.priority)
+
+    return _source_parsers
+
+
+def get_applicable_parsers(module: ParsedModule) -> List[SourceParser]:
+    """Get the source parsers that should run on a given module
+
+    Args:
+        module: A parsed Python module
+
+    Returns:
+        The source parsers whose predicates match the module, in run order
+    """
+    return [parser for parser in get_source_parsers()
+            if parser.is_applicable(module)]
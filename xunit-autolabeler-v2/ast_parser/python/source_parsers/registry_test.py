@@ -0,0 +1,128 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import ast
+import unittest
+from unittest.mock import MagicMock
+
+import pytest
+
+from . import registry
+
+
+_MODULE_SOURCE = """
+import os
+from google.cloud import storage
+from . import helpers
+
+try:
+    import flask
+except ImportError:
+    flask = None
+
+
+def snippet():
+    import webapp2
+"""
+
+
+def _get_module(source):
+    nodes = list(ast.iter_child_nodes(ast.parse(source)))
+    return registry.ParsedModule(
+        nodes, 'main', source, registry.get_imports(nodes))
+
+
+class GetImportsTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _module(self):
+        self.module = _get_module(_MODULE_SOURCE)
+
+    def test_includes_parent_packages(self):
+        assert 'google' in self.module.imports
+        assert 'google.cloud' in self.module.imports
+
+    def test_includes_nested_module_level_imports(self):
+        assert 'flask' in self.module.imports
+
+    def test_ignores_function_level_imports(self):
+        assert 'webapp2' not in self.module.imports
+
+    def test_ignores_relative_imports(self):
+        assert self.module.imports == frozenset(
+            {'os', 'google', 'google.cloud', 'flask'})
+
+
+class PredicateTests(unittest.TestCase):
+    def test_imports_any(self):
+        module = _get_module(_MODULE_SOURCE)
+
+        assert registry.imports_any('webapp2', 'flask')(module)
+        assert not registry.imports_any('webapp2')(module)
+
+    def test_mentions_any(self):
+        module = _get_module('app = webapp2.WSGIApplication([])')
+
+        assert registry.mentions_any('WSGIApplication')(module)
+        assert not registry.mentions_any('route')(module)
+
+
+class ApplicableParsersTests(unittest.TestCase):
+    def _parser_names(self, source):
+        return [parser.name for parser in
+                registry.get_applicable_parsers(_get_module(source))]
+
+    def test_plain_modules_only_use_direct_invocation(self):
+        names = self._parser_names('def snippet():\n    pass\n')
+
+        assert names == ['direct_invocation']
+
+    def test_framework_parsers_run_before_direct_invocation(self):
+        names = self._parser_names(
+            '@app.route("/")\ndef index():\n    pass\n\n'
+            'app = webapp2.WSGIApplication([])\n')
+
+        assert names == [
+            'webapp2_router', 'flask_router', 'direct_invocation']
+
+
+class RegisterParserTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _restore_registry(self, monkeypatch):
+        monkeypatch.setattr(registry, '_registered_parsers', [])
+        monkeypatch.setattr(registry, '_source_parsers', None)
+
+    def test_registered_parsers_run_only_when_applicable(self):
+        parse = MagicMock(return_value=[])
+        registry.register_parser(registry.SourceParser(
+            'my_framework', parse, registry.imports_any('my_framework')))
+
+        framework_module = _get_module('import my_framework.routes\n')
+        plain_module = _get_module('import os\n')
+
+        assert 'my_framework' in [
+            parser.name for parser in
+            registry.get_applicable_parsers(framework_module)]
+        assert 'my_framework' not in [
+            parser.name for parser in
+            registry.get_applicable_parsers(plain_module)]
+
+    def test_registered_parsers_are_ordered_by_priority(self):
+        registry.register_parser(registry.SourceParser(
+            'my_framework', MagicMock(), lambda module: True))
+
+        names = [parser.name for parser in registry.get_source_parsers()]
+
+        assert names.index('flask_router') < names.index('my_framework')
+        assert names.index('my_framework') < names.index('direct_invocation')
@@ -15,8 +15,9 @@
 
 import ast
 import os
+import re
 import sys
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from ast_parser.core import constants as core_constants
 
@@ -46,37 +47,202 @@ def _get_test_nodes(parsed_nodes: List[Any]) -> List[Any]:
             python_constants.TEST_METHOD_REGEX.search(node.name)]
 
 
-def get_test_methods(test_path: str) -> List[Any]:
+# Matches the start of every top-level (i.e. unindented) line
+# that isn't blank or a comment
+_TOP_LEVEL_LINE_REGEX = re.compile(r'^(?=[^ \t\r\n#])', re.MULTILINE)
+
+_TOP_LEVEL_KEYWORD_REGEX = re.compile(
+    r'(?P<decorator>@)'
+    r'|(?:async[ \t]+)?def[ \t]+(?P<def_name>\w+)'
+    r'|class[ \t]+(?P<class_name>\w+)'
+)
+
+# Matches string literals and comments (which may contain anything),
+# as well as the starts of unterminated strings
+_STRING_OR_COMMENT_REGEX = re.compile(r"""
+    [rRbBuUfF]{0,2}(?:
+        '{3}(?:\\[\s\S]|[^\\])*?'{3}
+      | "{3}(?:\\[\s\S]|[^\\])*?"{3}
+      | '(?:\\[\s\S]|[^'\\\n])*'
+      | "(?:\\[\s\S]|[^"\\\n])*"
+    )
+  | \#[^\n]*
+  | (?P<unterminated>['"])
+""", re.VERBOSE)
+
+
+class _UnusualSourceError(Exception):
+    """Raised when a test file can't be parsed selectively"""
+
+
+def _get_test_blocks(content: str) -> List[Tuple[int, int, int]]:
+    """Find the top-level blocks of a test file that may contain tests
+
+    These blocks are top-level methods whose names match TEST_METHOD_REGEX,
+    and top-level classes (which may contain such methods).
+
+    Args:
+        content: the contents of a Python test file
+
+    Returns:
+        A list of (start line, start offset, end offset) tuples for each
+        block, in file order. Blocks include their decorators.
+    """
+    line_starts = [
+        match.start() for match in _TOP_LEVEL_LINE_REGEX.finditer(content)]
+    line_starts.append(len(content))
+
+    blocks = []
+    decorator_idx = None
+
+    # Line numbers are counted incrementally
+    line_no = 1
+    line_no_offset = 0
+
+    for idx, line_start in enumerate(line_starts[:-1]):
+        match = _TOP_LEVEL_KEYWORD_REGEX.match(content, line_start)
+        if not match:
+            # Decorators can only be followed by methods and classes,
+            # so any lines in between must continue the decorators
+            continue
+
+        if match.lastgroup == 'decorator':
+            if decorator_idx is None:
+                decorator_idx = idx
+            continue
+
+        start_idx = idx if decorator_idx is None else decorator_idx
+        decorator_idx = None
+
+        def_name = match.group('def_name')
+        if def_name and \
+                not python_constants.TEST_METHOD_REGEX.search(def_name):
+            continue
+
+        start_offset = line_starts[start_idx]
+        line_no += content.count('\n', line_no_offset, start_offset)
+        line_no_offset = start_offset
+
+        blocks.append((line_no, start_offset, line_starts[idx + 1]))
+
+    return blocks
+
+
+def _verify_outside_strings(
+    content: str,
+    blocks: List[Tuple[int, int, int]]
+) -> None:
+    """Verify that no block begins inside a string literal
+
+    (Blocks themselves are syntactically complete once parsed, so only the
+    code *between* them needs to be checked.)
+
+    Args:
+        content: the contents of a Python test file
+        blocks: the file's blocks, as returned by _get_test_blocks()
+
+    Raises:
+        _UnusualSourceError: if a block begins inside a string literal
+    """
+    region_start = 0
+    for _, block_start, block_end in blocks:
+        match = _STRING_OR_COMMENT_REGEX.search(content, region_start)
+        while match and match.start() < block_start:
+            if match.end() > block_start or match.group('unterminated'):
+                raise _UnusualSourceError('block inside string literal')
+
+            match = _STRING_OR_COMMENT_REGEX.search(content, match.end())
+
+        region_start = block_end
+
+
+def _parse_test_nodes_selectively(content: str) -> List[Any]:
+    """Parse only the parts of a Python test file that may contain tests
+
+    Test methods can only be top-level methods or class methods, so the
+    remainder of a test file (such as test fixture data) is skipped. The
+    returned nodes are equivalent to those produced by a full parse
+    (including their line numbers and column offsets).
+
+    Args:
+        content: the contents of a Python test file
+
+    Returns:
+        List[ast.AST]: the file's possible test nodes, in file order
+
+    Raises:
+        _UnusualSourceError: if the file can't be parsed selectively
+    """
+    # Form feeds (and byte-order marks) affect how lines are tokenized
+    if '\f' in content or '\ufeff' in content:
+        raise _UnusualSourceError('unusual whitespace')
+
+    blocks = _get_test_blocks(content)
+    _verify_outside_strings(content, blocks)
+
+    parsed_nodes = []
+    for start_line, start_offset, end_offset in blocks:
+        # Pad blocks with empty lines to keep line numbers intact
+        # (This is much faster than adjusting them after parsing)
+        padding = '\n' * (start_line - 1)
+
+        try:
+            nodes = ast.parse(
+                padding + content[start_offset:end_offset]).body
+        except SyntaxError:
+            raise _UnusualSourceError('could not parse block')
+
+        if len(nodes) != 1:
+            raise _UnusualSourceError('block contains multiple statements')
+
+        parsed_nodes.append(nodes[0])
+
+    return _get_test_nodes(parsed_nodes)
+
+
+def get_test_methods(
+    test_path: str,
+    content: Optional[str] = None
+) -> List[Any]:
     """Gets the top-level methods within a test file
 
+    Only the file's test methods are parsed if possible. Files with an
+    unusual structure are parsed in their entirety instead.
+
     Args:
         source_path: path to the file to process
+        content: (Optional) the file's (already-read) contents
 
     Returns:
         List[ast.AST]: a list of the top-level
                        methods within the provided file
     """
     try:
-        with open(test_path, 'r') as file:
-            content = ''.join(file.readlines())
-            parsed_nodes = list(ast.iter_child_nodes(ast.parse(content)))
-
+        if content is None:
+            with open(test_path, 'r') as file:
+                content = ''.join(file.readlines())
+
+        try:
+            test_nodes = _parse_test_nodes_selectively(content)
+        except _UnusualSourceError:
+            parsed_nodes = list(
+                ast.iter_child_nodes(ast.parse(content)))
             test_nodes = _get_test_nodes(parsed_nodes)
 
-            for node in test_nodes:
-                node.test_path = os.path.abspath(test_path)
+        for node in test_nodes:
+            node.test_path = os.path.abspath(test_path)
 
-            # Verify file contains no duplicate method names
-            # (Only relevant for test methods wrapped in classes)
-            used_test_names = set()
-            for node in test_nodes:
-                if node.name in used_test_names:
-                    raise ValueError(
-                        f'Test name {node.name} in file'
-                        f' {test_path} must be unique.')
-                used_test_names.add(node.name)
+        # Verify file contains no duplicate method names
+        # (Only relevant for test methods wrapped in classes)
+        used_test_names = set()
+        for node in test_nodes:
+            if node.name in used_test_names:
+                raise ValueError(
+                    f'Test name {node.name} in file'
+                    f' {test_path} must be unique.')
+            used_test_names.add(node.name)
 
-            return test_nodes
+        return test_nodes
     except IOError as err:
         # Fail gracefully if a file can't be read
         # (This shouldn't happen, but if it doess
@@ -89,6 +255,233 @@ def get_test_methods(test_path: str) -> List[Any]:
         return []
 
 
+def _get_string_value(node: Any) -> Optional[str]:
+    """Get the value of a string-literal AST node
+
+    Args:
+        node (ast.AST): an AST node
+
+    Returns:
+        The node's string value, or None if it isn't a string literal
+    """
+    # Python < 3.8 represents string literals with ast.Str (and .s)
+    value = getattr(node, 'value', getattr(node, 's', None))
+    if isinstance(node, ast.expr) and isinstance(value, str):
+        return value
+
+    return None
+
+
+# Test-key visitors take a node, a stack of nodes still to be
+# visited and a list of the test keys found so far. They add the
+# node's test key (if any) to the latter, and push the node's
+# children (in *reverse* source order) onto the former.
+_Visitor = Callable[[Any, List[Any], List[drift_test.DriftTest]], None]
+
+
+def _visit_attribute(
+    expr: ast.Attribute,
+    pending: List[Any],
+    results: List[drift_test.DriftTest]
+) -> None:
+    if isinstance(expr.value, ast.Name):
+        # Direct method invocation
+        results.append(drift_test.DriftTest(
+            class_name=expr.value.id,
+            method_name=expr.attr
+        ))
+    else:
+        pending.append(expr.value)
+
+
+def _visit_call(
+    expr: ast.Call,
+    pending: List[Any],
+    results: List[drift_test.DriftTest]
+) -> None:
+    func = expr.func
+    url = _get_string_value(expr.args[0]) if expr.args else None
+
+    # HTTP-route invoked methods
+    # (both flask and webapp2)
+    if isinstance(func, ast.Attribute) and \
+       isinstance(func.value, ast.Name) and \
+       func.value.id in core_constants.HTTP_CLASS_NAMES and \
+       func.attr in core_constants.HTTP_METHOD_NAMES and \
+       url is not None:
+        results.append(drift_test.DriftTest(
+            url=url.split('?')[0],
+            http_method=func.attr
+        ))
+    else:
+        pending.append(func)
+
+
+def _push_comparison_operands(test: Any, pending: List[Any]) -> None:
+    # Only comparisons (e.g. "assert snippet() == value") are inspected
+    if isinstance(test, ast.Compare):
+        pending.append(test.left)
+        pending.append(test.comparators[0])
+
+
+def _visit_value(
+    expr: Any,
+    pending: List[Any],
+    results: List[drift_test.DriftTest]
+) -> None:
+    pending.append(expr.value)
+
+
+def _visit_test(
+    expr: Any,
+    pending: List[Any],
+    results: List[drift_test.DriftTest]
+) -> None:
+    # ast.Assert and ast.IfExp
+    _push_comparison_operands(expr.test, pending)
+
+
+def _visit_block(
+    stmt: Any,
+    pending: List[Any],
+    results: List[drift_test.DriftTest]
+) -> None:
+    # ast.If, ast.While, ast.For and ast.AsyncFor
+    pending.extend(reversed(stmt.orelse))
+    pending.extend(reversed(stmt.body))
+
+    if not isinstance(stmt, (ast.For, ast.AsyncFor)):
+        _push_comparison_operands(stmt.test, pending)
+
+
+def _visit_try(
+    stmt: Any,
+    pending: List[Any],
+    results: List[drift_test.DriftTest]
+) -> None:
+    # ast.Try and ast.TryStar
+    pending.extend(reversed(stmt.finalbody))
+    pending.extend(reversed(stmt.orelse))
+
+    # Exception handler bodies are skipped: snippets called within them
+    # are only invoked if a test fails. (Handler types are still visited.)
+    pending.extend(handler.type for handler in reversed(stmt.handlers)
+                   if handler.type)
+
+    pending.extend(reversed(stmt.body))
+
+
+def _visit_with(
+    stmt: Any,
+    pending: List[Any],
+    results: List[drift_test.DriftTest]
+) -> None:
+    # ast.With and ast.AsyncWith
+    pending.extend(reversed(stmt.body))
+    pending.extend(item.context_expr for item in reversed(stmt.items))
+
+
+def _visit_match(
+    stmt: Any,
+    pending: List[Any],
+    results: List[drift_test.DriftTest]
+) -> None:
+    # ast.Match
+    for case in reversed(stmt.cases):
+        pending.extend(reversed(case.body))
+        if case.guard:
+            _push_comparison_operands(case.guard, pending)
+
+    pending.append(stmt.subject)
+
+
+def _visit_body(
+    stmt: Any,
+    pending: List[Any],
+    results: List[drift_test.DriftTest]
+) -> None:
+    # Function and class definitions
+    pending.extend(reversed(stmt.body))
+
+
+# A map from AST node types to their test-key visitors
+# (Node types not listed here contain no test keys.)
+_TEST_KEY_VISITORS: Dict[type, _Visitor] = {
+    ast.Attribute: _visit_attribute,
+    ast.Call: _visit_call,
+
+    ast.Expr: _visit_value,
+    ast.Assign: _visit_value,
+    ast.AugAssign: _visit_value,
+    ast.AnnAssign: _visit_value,
+    ast.Return: _visit_value,
+    ast.Subscript: _visit_value,
+    ast.Starred: _visit_value,
+    ast.keyword: _visit_value,
+    ast.Await: _visit_value,
+    ast.Yield: _visit_value,
+    ast.YieldFrom: _visit_value,
+    ast.FormattedValue: _visit_value,
+    ast.DictComp: _visit_value,
+
+    ast.Assert: _visit_test,
+    ast.IfExp: _visit_test,
+
+    ast.If: _visit_block,
+    ast.While: _visit_block,
+    ast.For: _visit_block,
+    ast.AsyncFor: _visit_block,
+    ast.Try: _visit_try,
+
+    ast.With: _visit_with,
+    ast.AsyncWith: _visit_with,
+    ast.FunctionDef: _visit_body,
+    ast.AsyncFunctionDef: _visit_body,
+    ast.ClassDef: _visit_body,
+}
+
+# ast.NamedExpr (the "walrus" operator) was added in Python 3.8
+if hasattr(ast, 'NamedExpr'):
+    _TEST_KEY_VISITORS[ast.NamedExpr] = _visit_value
+
+# "match" statements were added in Python 3.10, and "except*" in 3.11
+for _node_name, _visitor in (('Match', _visit_match),
+                             ('TryStar', _visit_try)):
+    if hasattr(ast, _node_name):
+        _TEST_KEY_VISITORS[getattr(ast, _node_name)] = _visitor
+
+
+def _get_test_keys(
+    stmts: List[Any]
+) -> List[drift_test.DriftTest]:
+    """Find the test keys within a list of statements
+
+    This method walks the given statements (and their children) iteratively,
+    in source order. Each node is visited at most once.
+
+    Args:
+        stmts (List[ast.AST]): the statements to search for test keys within
+
+    Returns: a list of test keys within the given statements
+             (may contain duplicates)
+    """
+    results: List[drift_test.DriftTest] = []
+
+    # Nodes are popped from the end, so push them in reverse order
+    pending = list(reversed(stmts))
+    visitors = _TEST_KEY_VISITORS
+
+    while pending:
+        node = pending.pop()
+
+        # Non-node values (such as None or constants) have no visitor
+        visitor = visitors.get(type(node))
+        if visitor:
+            visitor(node, pending, results)
+
+    return results
+
+
 def get_test_key_to_snippet_map(
     test_methods: List[Any]
 ) -> Dict[Tuple[str, str], List[Tuple[str, str]]]:
@@ -107,74 +500,13 @@ def get_test_key_to_snippet_map(
     """
     test_to_method_key_map: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
 
-    def __recursor__(expr: Any) -> List[drift_test.DriftTest]:
-        """Recursively find test keys within an expression
-
-        Args:
-            expr (ast.AST): the AST node to search for test keys within
-
-        Returns: a list of test keys within the given expression
-        """
-        type_str = str(type(expr))
-        is_func = hasattr(expr, 'func')
-
-        if '.Attribute' in type_str and hasattr(expr.value, 'id'):
-            # Direct method invocation
-            return [drift_test.DriftTest(
-                class_name=expr.value.id,
-                method_name=expr.attr
-            )]
-
-        if is_func and hasattr(expr.func, 'value'):
-            # HTTP-route invoked methods
-            # (both flask and webapp2)
-            func = expr.func
-
-            if hasattr(func.value, 'id') and \
-               func.value.id in core_constants.HTTP_CLASS_NAMES and \
-               func.attr in core_constants.HTTP_METHOD_NAMES and \
-               hasattr(expr.args[0], 's'):
-                return [drift_test.DriftTest(
-                    url=expr.args[0].s.split('?')[0],
-                    http_method=func.attr
-                )]
-
-        if hasattr(expr, 'value'):
-            return __recursor__(expr.value)
-
-        if is_func:
-            return __recursor__(expr.func)
-
-        if hasattr(expr, 'test') and hasattr(expr.test, 'comparators'):
-            results = []
-            results += __recursor__(expr.test.comparators[0])
-            results += __recursor__(expr.test.left)
-            return results
-
-        results = []
-        if hasattr(expr, 'finalbody'):
-            # Used in try-catch-finally statements
-            for subexpr in expr.finalbody:
-                results += [subexpr for subexpr
-                            in __recursor__(subexpr) if subexpr]
-
-        if core_constants.BODY_IS_ARRAY_REGEX.search(type_str):
-            for subexpr in expr.body:
-                results += [subexpr for subexpr
-                            in __recursor__(subexpr) if subexpr]
-
-        return results  # may contain duplicates
-
     for method in test_methods:
-        for subexpr in method.body:
-            children_drift_data = [child_node for child_node
-                                   in __recursor__(subexpr) if child_node]
-            for child_drift_test in children_drift_data:
-                child_key = child_drift_test.get_key_tuple()
-
-                if child_key not in test_to_method_key_map:
-                    test_to_method_key_map[child_key] = []
-                test_to_method_key_map[child_key].append(
-                    (method.test_path, method.name))
+        for child_drift_test in _get_test_keys(method.body):
+            child_key = child_drift_test.get_key_tuple()
+
+            if child_key not in test_to_method_key_map:
+                test_to_method_key_map[child_key] = []
+            test_to_method_key_map[child_key].append(
+                (method.test_path, method.name))
 
     return test_to_method_key_map
@@ -13,7 +13,9 @@
 # limitations under the License.
 
 
+import ast
 import os
+import sys
 import unittest
 
 import pytest
@@ -178,3 +180,152 @@ class GetTestToMethodMapTryFinallyTests(unittest.TestCase):
 
         entry = self.test_map[key]
         self.assertEqual(entry, [(self.path, 'test_try_finally')])
+
+
+class GetTestToMethodMapStatementBodyTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _test_map(self):
+        self.path = '/fake/statement_body_test.py'
+
+        test_methods = list(ast.iter_child_nodes(ast.parse(
+            'def test_bodies():\n'
+            '    if flag:\n'
+            '        main.if_method()\n'
+            '    else:\n'
+            '        main.else_method()\n'
+            '    while flag:\n'
+            '        main.while_method()\n'
+            '    def helper():\n'
+            '        return main.nested_method()\n'
+            '    with mock.patch("main.os"), main.context_method():\n'
+            '        main.with_method()\n'
+            '    try:\n'
+            '        main.try_method()\n'
+            '    except main.SnippetError:\n'
+            '        main.except_method()\n'
+        )))
+        for method in test_methods:
+            method.test_path = self.path
+
+        self.test_map = (
+            test_parser.get_test_key_to_snippet_map(test_methods))
+
+    def test_finds_tests_in_if_and_else_clauses(self):
+        assert ('main', 'if_method') in self.test_map
+        assert ('main', 'else_method') in self.test_map
+
+    def test_finds_tests_in_while_loops(self):
+        assert ('main', 'while_method') in self.test_map
+
+    def test_finds_tests_in_nested_functions(self):
+        assert ('main', 'nested_method') in self.test_map
+
+    def test_finds_tests_in_with_blocks(self):
+        assert ('main', 'with_method') in self.test_map
+
+    def test_finds_tests_in_with_items(self):
+        assert ('main', 'context_method') in self.test_map
+        assert ('mock', 'patch') in self.test_map
+
+    def test_finds_tests_in_exception_handler_types(self):
+        assert ('main', 'SnippetError') in self.test_map
+        assert ('main', 'except_method') not in self.test_map
+
+    def test_visits_each_statement_once(self):
+        for entry in self.test_map.values():
+            assert entry == [(self.path, 'test_bodies')]
+
+    @pytest.mark.skipif(sys.version_info < (3, 10),
+                        reason='"match" statements require Python 3.10+')
+    def test_finds_tests_in_match_cases(self):
+        test_methods = list(ast.iter_child_nodes(ast.parse(
+            'def test_match():\n'
+            '    match main.subject_method():\n'
+            '        case 1 if main.guard_method() == 1:\n'
+            '            main.case_method()\n'
+            '        case _:\n'
+            '            main.default_method()\n'
+        )))
+        for method in test_methods:
+            method.test_path = self.path
+
+        test_map = test_parser.get_test_key_to_snippet_map(test_methods)
+
+        for method_name in ('subject_method', 'guard_method',
+                            'case_method', 'default_method'):
+            assert test_map[('main', method_name)] == [
+                (self.path, 'test_match')]
+
+
+class SelectiveParsingTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _tmpdir(self, tmpdir):
+        self.tmpdir = str(tmpdir)
+
+    def _assert_matches_full_parse(self, content):
+        full_nodes = test_parser._get_test_nodes(
+            list(ast.iter_child_nodes(ast.parse(content))))
+        selective_nodes = test_parser._parse_test_nodes_selectively(content)
+
+        assert (
+            [ast.dump(node, include_attributes=True) for node in full_nodes]
+            ==
+            [ast.dump(node, include_attributes=True)
+             for node in selective_nodes]
+        )
+
+    def test_matches_full_parse(self):
+        for test_file in (
+            'parser/class_wrapped_tests/class_wrapped_test.py',
+            'parser/http/http_test.py',
+            'parser/try_finally/try_finally_test.py',
+            'new_tests/fixture_detection_test.py',
+        ):
+            with open(os.path.join(TEST_DATA_DIR, test_file), 'r') as file:
+                self._assert_matches_full_parse(file.read())
+
+    def test_handles_multiline_decorators(self):
+        self._assert_matches_full_parse(
+            '@pytest.mark.parametrize("value", [\n'
+            '    1,\n'
+            '])\n'
+            'def test_decorated(value):\n'
+            '    main.method(value)\n'
+        )
+
+    def test_skips_module_level_code(self):
+        nodes = test_parser._parse_test_nodes_selectively(
+            'DATA = [1, 2,, 3]  # Not valid Python\n'
+            '\n'
+            'def test_method():\n'
+            '    main.method()\n'
+        )
+
+        assert [node.name for node in nodes] == ['test_method']
+        assert nodes[0].lineno == 3
+
+    def test_rejects_methods_inside_strings(self):
+        with self.assertRaises(test_parser._UnusualSourceError):
+            test_parser._parse_test_nodes_selectively(
+                'DATA = """\n'
+                'def test_fake():\n'
+                '    pass\n'
+                '"""\n'
+            )
+
+    def test_falls_back_to_full_parse(self):
+        path = os.path.join(self.tmpdir, 'fallback_test.py')
+        with open(path, 'w') as file:
+            file.write(
+                'DATA = """\n'
+                'def test_fake():\n'
+                '    pass\n'
+                '"""\n'
+                '\n'
+                'def test_real():\n'
+                '    main.method()\n'
+            )
+
+        test_methods = test_parser.get_test_methods(path)
+
+        assert [method.name for method in test_methods] == ['test_real']
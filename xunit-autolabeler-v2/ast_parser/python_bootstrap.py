@@ -15,21 +15,70 @@
 # limitations under the License.
 
 
+import argparse
 import json
 import os
-import sys
+
+from core import snippet_data_shards
+
+from lib import git_utils
 
 from python import invoker
 
-if len(sys.argv) != 2:
-    raise ValueError('Please specify exactly one [root] directory.')
+parser = argparse.ArgumentParser(
+    description='Generate a polyglot_snippet_data.json file for a directory.')
+parser.add_argument('root_dir', help='Root directory')
+parser.add_argument(
+    '--shard_count', type=int,
+    help=('Split the root directory (by top-level sub-directory) into this '
+          'many shards, and only parse one of them. Merge the resulting '
+          'shard files with "cli_bootstrap.py merge-snippet-data".'))
+parser.add_argument(
+    '--shard_index', type=int,
+    help='The (zero-based) index of the shard to parse.')
+parser.add_argument(
+    '--revision',
+    help=('Parse the root directory as of a git revision (such as a branch '
+          "name or commit SHA), reading files from the repository's object "
+          'store instead of the working tree. Requires --output_file.'))
+parser.add_argument(
+    '--output_file',
+    help=('With --revision, the file to write the snippet data to. (Other '
+          'snippet data is written to the root directory.)'))
+parser.add_argument(
+    '--cache_dir',
+    help=('Directory to cache per-file parser results in. Cache entries are '
+          'keyed by file contents, so the directory can be shared between '
+          'checkouts. Omit to disable caching.'))
+args = parser.parse_args()
+
+root_dir = args.root_dir
+
+if args.revision:
+    if args.shard_count is not None:
+        raise ValueError('Revisions cannot be parsed in shards.')
+    if not args.output_file:
+        raise ValueError('Please specify an --output_file.')
+
+    # Paths are stored relative to the output file's directory
+    output_path = args.output_file
+    with git_utils.GitRevision(root_dir, args.revision) as revision:
+        invoker.get_snippet_data_for_dir(
+            root_dir, output_path, args.cache_dir, revision)
+else:
+    if args.shard_count is None:
+        output_path = os.path.join(root_dir, 'polyglot_snippet_data.json')
+        json_array = invoker.get_json_for_dir(root_dir, args.cache_dir)
+    else:
+        if args.shard_index is None:
+            raise ValueError('Please specify a --shard_index.')
 
-root_dir = sys.argv[1]
-output_path = os.path.join(root_dir, 'polyglot_snippet_data.json')
+        output_path = snippet_data_shards.get_shard_path(
+            root_dir, args.shard_index, args.shard_count)
+        json_array = invoker.get_json_for_shard(
+            root_dir, args.shard_index, args.shard_count, args.cache_dir)
 
-json_array = invoker.get_json_for_dir(root_dir)
-with open(output_path, 'w') as file:
-    json.dump(json_array, file)
+    with open(output_path, 'w') as file:
+        json.dump(json_array, file)
 
 print(f'JSON written to: {output_path}')
-print('Do not move this file!')
@@ -0,0 +1,67 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+
+from ast_parser.core import snippet_data_shards
+
+import pytest
+
+
+_AST_PARSER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_TEST_DIR = os.path.join(_AST_PARSER_DIR, 'core/test_data/parser')
+
+
+class PythonBootstrapTests(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def _root_dir(self, tmpdir):
+        self.root_dir = os.path.join(tmpdir, 'parser')
+        self.cache_dir = os.path.join(tmpdir, 'cache')
+        shutil.copytree(_TEST_DIR, self.root_dir)
+
+    def _run(self, *args):
+        subprocess.run(
+            [sys.executable, 'python_bootstrap.py', self.root_dir, *args],
+            cwd=_AST_PARSER_DIR,
+            env=dict(os.environ,
+                     PYTHONPATH=os.path.dirname(_AST_PARSER_DIR)),
+            stdout=subprocess.DEVNULL,
+            check=True)
+
+    def _read_snippet_names(self, snippet_data_json):
+        return sorted(snippet['name']
+                      for snippet in snippet_data_json['snippets'])
+
+    def test_sharded_runs_match_unsharded_runs(self):
+        for shard_index in range(2):
+            self._run('--shard_count', '2', '--shard_index', str(shard_index),
+                      '--cache_dir', self.cache_dir)
+        self._run()
+
+        merged_json = snippet_data_shards.merge_shards(
+            snippet_data_shards.find_shard_paths(self.root_dir))
+        with open(os.path.join(
+                self.root_dir, 'polyglot_snippet_data.json')) as file:
+            unsharded_json = json.load(file)
+
+        assert self._read_snippet_names(merged_json) == (
+            self._read_snippet_names(unsharded_json))
+        assert os.listdir(self.cache_dir)
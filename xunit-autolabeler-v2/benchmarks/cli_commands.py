@@ -0,0 +1,275 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Time every CLI command on synthetic monorepos of increasing size.
+
+For each size, this benchmark generates a repository (see synthetic_repo),
+then runs python_bootstrap.py and each cli_bootstrap.py command against it
+in a separate process. Every command is run twice with the same --cache_dir:
+a cold run (with an empty cache) and a warm run.
+
+The results are written as JSON, so that they can be compared across
+commits.
+
+Usage (from the xunit-autolabeler-v2 directory):
+    python -m benchmarks.cli_commands [--snippets N ...] [--command C ...]
+        [--output_file F]
+"""
+
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks import synthetic_repo
+
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PYTHON_BOOTSTRAP = os.path.join(_ROOT_DIR, 'ast_parser/python_bootstrap.py')
+_CLI_BOOTSTRAP = os.path.join(_ROOT_DIR, 'cli_bootstrap.py')
+
+DEFAULT_SNIPPET_COUNTS = [1000, 10000, 100000]
+
+# Commands whose output is read by later commands (and
+# so are run, but not timed, if they aren't selected)
+_SETUP_COMMANDS = (
+    'python_bootstrap', 'python_bootstrap (2 shards)', 'export-snippet-db')
+
+
+def _get_commands(
+    repo_dir: str,
+    xunit_dir: str,
+    work_dir: str
+) -> List[Tuple[str, List[List[str]], Optional[str]]]:
+    """Get the commands to time (in the order they must run in)
+
+    Args:
+        repo_dir: the synthetic repository's directory
+        xunit_dir: the directory of the repository's XUnit reports
+        work_dir: a directory for the commands' other output files
+
+    Returns:
+        A list of (name, invocations, stdin path) tuples. Each invocation
+        is a list of arguments, starting with the script to run. (Commands
+        with several invocations are timed as a whole.)
+    """
+    xunit_file = os.path.join(xunit_dir, 'report_0.xml')
+    db_file = os.path.join(work_dir, 'polyglot_snippet_data.db')
+
+    def cli(*args: str) -> List[List[str]]:
+        return [[_CLI_BOOTSTRAP, '--output_file', os.devnull, *args]]
+
+    return [
+        ('python_bootstrap', [[_PYTHON_BOOTSTRAP, repo_dir]], None),
+        ('python_bootstrap (2 shards)',
+         [[_PYTHON_BOOTSTRAP, repo_dir, '--shard_count', '2',
+           '--shard_index', str(shard_index)] for shard_index in range(2)],
+         None),
+        ('merge-snippet-data',
+         cli('merge-snippet-data', '--shard_count', '2', repo_dir), None),
+        ('list-region-tags',
+         cli('list-region-tags', '-d1', '-u1', '-c1', '-f1', repo_dir),
+         None),
+        ('list-source-files', cli('list-source-files', repo_dir), None),
+        ('inject-snippet-mapping',
+         cli('inject-snippet-mapping', repo_dir), xunit_file),
+        ('inject-snippet-mapping --follow',
+         cli('inject-snippet-mapping', '--follow', '--xunit_file',
+             xunit_file, repo_dir), None),
+        ('validate-yaml', cli('validate-yaml', repo_dir), None),
+        ('export-snippet-db',
+         cli('export-snippet-db', '--db_file', db_file, repo_dir), None),
+        ('query',
+         cli('query', '--db_file', db_file, '--tests_for_tag',
+             'sample_0_snippet_0', repo_dir), None),
+        ('diff', cli('diff', '--base', db_file, repo_dir), None),
+        ('select-tests',
+         cli('select-tests', '--changed',
+             'product_0/sample_0/plain_0_2.py', repo_dir), None),
+        ('select-smoke-tests',
+         cli('select-smoke-tests', '--xunit_file', xunit_dir, repo_dir),
+         None),
+        ('aggregate-xunit',
+         cli('aggregate-xunit', '--xunit_file', xunit_dir, repo_dir), None)
+    ]
+
+
+def _run_script(
+    args: List[str],
+    cache_dir: str,
+    stdin_path: Optional[str]
+) -> None:
+    """Run a script in a new process
+
+    Args:
+        args: the script to run, followed by its arguments
+        cache_dir: the cache directory to pass to the script
+        stdin_path: (Optional) a file to use as the script's stdin
+    """
+    # (python_bootstrap.py's imports need the package root on the path)
+    env = dict(os.environ, PYTHONPATH=_ROOT_DIR)
+
+    script, *script_args = args
+    if script == _CLI_BOOTSTRAP:
+        # --cache_dir is a global (pre-command) argument
+        script_args = ['--cache_dir', cache_dir] + script_args
+    else:
+        script_args = script_args + ['--cache_dir', cache_dir]
+
+    with open(stdin_path or os.devnull, 'rb') as stdin:
+        subprocess.run(
+            [sys.executable, script] + script_args,
+            stdin=stdin,
+            stdout=subprocess.DEVNULL,
+            env=env,
+            check=True)
+
+
+def _time_command(
+    invocations: List[List[str]],
+    cache_dir: str,
+    stdin_path: Optional[str]
+) -> float:
+    """Time a command (see _get_commands())
+
+    Returns:
+        The wall-clock duration of the command's invocations, in seconds
+    """
+    start_time = time.perf_counter()
+    for args in invocations:
+        _run_script(args, cache_dir, stdin_path)
+
+    return time.perf_counter() - start_time
+
+
+def benchmark_snippet_count(
+    snippet_count: int,
+    work_dir: str,
+    command_names: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Generate a synthetic repository, and time every CLI command on it
+
+    Args:
+        snippet_count: the number of snippets to generate
+        work_dir: an (empty) directory to generate the repository in
+        command_names: (Optional) the names of the commands to time.
+                       Defaults to every command.
+
+    Returns:
+        The repository's shape and contents, and each command's cold
+        and warm durations (in seconds)
+    """
+    shape = synthetic_repo.RepoShape(snippets=snippet_count)
+    repo_dir = os.path.join(work_dir, 'repo')
+    xunit_dir = os.path.join(work_dir, 'xunit')
+
+    start_time = time.perf_counter()
+    repo_counts = synthetic_repo.generate_repo(repo_dir, shape)
+    repo_counts['xunit_testcases'] = synthetic_repo.generate_xunit_reports(
+        xunit_dir, shape)
+    generate_seconds = time.perf_counter() - start_time
+
+    commands = {}
+    for name, invocations, stdin_path in _get_commands(
+            repo_dir, xunit_dir, work_dir):
+        cache_dir = tempfile.mkdtemp(dir=work_dir, prefix='cache-')
+
+        if command_names and name not in command_names:
+            if name in _SETUP_COMMANDS:
+                _time_command(invocations, cache_dir, stdin_path)
+            continue
+
+        cold_seconds = _time_command(invocations, cache_dir, stdin_path)
+        warm_seconds = _time_command(invocations, cache_dir, stdin_path)
+
+        commands[name] = {
+            'cold_seconds': round(cold_seconds, 3),
+            'warm_seconds': round(warm_seconds, 3)
+        }
+
+    return {
+        'shape': shape._asdict(),
+        'counts': repo_counts,
+        'generate_seconds': round(generate_seconds, 3),
+        'commands': commands
+    }
+
+
+def _get_git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=_ROOT_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True
+        ).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument(
+        '--snippets', type=int, action='append',
+        help=('A repository size (in snippets) to benchmark. Can be '
+              'repeated. Defaults to 1k, 10k and 100k snippets.'))
+    parser.add_argument(
+        '--command', action='append',
+        help=('The name of a command (as listed in the results) to time. '
+              'Can be repeated. Defaults to every command.'))
+    parser.add_argument(
+        '--work_dir',
+        help=('Directory to generate repositories in (and keep them in, '
+              'for inspection). Defaults to a temporary directory.'))
+    parser.add_argument(
+        '--output_file',
+        help='File to write the JSON results to. Omit to use stdout.')
+    args = parser.parse_args()
+
+    results = []
+    for snippet_count in args.snippets or DEFAULT_SNIPPET_COUNTS:
+        if args.work_dir:
+            work_dir = os.path.join(args.work_dir, f'{snippet_count}')
+            os.makedirs(work_dir)
+            results.append(benchmark_snippet_count(
+                snippet_count, work_dir, args.command))
+        else:
+            with tempfile.TemporaryDirectory() as work_dir:
+                results.append(benchmark_snippet_count(
+                    snippet_count, work_dir, args.command))
+
+    output = json.dumps({
+        'commit': _get_git_commit(),
+        'python': platform.python_version(),
+        'results': results
+    }, indent=2)
+
+    if args.output_file:
+        with open(args.output_file, 'w') as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
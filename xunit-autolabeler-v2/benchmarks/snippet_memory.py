@@ -0,0 +1,155 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare the memory used by plain and compact PolyglotDriftData records.
+
+This benchmark generates a synthetic repository's worth of snippet JSON,
+decodes it (so that every record has its own copies of shared strings, as it
+would when read from polyglot_snippet_data.json), and measures the memory
+retained by the resulting list of records. Plain records store their
+collections in lists (as analysis did before records were made compact),
+while compact records are created by analyze.create_snippet_data(). Compact
+records intern their strings and store their collections in (shared) tuples.
+
+Usage (from the xunit-autolabeler-v2 directory):
+    python -m benchmarks.snippet_memory [--snippets N]
+"""
+
+
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from ast_parser.core import analyze
+from ast_parser.core import polyglot_drift_data as pdd
+
+
+SNIPPETS_PER_FILE = 20
+TESTS_PER_SNIPPET = 3
+TEST_FILES_PER_DIR = 2
+
+
+def _generate_snippets(snippet_count: int) -> str:
+    """Generate the JSON for a synthetic repository's snippets
+
+    Args:
+        snippet_count: The number of snippets to generate
+
+    Returns:
+        A JSON-encoded list of snippet dicts
+    """
+    snippets = []
+    for idx in range(snippet_count):
+        dir_idx = idx // SNIPPETS_PER_FILE
+        snippet_dir = (
+            f'/synthetic/repo/product_{dir_idx // 50}/sample_{dir_idx}')
+
+        test_paths = [f'{snippet_dir}/main_{test_idx}_test.py'
+                      for test_idx in range(TEST_FILES_PER_DIR)]
+
+        snippets.append({
+            'name': f'snippet_{idx}',
+            'class_name': 'main',
+            'method_name': f'snippet_{idx}',
+            'source_path': f'{snippet_dir}/main.py',
+            'start_line': idx % 1000,
+            'end_line': idx % 1000 + 10,
+            'parser': 'direct_invocation',
+            'region_tags': [f'sample_{dir_idx}_snippet_{idx}',
+                            f'sample_{dir_idx}_setup'],
+            'test_methods': [
+                [test_paths[test_idx % TEST_FILES_PER_DIR],
+                 f'test_snippet_{idx}_{test_idx}']
+                for test_idx in range(TESTS_PER_SNIPPET)
+            ],
+            'children': ['helper', 'print'],
+            'url': None,
+            'http_methods': [],
+        })
+
+    return json.dumps(snippets)
+
+
+def _measure(
+    snippets_json: str,
+    create_records: Callable[[List[Dict[str, Any]]], List[Any]]
+) -> int:
+    """Measure the memory retained by a list of snippet records
+
+    Args:
+        snippets_json: A JSON-encoded list of snippet dicts
+        create_records: A function that creates records from snippet dicts
+
+    Returns:
+        The number of bytes retained by the list of records
+    """
+    gc.collect()
+    tracemalloc.start()
+
+    records = create_records(json.loads(snippets_json))
+
+    gc.collect()
+    retained_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del records
+    return retained_bytes
+
+
+def _create_plain_records(snippets: List[Dict[str, Any]]) -> List[Any]:
+    records = []
+    for snippet in snippets:
+        snippet['test_methods'] = [
+            tuple(test) for test in snippet['test_methods']]
+        records.append(pdd.PolyglotDriftData(**snippet))
+
+    return records
+
+
+def _create_compact_records(snippets: List[Dict[str, Any]]) -> List[Any]:
+    tuple_methods, _ = analyze.create_snippet_data(snippets, {})
+    return tuple_methods
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--snippets', type=int, default=100000)
+    args = parser.parse_args()
+
+    snippets_json = _generate_snippets(args.snippets)
+
+    results = {}
+    for model, create_records in (
+        ('PolyglotDriftData', _create_plain_records),
+        ('PolyglotDriftData (compact)', _create_compact_records),
+    ):
+        retained_bytes = _measure(snippets_json, create_records)
+        results[model] = {
+            'retained_bytes': retained_bytes,
+            'bytes_per_snippet': round(retained_bytes / args.snippets, 1),
+        }
+
+    results['snippets'] = args.snippets
+    results['compact_to_plain_ratio'] = round(
+        results['PolyglotDriftData (compact)']['retained_bytes'] /
+        results['PolyglotDriftData']['retained_bytes'], 3)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,394 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Generate a synthetic monorepo of Python samples (and XUnit test results).
+
+Samples are laid out like python-docs-samples (product_P/sample_S/...), and
+use the same patterns as the parser's test data: region-tagged functions,
+Flask routes and webapp2 handlers, tests that call them directly or over
+HTTP, and .drift-data.yml files with untested tags, additions and
+explicitly-specified tests.
+
+Usage (from the xunit-autolabeler-v2 directory):
+    python -m benchmarks.synthetic_repo OUTPUT_DIR [--snippets N]
+"""
+
+
+import argparse
+import json
+import os
+from typing import Dict, List, NamedTuple
+
+
+SAMPLES_PER_PRODUCT = 50
+
+# Test case outcomes are assigned round-robin, so that
+# every report includes failures and skipped tests
+_XUNIT_OUTCOMES = ['', '', '', '', '', '', '', '', '<failure message="x"/>',
+                   '<skipped/>']
+
+
+class RepoShape(NamedTuple):
+    # The total number of region-tagged snippets
+    snippets: int
+
+    snippets_per_file: int = 10
+    files_per_sample: int = 4
+
+    # Of each sample's source files, how many are Flask
+    # and webapp2 apps (the rest are plain functions)
+    flask_files_per_sample: int = 1
+    webapp2_files_per_sample: int = 1
+
+    # The number of region tags around each snippet (the first tag is
+    # unique, and the others are shared by the sample's snippets)
+    tags_per_snippet: int = 2
+
+    tests_per_snippet: int = 2
+    yaml_entries_per_sample: int = 3
+
+    # The number of XUnit reports, each with one test case per test
+    xunit_reports: int = 2
+
+
+def _get_file_kind(shape: RepoShape, file_idx: int) -> str:
+    if file_idx < shape.flask_files_per_sample:
+        return 'flask'
+    if file_idx < (shape.flask_files_per_sample +
+                   shape.webapp2_files_per_sample):
+        return 'webapp2'
+    return 'plain'
+
+
+def _get_snippet_tags(
+    shape: RepoShape,
+    sample_idx: int,
+    snippet_idx: int
+) -> List[str]:
+    return [f'sample_{sample_idx}_snippet_{snippet_idx}'] + [
+        f'sample_{sample_idx}_shared_{tag_idx}'
+        for tag_idx in range(shape.tags_per_snippet - 1)]
+
+
+def _wrap_in_tags(code: str, region_tags: List[str]) -> str:
+    starts = ''.join(f'# [START {tag}]\n' for tag in region_tags)
+    ends = ''.join(f'# [END {tag}]\n' for tag in reversed(region_tags))
+    return f'{starts}{code}{ends}\n\n'
+
+
+def _generate_source_file(
+    shape: RepoShape,
+    kind: str,
+    sample_idx: int,
+    snippet_idxs: List[int]
+) -> str:
+    """Generate the source of a sample file
+
+    Args:
+        shape: the shape of the repository
+        kind: one of 'flask', 'webapp2' or 'plain'
+        sample_idx: the (global) index of the file's sample
+        snippet_idxs: the (global) indexes of the file's snippets
+
+    Returns:
+        The Python source code of the file
+    """
+    if kind == 'flask':
+        source = 'from flask import Flask\n\n\napp = Flask(__name__)\n\n\n'
+    elif kind == 'webapp2':
+        source = 'import webapp2\n\n\n'
+    else:
+        source = 'import logging\n\n\n'
+
+    for idx in snippet_idxs:
+        tags = _get_snippet_tags(shape, sample_idx, idx)
+        if kind == 'flask':
+            code = (f"@app.route('/snippet_{idx}')\n"
+                    f'def snippet_{idx}():\n'
+                    f"    return 'Snippet {idx}'\n")
+        elif kind == 'webapp2':
+            code = (f'class Snippet{idx}(webapp2.RequestHandler):\n'
+                    f'    def get(self):\n'
+                    f"        self.response.out.write('Snippet {idx}')\n")
+        else:
+            code = (f'def snippet_{idx}(value=None):\n'
+                    f"    logging.info('Snippet {idx}')\n"
+                    f'    return helper(value)\n')
+
+        source += _wrap_in_tags(code, tags)
+
+    if kind == 'webapp2':
+        routes = ',\n'.join(f"    ('/snippet_{idx}', Snippet{idx})"
+                            for idx in snippet_idxs)
+        source += f'app = webapp2.WSGIApplication([\n{routes}\n])\n'
+    elif kind == 'plain':
+        source += 'def helper(value):\n    return value\n'
+
+    return source
+
+
+def _get_test_name(snippet_idx: int, test_idx: int) -> str:
+    return f'test_snippet_{snippet_idx}_{test_idx}'
+
+
+def _generate_test_file(
+    shape: RepoShape,
+    kind: str,
+    module_name: str,
+    snippet_idxs: List[int]
+) -> str:
+    """Generate the source of a sample file's tests
+
+    Args:
+        shape: the shape of the repository
+        kind: the kind of the sample file (see _generate_source_file())
+        module_name: the sample file's module name
+        snippet_idxs: the (global) indexes of the sample file's snippets
+
+    Returns:
+        The Python source code of the test file
+    """
+    source = f'import pytest\n\nimport {module_name}\n\n\n'
+    if kind == 'flask':
+        source += ('@pytest.fixture\ndef client():\n'
+                   f'    return {module_name}.app.test_client()\n\n\n')
+    elif kind == 'webapp2':
+        source = (f'import pytest\n\nimport {module_name}\n\n'
+                  'import webtest\n\n\n'
+                  '@pytest.fixture\ndef client():\n'
+                  f'    return webtest.TestApp({module_name}.app)\n\n\n')
+
+    for idx in snippet_idxs:
+        for test_idx in range(shape.tests_per_snippet):
+            test_name = _get_test_name(idx, test_idx)
+            if kind == 'plain':
+                source += (f'def {test_name}():\n'
+                           f'    assert {module_name}.snippet_{idx}(1) == 1'
+                           '\n\n\n')
+            else:
+                source += (f'def {test_name}(client):\n'
+                           f"    response = client.get('/snippet_{idx}')\n"
+                           '    assert response.status_code == 200\n\n\n')
+
+    return source
+
+
+def _get_drift_data_entries(
+    shape: RepoShape,
+    sample_idx: int,
+    snippet_idxs: List[int],
+    test_file: str
+) -> List[str]:
+    """Generate the entries of a sample's .drift-data.yml file
+
+    Entries cycle between untested tags, additions and explicitly-specified
+    tests. (Untested and additions tags are declared by _get_config_tags().)
+
+    Args:
+        shape: the shape of the repository
+        sample_idx: the (global) index of the sample
+        snippet_idxs: the (global) indexes of the snippets in test_file
+        test_file: the name of the test file to specify tests from
+
+    Returns:
+        The (YAML-formatted) entries
+    """
+    entries = []
+    for entry_idx in range(shape.yaml_entries_per_sample):
+        config_tag = f'sample_{sample_idx}_config_{entry_idx}'
+        snippet_idx = snippet_idxs[entry_idx % len(snippet_idxs)]
+
+        if entry_idx % 3 == 0:
+            entries.append(f'{config_tag}:\n  tested: false\n')
+        elif entry_idx % 3 == 1:
+            entries.append(f'{config_tag}:\n  additions:\n'
+                           f'    - sample_{sample_idx}_snippet_{snippet_idx}'
+                           '\n')
+        else:
+            entries.append(f'sample_{sample_idx}_snippet_{snippet_idx}:\n'
+                           f"  '{test_file}':\n"
+                           f'    - {_get_test_name(snippet_idx, 0)}\n')
+
+    # (Each region tag can only be listed once)
+    return list(dict.fromkeys(entries))
+
+
+def _get_config_tags(shape: RepoShape, sample_idx: int) -> List[str]:
+    # Tags that surround settings (rather than methods), and
+    # so are only known to the AST parser via .drift-data.yml
+    return [f'sample_{sample_idx}_config_{entry_idx}'
+            for entry_idx in range(shape.yaml_entries_per_sample)
+            if entry_idx % 3 != 2]
+
+
+def generate_repo(root_dir: str, shape: RepoShape) -> Dict[str, int]:
+    """Write a synthetic monorepo of Python samples
+
+    Args:
+        root_dir: the directory to write the repository to
+        shape: the shape of the repository
+
+    Returns:
+        The number of files, snippets, region tags, tests, HTTP routes and
+        .drift-data.yml entries in the repository
+    """
+    counts = dict.fromkeys(
+        ['source_files', 'test_files', 'snippets', 'region_tags', 'tests',
+         'routes', 'yaml_entries'], 0)
+
+    snippets_per_sample = shape.snippets_per_file * shape.files_per_sample
+    sample_count = -(-shape.snippets // snippets_per_sample)
+
+    for sample_idx in range(sample_count):
+        sample_dir = os.path.join(
+            root_dir,
+            f'product_{sample_idx // SAMPLES_PER_PRODUCT}',
+            f'sample_{sample_idx}')
+        os.makedirs(sample_dir, exist_ok=True)
+
+        first_idx = sample_idx * snippets_per_sample
+        sample_snippet_idxs = list(range(
+            first_idx, min(first_idx + snippets_per_sample, shape.snippets)))
+
+        for file_idx in range(shape.files_per_sample):
+            snippet_idxs = sample_snippet_idxs[
+                file_idx * shape.snippets_per_file:
+                (file_idx + 1) * shape.snippets_per_file]
+            if not snippet_idxs:
+                break
+
+            kind = _get_file_kind(shape, file_idx)
+            module_name = f'{kind}_{sample_idx}_{file_idx}'
+
+            source = _generate_source_file(
+                shape, kind, sample_idx, snippet_idxs)
+            if file_idx == 0:
+                source += ''.join(
+                    _wrap_in_tags(f'SETTING_{tag_idx} = {tag_idx}\n', [tag])
+                    for tag_idx, tag in enumerate(
+                        _get_config_tags(shape, sample_idx)))
+            test_source = _generate_test_file(
+                shape, kind, module_name, snippet_idxs)
+
+            with open(os.path.join(sample_dir, f'{module_name}.py'),
+                      'w') as file:
+                file.write(source)
+            with open(os.path.join(sample_dir, f'{module_name}_test.py'),
+                      'w') as file:
+                file.write(test_source)
+
+            counts['source_files'] += 1
+            counts['test_files'] += 1
+            if kind != 'plain':
+                counts['routes'] += len(snippet_idxs)
+
+            if file_idx == 0:
+                entries = _get_drift_data_entries(
+                    shape, sample_idx, snippet_idxs,
+                    f'{module_name}_test.py')
+                with open(os.path.join(sample_dir, '.drift-data.yml'),
+                          'w') as file:
+                    file.write('\n'.join(entries))
+
+                counts['yaml_entries'] += len(entries)
+
+        counts['snippets'] += len(sample_snippet_idxs)
+        counts['tests'] += len(sample_snippet_idxs) * shape.tests_per_snippet
+        counts['region_tags'] += (
+            len(sample_snippet_idxs) + shape.tags_per_snippet - 1 +
+            len(_get_config_tags(shape, sample_idx)))
+
+    return counts
+
+
+def generate_xunit_reports(
+    xunit_dir: str,
+    shape: RepoShape
+) -> int:
+    """Write XUnit test results for a synthetic monorepo's tests
+
+    The results are formatted like pytest's, with one <testsuite> per
+    sample directory.
+
+    Args:
+        xunit_dir: the directory to write the reports to
+        shape: the shape of the repository (see generate_repo())
+
+    Returns:
+        The total number of test cases in the reports
+    """
+    os.makedirs(xunit_dir, exist_ok=True)
+
+    snippets_per_sample = shape.snippets_per_file * shape.files_per_sample
+    testcase_count = 0
+
+    for report_idx in range(shape.xunit_reports):
+        outcome_idx = report_idx
+        with open(os.path.join(xunit_dir, f'report_{report_idx}.xml'),
+                  'w') as file:
+            file.write('<?xml version="1.0" encoding="utf-8"?><testsuites>')
+
+            for first_idx in range(0, shape.snippets, snippets_per_sample):
+                sample_idx = first_idx // snippets_per_sample
+                file.write(f'<testsuite name="sample_{sample_idx}">')
+
+                for idx in range(first_idx, min(
+                        first_idx + snippets_per_sample, shape.snippets)):
+                    file_idx = (idx - first_idx) // shape.snippets_per_file
+                    class_name = (
+                        f'product_{sample_idx // SAMPLES_PER_PRODUCT}.'
+                        f'sample_{sample_idx}.'
+                        f'{_get_file_kind(shape, file_idx)}_{sample_idx}_'
+                        f'{file_idx}_test')
+
+                    for test_idx in range(shape.tests_per_snippet):
+                        outcome = _XUNIT_OUTCOMES[
+                            outcome_idx % len(_XUNIT_OUTCOMES)]
+                        outcome_idx += 1
+
+                        file.write(
+                            f'<testcase classname="{class_name}" '
+                            f'name="{_get_test_name(idx, test_idx)}" '
+                            f'time="0.{(idx + test_idx) % 1000:03}">'
+                            f'{outcome}</testcase>')
+                        testcase_count += 1
+
+                file.write('</testsuite>')
+
+            file.write('</testsuites>')
+
+    return testcase_count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('output_dir')
+    for field, default in RepoShape._field_defaults.items():
+        parser.add_argument(f'--{field}', type=int, default=default)
+    parser.add_argument('--snippets', type=int, default=1000)
+    args = parser.parse_args()
+
+    shape = RepoShape(**{field: getattr(args, field)
+                         for field in RepoShape._fields})
+
+    counts = generate_repo(os.path.join(args.output_dir, 'repo'), shape)
+    counts['xunit_testcases'] = generate_xunit_reports(
+        os.path.join(args.output_dir, 'xunit'), shape)
+
+    print(json.dumps(counts, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# Copyright 2020 Google LLC. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Time test-key extraction on large, generated Python test modules.
+
+Each generated test method invokes snippets directly, via HTTP clients and
+within assertions, "try" blocks, "with" blocks and loops.
+
+Usage (from the xunit-autolabeler-v2 directory):
+    python -m benchmarks.test_key_extraction [--tests N] [--repeat N]
+"""
+
+
+import argparse
+import ast
+import json
+import time
+from typing import Any, List
+
+from ast_parser.python import test_parser
+
+
+_TEST_METHOD_TEMPLATE = """
+def test_snippet_{idx}(capsys):
+    main.snippet_{idx}()
+    result = main.helper_{idx}(value=1)
+    assert main.compute_{idx}() == result
+    with mock.patch('main.client'):
+        for _ in range(3):
+            main.loop_{idx}()
+    try:
+        response = client.get('/route_{idx}?param=value')
+    finally:
+        main.cleanup_{idx}()
+    assert response.status_code == 200
+"""
+
+
+def _generate_test_methods(test_count: int) -> List[Any]:
+    """Generate (and parse) a test module with the given number of tests
+
+    Args:
+        test_count: The number of test methods to generate
+
+    Returns:
+        List[ast.AST]: the module's test methods
+    """
+    source = ''.join(_TEST_METHOD_TEMPLATE.format(idx=idx)
+                     for idx in range(test_count))
+
+    test_methods = list(ast.iter_child_nodes(ast.parse(source)))
+    for method in test_methods:
+        method.test_path = '/synthetic/main_test.py'
+
+    return test_methods
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--tests', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    test_methods = _generate_test_methods(args.tests)
+
+    timings = []
+    for _ in range(args.repeat):
+        start_time = time.perf_counter()
+        test_map = test_parser.get_test_key_to_snippet_map(test_methods)
+        timings.append(time.perf_counter() - start_time)
+
+    print(json.dumps({
+        'tests': args.tests,
+        'test_keys': len(test_map),
+        'best_seconds': round(min(timings), 4),
+        'mean_seconds': round(sum(timings) / len(timings), 4),
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
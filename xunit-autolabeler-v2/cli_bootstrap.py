@@ -14,11 +14,27 @@
 
 
 import argparse
+import contextlib
 import os
 import sys
-from typing import Any, List
+from typing import Any, List, Optional
 
-from ast_parser.core import cli
+from ast_parser.core import analyze, cli
+from ast_parser.lib import git_utils
+from ast_parser.python import invoker
+
+
+# Commands that can analyze a git revision (rather than the working tree)
+_REVISION_COMMANDS = (
+    'list-region-tags',
+    'list-source-files',
+    'inject-snippet-mapping',
+    'export-snippet-db',
+    'diff',
+    'select-tests',
+    'select-smoke-tests',
+    'aggregate-xunit'
+)
 
 
 def _generate_list_region_tags_parser(main_parser: Any) -> None:
@@ -85,6 +101,323 @@ def _generate_list_source_files_parser(main_parser: Any) -> None:
         help='Display files where ({all, some, no}) methods are tested)')
 
 
+def _generate_inject_snippet_mapping_parser(main_parser: Any) -> None:
+    """Helper function that creates a parser for inject_snippet_mapping
+
+    Args:
+        main_parser: the root-level parser object to add
+                     inject_snippet_mapping's sub-arguments to
+    """
+    subparser = main_parser.add_parser(
+        'inject-snippet-mapping', help=cli.inject_snippet_mapping.__doc__)
+    subparser.add_argument(
+        '--xunit_file',
+        help='XUnit test result file to read. Defaults to stdin.')
+    subparser.add_argument(
+        '--follow',
+        action='store_true',
+        help=('Read XUnit test results as they are written (to a pipe, or '
+              'to a growing file), and write out each test case as soon as '
+              'it is complete.'))
+    subparser.add_argument(
+        '--idle_timeout',
+        type=float,
+        help=('With --follow, the number of seconds to wait for a growing '
+              'file before treating it as complete. Defaults to waiting '
+              'until its XUnit document ends.'))
+
+
+def _generate_merge_snippet_data_parser(main_parser: Any) -> None:
+    """Helper function that creates a parser for merge_snippet_data
+
+    Args:
+        main_parser: the root-level parser object to add
+                     merge_snippet_data's sub-arguments to
+    """
+    subparser = main_parser.add_parser(
+        'merge-snippet-data', help=cli.merge_snippet_data.__doc__)
+    subparser.add_argument(
+        '--shard_count',
+        type=int,
+        help=('The number of shards the root directory was parsed in. '
+              'Shard files left over from runs with other shard counts '
+              'are ignored. Omit to merge every shard file.'))
+
+
+def _generate_export_snippet_db_parser(main_parser: Any) -> None:
+    """Helper function that creates a parser for export_snippet_db
+
+    Args:
+        main_parser: the root-level parser object to add export_snippet_db's
+                     sub-arguments to
+    """
+    subparser = main_parser.add_parser(
+        'export-snippet-db', help=cli.export_snippet_db.__doc__)
+    subparser.add_argument(
+        '--db_file',
+        help=('Database file to write. Defaults to polyglot_snippet_data.db '
+              'in the root directory.'))
+
+
+def _generate_query_parser(main_parser: Any) -> None:
+    """Helper function that creates a parser for query_snippet_db
+
+    Args:
+        main_parser: the root-level parser object to add query_snippet_db's
+                     sub-arguments to
+    """
+    subparser = main_parser.add_parser(
+        'query', help=cli.query_snippet_db.__doc__)
+    subparser.add_argument(
+        '--db_file',
+        help=('Database file (created by export-snippet-db) to query. '
+              'Defaults to polyglot_snippet_data.db in the root directory.'))
+
+    query = subparser.add_mutually_exclusive_group(required=True)
+    query.add_argument(
+        '--tests_for_tag',
+        metavar='TAG',
+        help='List the tests that cover a region tag')
+    query.add_argument(
+        '--tags_for_test',
+        metavar='TEST',
+        help=('List the region tags that a test covers. Tests are specified '
+              'as TEST_NAME or TEST_FILE::TEST_NAME.'))
+    query.add_argument(
+        '--untested_files_in',
+        metavar='DIR',
+        help=('List the untested source files within a directory (relative '
+              'to the root directory).'))
+
+
+def _generate_diff_parser(main_parser: Any) -> None:
+    """Helper function that creates a parser for diff_snapshots
+
+    Args:
+        main_parser: the root-level parser object to add diff_snapshots'
+                     sub-arguments to
+    """
+    subparser = main_parser.add_parser(
+        'diff', help=cli.diff_snapshots.__doc__)
+    subparser.add_argument(
+        '--base',
+        required=True,
+        metavar='SNAPSHOT',
+        help=('The snapshot to compare against: a database file created by '
+              'export-snippet-db, a polyglot_snippet_data.json file or a '
+              'directory containing one.'))
+    subparser.add_argument(
+        '--head',
+        metavar='SNAPSHOT',
+        help=('The snapshot to compare, in any of the formats accepted by '
+              '--base. Defaults to the root directory.'))
+
+
+def _generate_select_tests_parser(main_parser: Any) -> None:
+    """Helper function that creates a parser for select_tests
+
+    Args:
+        main_parser: the root-level parser object to add select_tests'
+                     sub-arguments to
+    """
+    subparser = main_parser.add_parser(
+        'select-tests', help=cli.select_tests.__doc__)
+    subparser.add_argument(
+        '--changed',
+        action='append',
+        metavar='PATH[:START[-END]]',
+        help=('A changed file (relative to the root directory), optionally '
+              'with a changed line range. Can be repeated. If omitted, '
+              'changes are read from stdin (one per line), e.g. from '
+              '"git diff --name-only".'))
+
+
+def _generate_select_smoke_tests_parser(main_parser: Any) -> None:
+    """Helper function that creates a parser for select_smoke_tests
+
+    Args:
+        main_parser: the root-level parser object to add select_smoke_tests'
+                     sub-arguments to
+    """
+    subparser = main_parser.add_parser(
+        'select-smoke-tests', help=cli.select_smoke_tests.__doc__)
+    subparser.add_argument(
+        '--xunit_file',
+        action='append',
+        default=[],
+        help=('An XUnit test result file (or a directory of them) to read '
+              'test durations from. Can be repeated.'))
+    subparser.add_argument(
+        '--default_duration',
+        type=float,
+        metavar='SECONDS',
+        help=('The duration of tests without XUnit results. Defaults to the '
+              'mean duration of the other tests.'))
+
+
+def _generate_aggregate_xunit_parser(main_parser: Any) -> None:
+    """Helper function that creates a parser for aggregate_xunit_results
+
+    Args:
+        main_parser: the root-level parser object to add
+                     aggregate_xunit_results' sub-arguments to
+    """
+    subparser = main_parser.add_parser(
+        'aggregate-xunit', help=cli.aggregate_xunit_results.__doc__)
+    subparser.add_argument(
+        '--xunit_file',
+        action='append',
+        required=True,
+        help=('An XUnit test result file (or a directory of them) to '
+              'aggregate. Can be repeated.'))
+    subparser.add_argument(
+        '--workers',
+        type=int,
+        help=('The maximum number of processes to read XUnit files with. '
+              'Defaults to the number of CPUs.'))
+
+
+def _run_command(
+    args: argparse.Namespace,
+    data_json: str,
+    snippet_data: Optional[analyze.SnippetData],
+    revision: Optional[git_utils.GitRevision]
+) -> None:
+    """Helper function that invokes the CLI command specified by parse_args
+
+    Args:
+        args: the parsed CLI arguments
+        data_json: the root directory's polyglot_snippet_data.json path
+        snippet_data: in-memory snippet data (see
+                      analyze.create_snippet_data()) to use instead of
+                      data_json, or None
+        revision: the git revision of the root directory to analyze, or None
+    """
+    if args.command == 'list-region-tags':
+        cli.list_region_tags(
+            data_json,
+            args.root_dir,
+            args.detected,
+            args.undetected,
+            args.show_test_counts,
+            args.show_filenames,
+            args.output_file,
+            args.cache_dir,
+            snippet_data,
+            args.stream,
+            revision)
+    elif args.command == 'list-source-files':
+        cli.list_source_files(
+            data_json,
+            args.root_dir,
+            args.tested_files,
+            args.output_file,
+            args.cache_dir,
+            snippet_data,
+            args.stream,
+            revision)
+    elif args.command == 'inject-snippet-mapping' and args.follow:
+        with contextlib.ExitStack() as stack:
+            input_file = sys.stdin
+            if args.xunit_file:
+                input_file = stack.enter_context(
+                    open(args.xunit_file, 'rb'))
+
+            cli.follow_snippet_mapping(
+                data_json,
+                args.root_dir,
+                input_file.fileno(),
+                args.output_file,
+                args.cache_dir,
+                snippet_data,
+                revision,
+                args.idle_timeout)
+    elif args.command == 'inject-snippet-mapping':
+        if args.xunit_file:
+            with open(args.xunit_file) as file:
+                xunit_lines = file.readlines()
+        else:
+            xunit_lines = sys.stdin.readlines()
+
+        cli.inject_snippet_mapping(
+            data_json,
+            args.root_dir,
+            xunit_lines,
+            args.output_file,
+            args.cache_dir,
+            snippet_data,
+            revision)
+    elif args.command == 'validate-yaml':
+        cli.validate_yaml(
+            data_json,
+            args.root_dir,
+            args.output_file,
+            args.cache_dir,
+            snippet_data)
+    elif args.command == 'merge-snippet-data':
+        cli.merge_snippet_data(
+            data_json,
+            args.root_dir,
+            args.output_file,
+            args.shard_count)
+    elif args.command == 'export-snippet-db':
+        cli.export_snippet_db(
+            data_json,
+            args.root_dir,
+            args.db_file,
+            args.output_file,
+            args.cache_dir,
+            snippet_data,
+            revision)
+    elif args.command == 'query':
+        cli.query_snippet_db(
+            args.root_dir,
+            args.db_file,
+            args.tests_for_tag,
+            args.tags_for_test,
+            args.untested_files_in,
+            args.output_file)
+    elif args.command == 'diff':
+        cli.diff_snapshots(
+            data_json,
+            args.root_dir,
+            args.base,
+            args.head,
+            args.output_file,
+            args.cache_dir,
+            snippet_data,
+            revision)
+    elif args.command == 'select-tests':
+        cli.select_tests(
+            data_json,
+            args.root_dir,
+            args.changed or sys.stdin.readlines(),
+            args.output_file,
+            args.cache_dir,
+            snippet_data,
+            revision)
+    elif args.command == 'select-smoke-tests':
+        cli.select_smoke_tests(
+            data_json,
+            args.root_dir,
+            args.xunit_file,
+            args.default_duration,
+            args.output_file,
+            args.cache_dir,
+            snippet_data,
+            revision)
+    elif args.command == 'aggregate-xunit':
+        cli.aggregate_xunit_results(
+            data_json,
+            args.root_dir,
+            args.xunit_file,
+            args.workers,
+            args.output_file,
+            args.cache_dir,
+            snippet_data,
+            revision)
+
+
 def parse_args(input_args: List[str]) -> None:
     """Parse user-supplied CLI arguments
 
@@ -106,12 +439,19 @@ def parse_args(input_args: List[str]) -> None:
     _generate_list_region_tags_parser(subparsers)
     _generate_list_source_files_parser(subparsers)
 
-    subparsers.add_parser(
-        'inject-snippet-mapping', help=cli.inject_snippet_mapping.__doc__)
+    _generate_inject_snippet_mapping_parser(subparsers)
 
     subparsers.add_parser(
         'validate-yaml', help=cli.validate_yaml.__doc__)
 
+    _generate_merge_snippet_data_parser(subparsers)
+    _generate_export_snippet_db_parser(subparsers)
+    _generate_query_parser(subparsers)
+    _generate_diff_parser(subparsers)
+    _generate_select_tests_parser(subparsers)
+    _generate_select_smoke_tests_parser(subparsers)
+    _generate_aggregate_xunit_parser(subparsers)
+
     # Add cross-command required parameters
     parser.add_argument(
         'root_dir', help='Root directory')
@@ -119,33 +459,63 @@ def parse_args(input_args: List[str]) -> None:
         '--output_file',
         help='File to write output to. Omit to use stdout.',
         required=False)
+    parser.add_argument(
+        '--cache_dir',
+        help=('Directory to cache analysis inputs (such as parsed '
+              '.drift-data.yml files and, with --parse_python, per-file '
+              'parser results) in between runs. Omit to disable caching.'),
+        required=False)
+    parser.add_argument(
+        '--parse_python',
+        help=('Parse the Python files in the root directory in-process, '
+              'instead of reading a (previously-generated) '
+              'polyglot_snippet_data.json file.'),
+        action='store_true')
+    parser.add_argument(
+        '--write_snippet_data',
+        help=('With --parse_python, also write the parsed snippet data to '
+              'polyglot_snippet_data.json (for use by other tools).'),
+        action='store_true')
+    parser.add_argument(
+        '--revision',
+        help=('Analyze the root directory as of a git revision (such as a '
+              'branch name or commit SHA), reading files from the '
+              "repository's object store instead of the working tree. "
+              'Implies --parse_python.'),
+        required=False)
+    parser.add_argument(
+        '--stream',
+        help=('Analyze (and print the results of) one source directory at '
+              'a time, to limit memory usage on large directories. Only '
+              'affects list-region-tags and list-source-files.'),
+        action='store_true')
 
     # Route CLI calls
     args = parser.parse_args(input_args)
     data_json = os.path.join(args.root_dir, 'polyglot_snippet_data.json')
 
-    if args.command == 'list-region-tags':
-        cli.list_region_tags(
-            data_json,
-            args.root_dir,
-            args.detected,
-            args.undetected,
-            args.show_test_counts,
-            args.show_filenames, args.output_file)
-    elif args.command == 'list-source-files':
-        cli.list_source_files(
-            data_json,
-            args.root_dir,
-            args.tested_files,
-            args.output_file)
-    elif args.command == 'inject-snippet-mapping':
-        cli.inject_snippet_mapping(
-            data_json,
-            args.root_dir,
-            sys.stdin.readlines(),
-            args.output_file)
-    elif args.command == 'validate-yaml':
-        cli.validate_yaml(data_json, args.root_dir)
+    if args.revision and args.command not in _REVISION_COMMANDS:
+        parser.error(f'--revision is not supported by {args.command}')
+    if args.revision and args.write_snippet_data:
+        parser.error("--revision can't be combined with --write_snippet_data")
+
+    revision = None
+    if args.revision:
+        revision = git_utils.GitRevision(args.root_dir, args.revision)
+
+    try:
+        snippet_data = None
+        if args.parse_python or revision:
+            snippet_data = invoker.get_snippet_data_for_dir(
+                args.root_dir,
+                data_json if args.write_snippet_data else None,
+                args.cache_dir,
+                revision)
+
+        _run_command(args, data_json, snippet_data, revision)
+    finally:
+        if revision:
+            revision.close()
 
 
 if __name__ == '__main__':
@@ -32,6 +32,10 @@ class CliSmokeTests(unittest.TestCase):
     def monkeypatch(self, monkeypatch):
         self.monkeypatch = monkeypatch
 
+    @pytest.fixture(autouse=True)
+    def tmpdir(self, tmpdir):
+        self.tmpdir = tmpdir
+
     @pytest.fixture(autouse=True)
     def init_values(self):
         self.test_dir = os.path.abspath('ast_parser/core/test_data/parser')
@@ -50,6 +54,14 @@ class CliSmokeTests(unittest.TestCase):
 
         assert 'root_tag' in out
 
+    def test_list_region_tags_parses_python_in_process(self):
+        cli_bootstrap.parse_args([
+            '--parse_python', 'list-region-tags', self.test_dir])
+
+        out, _ = self.capsys.readouterr()
+
+        assert 'root_tag' in out
+
     def test_list_source_files(self):
         cli_bootstrap.parse_args([
             'list-source-files', self.test_dir])
@@ -57,6 +69,13 @@ class CliSmokeTests(unittest.TestCase):
         out, _ = self.capsys.readouterr()
         assert 'nested_tags.py' in out
 
+    def test_list_source_files_streams_by_directory(self):
+        cli_bootstrap.parse_args([
+            '--stream', 'list-source-files', self.test_dir])
+
+        out, _ = self.capsys.readouterr()
+        assert 'nested_tags.py' in out
+
     def test_inject_xunit(self):
         self.monkeypatch.setattr(
             'sys.stdin',
@@ -84,3 +103,77 @@ class CliSmokeTests(unittest.TestCase):
 
         out, _ = self.capsys.readouterr()
         assert 'All files are valid' in out
+
+    def test_export_and_query_snippet_db(self):
+        db_path = os.path.join(self.tmpdir, 'snippets.db')
+
+        cli_bootstrap.parse_args([
+            'export-snippet-db', '--db_file', db_path, self.test_dir])
+        cli_bootstrap.parse_args([
+            'query', '--db_file', db_path,
+            '--tests_for_tag', 'not_main', self.test_dir])
+
+        out, _ = self.capsys.readouterr()
+        assert 'edge_cases/edge_cases_test.py::test_not_main' in out
+
+    def test_diff(self):
+        cli_bootstrap.parse_args([
+            'diff', '--base', self.test_dir, self.test_dir])
+
+        out, _ = self.capsys.readouterr()
+        assert 'No changes found.' in out
+
+    def test_select_tests(self):
+        self.monkeypatch.setattr(
+            'sys.stdin',
+            io.StringIO('snippet_invocation_methods/main.py:17\n')
+        )
+
+        cli_bootstrap.parse_args([
+            'select-tests', self.test_dir])
+
+        out, _ = self.capsys.readouterr()
+        assert 'snippet_invocation_methods/main_test.py::test_methods' in out
+        assert 'nested_tags' not in out
+
+    def test_select_smoke_tests(self):
+        cli_bootstrap.parse_args([
+            'select-smoke-tests', '--xunit_file', self.xml_path,
+            self.test_dir])
+
+        out, _ = self.capsys.readouterr()
+        assert 'edge_cases/edge_cases_test.py::test_not_main (0.002s)' in out
+        assert 'Estimated total runtime:' in out
+        assert 'Region tags without tests:' in out
+
+    def test_aggregate_xunit(self):
+        cli_bootstrap.parse_args([
+            'aggregate-xunit', '--xunit_file', self.xml_path,
+            '--xunit_file', self.xml_path, self.test_dir])
+
+        out, _ = self.capsys.readouterr()
+        assert 'Aggregated 2 report(s).' in out
+        assert 'not_main: passing (2 passed, 0 failed' in out
+
+    def test_aggregate_xunit_skips_unreadable_reports(self):
+        truncated_path = os.path.join(self.tmpdir, 'truncated.xml')
+        with open(truncated_path, 'w') as file:
+            file.write(self.xml_contents[:100])
+
+        cli_bootstrap.parse_args([
+            'aggregate-xunit', '--xunit_file', self.xml_path,
+            '--xunit_file', truncated_path, self.test_dir])
+
+        out, _ = self.capsys.readouterr()
+        assert 'Aggregated 1 report(s).' in out
+        assert f'Skipped unreadable report(s):\n  {truncated_path}' in out
+
+    def test_inject_xunit_follow(self):
+        cli_bootstrap.parse_args([
+            'inject-snippet-mapping', '--follow', '--xunit_file',
+            self.xml_path, self.test_dir])
+
+        out, _ = self.capsys.readouterr()
+
+        testcase = etree.fromstring(out).find('.//testcase')
+        assert testcase.attrib['region_tags'] == 'not_main'